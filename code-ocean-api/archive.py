@@ -0,0 +1,205 @@
+import io
+import json
+import shutil
+import tarfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+ARCHIVE_SUFFIX = ".tar"
+INDEX_SUFFIX = ".index.jsonl"
+BLOCK_SIZE = tarfile.BLOCKSIZE
+
+
+@dataclass
+class ArchiveMember:
+    """Location of a member's data inside an uncompressed tar archive."""
+
+    name: str
+    offset: int
+    size: int
+    header_offset: int
+
+
+def index_path_for(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+
+def load_archive_index(archive_path: Path) -> dict[str, ArchiveMember]:
+    """
+    Load the member index of a job archive (the last entry for a name wins).
+
+    A torn final line from an interrupted run is ignored.
+    """
+    members: dict[str, ArchiveMember] = {}
+    index_path = index_path_for(archive_path)
+    if not index_path.exists():
+        return members
+
+    with open(index_path, "r") as f:
+        for line in f:
+            try:
+                member = ArchiveMember(**json.loads(line))
+            except (TypeError, ValueError):
+                continue
+            members[member.name] = member
+    return members
+
+
+def _padding(size: int) -> int:
+    return -size % BLOCK_SIZE
+
+
+class JobArchiveWriter:
+    """
+    Append-only tar archive of a job's result files, with a JSON-lines index.
+
+    Each member is written as a tar header followed by its data, and its data
+    offset is then appended to ``<archive>.index.jsonl``. The index is the
+    commit record: on reopen, anything after the last indexed member (e.g. a
+    member torn by a crash) is truncated away. ``add`` may be called from
+    several threads; members are written one at a time.
+    """
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = archive_path
+        self.index_path = index_path_for(archive_path)
+        self.members = load_archive_index(archive_path)
+        self._lock = threading.Lock()
+
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        end = max(
+            (m.offset + m.size + _padding(m.size) for m in self.members.values()),
+            default=0,
+        )
+        self._file = open(archive_path, "r+b" if archive_path.exists() else "w+b")
+        self._file.truncate(end)
+        self._file.seek(end)
+        self._index = open(self.index_path, "a")
+
+    def __enter__(self) -> "JobArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def contains(self, name: str, size: int | None) -> bool:
+        member = self.members.get(name.lstrip("/"))
+        return member is not None and member.size == size
+
+    def add(self, name: str, fileobj: BinaryIO, size: int) -> None:
+        """Copy ``size`` bytes from ``fileobj`` into the archive as ``name``."""
+        info = tarfile.TarInfo(name.lstrip("/"))
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644
+
+        with self._lock:
+            header_offset = self._file.tell()
+            try:
+                self._file.write(info.tobuf(format=tarfile.PAX_FORMAT))
+                data_offset = self._file.tell()
+                shutil.copyfileobj(fileobj, self._file)
+                written = self._file.tell() - data_offset
+                if written != size:
+                    raise IOError(
+                        f"Archive member {info.name}: expected {size} bytes, got {written}"
+                    )
+                self._file.write(b"\0" * _padding(size))
+                self._file.flush()
+            except Exception:
+                # Drop the partial member so the archive stays consistent
+                self._file.truncate(header_offset)
+                self._file.seek(header_offset)
+                raise
+
+            member = ArchiveMember(info.name, data_offset, size, header_offset)
+            self._index.write(json.dumps(asdict(member)) + "\n")
+            self._index.flush()
+            self.members[member.name] = member
+
+    def close(self) -> None:
+        """Write the tar end-of-archive marker and close the files."""
+        with self._lock:
+            if self._file.closed:
+                return
+            # The next writer truncates the marker again before appending
+            self._file.write(b"\0" * (2 * BLOCK_SIZE))
+            self._file.close()
+            self._index.close()
+
+
+class _MemberReader(io.RawIOBase):
+    """Seekable read-only view of one member's bytes within the archive."""
+
+    def __init__(
+        self, archive_file: BinaryIO, member: ArchiveMember, lock: threading.Lock
+    ):
+        self._file = archive_file
+        self._member = member
+        self._lock = lock
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._member.size}
+        self._pos = max(0, base[whence] + offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        remaining = self._member.size - self._pos
+        if remaining <= 0:
+            return 0
+        view = memoryview(buffer)[: min(len(buffer), remaining)]
+        with self._lock:
+            self._file.seek(self._member.offset + self._pos)
+            n = self._file.readinto(view)
+        self._pos += n or 0
+        return n or 0
+
+
+class JobArchive:
+    """
+    Random-access reader for a job archive written by ``JobArchiveWriter``.
+
+    Members are located through the index, so opening one costs a seek rather
+    than a scan or extraction. The archive is also a plain tar file readable
+    by standard tools.
+    """
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = archive_path
+        self.members = load_archive_index(archive_path)
+        self._file = open(archive_path, "rb")
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "JobArchive":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def names(self) -> list[str]:
+        return sorted(self.members)
+
+    def open(self, name: str) -> io.BufferedReader:
+        """Open a member as a seekable binary file object."""
+        member = self.members[name.lstrip("/")]
+        return io.BufferedReader(_MemberReader(self._file, member, self._lock))
+
+    def read_bytes(self, name: str) -> bytes:
+        with self.open(name) as f:
+            return f.read()
@@ -0,0 +1,171 @@
+import argparse
+import functools
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+import requests
+from rich.console import Console
+from rich.progress import Progress
+from rich.table import Table
+
+from get_url import DEFAULT_WORKERS, create_http_session, download_file
+
+DownloadFn = Callable[[str, Path, Progress, int], None]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler with keep-alive and no per-request logging."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def serve_directory(root: Path) -> ThreadingHTTPServer:
+    """Serve ``root`` over HTTP on a free local port from a background thread."""
+    handler = functools.partial(_QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_files(root: Path, count: int, size_bytes: int) -> list[str]:
+    """Write ``count`` random files of ``size_bytes`` and return their names."""
+    root.mkdir(parents=True, exist_ok=True)
+    names = [f"file_{i:05d}.bin" for i in range(count)]
+    for name in names:
+        (root / name).write_bytes(os.urandom(size_bytes))
+    return names
+
+
+def legacy_download(
+    url: str, dest_path: Path, progress: Progress, task_id: int
+) -> None:
+    """The original download path: fresh connection, 8 KiB chunks, per-chunk updates."""
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    response = requests.get(url, stream=True, timeout=30)
+    response.raise_for_status()
+    with open(dest_path, "wb") as f:
+        for chunk in response.iter_content(chunk_size=8192):
+            if chunk:
+                f.write(chunk)
+                progress.update(task_id, advance=len(chunk))  # type: ignore[arg-type]
+
+
+def time_downloads(
+    download: DownloadFn, urls: list[str], dest_dir: Path, workers: int
+) -> float:
+    """Download all ``urls`` with ``workers`` threads and return elapsed seconds."""
+    shutil.rmtree(dest_dir, ignore_errors=True)
+
+    with Progress(transient=True) as progress:
+
+        def fetch(url: str) -> None:
+            task_id = progress.add_task(url.rsplit("/", 1)[-1])
+            try:
+                download(url, dest_dir / url.rsplit("/", 1)[-1], progress, task_id)
+            finally:
+                progress.remove_task(task_id)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fetch, urls))
+        return time.perf_counter() - start
+
+
+def main(
+    small_count: int,
+    small_kb: int,
+    large_count: int,
+    large_mb: int,
+    workers: int = DEFAULT_WORKERS,
+) -> None:
+    """
+    Compare MB/s of the legacy and pooled download paths on a local server.
+
+    Args:
+        small_count: Number of small files in the many-small scenario
+        small_kb: Size of each small file in KB
+        large_count: Number of large files in the few-large scenario
+        large_mb: Size of each large file in MB
+        workers: Number of concurrent downloads
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="co_download_bench_"))
+    session = create_http_session(workers)
+
+    def pooled_download(
+        url: str, dest_path: Path, progress: Progress, task_id: int
+    ) -> None:
+        download_file(url, dest_path, progress, task_id, session=session)
+
+    paths: dict[str, DownloadFn] = {
+        "legacy (requests.get, 8 KiB)": legacy_download,
+        "pooled session, adaptive chunks": pooled_download,
+    }
+    scenarios = {
+        f"{small_count} x {small_kb} KB": (small_count, small_kb * 1024),
+        f"{large_count} x {large_mb} MB": (large_count, large_mb * 1024 * 1024),
+    }
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Download path", style="white")
+    table.add_column("Seconds", justify="right")
+    table.add_column("MB/s", justify="right", style="green")
+
+    try:
+        for scenario, (count, size_bytes) in scenarios.items():
+            src_dir = work_dir / "src" / scenario.replace(" ", "")
+            names = make_files(src_dir, count, size_bytes)
+            server = serve_directory(src_dir)
+            base_url = f"http://127.0.0.1:{server.server_port}"
+            urls = [f"{base_url}/{name}" for name in names]
+            total_mb = count * size_bytes / (1024 * 1024)
+
+            for label, download in paths.items():
+                logging.info("Running %s / %s", scenario, label)
+                elapsed = time_downloads(download, urls, work_dir / "dst", workers)
+                table.add_row(
+                    scenario, label, f"{elapsed:.2f}", f"{total_mb / elapsed:.1f}"
+                )
+
+            server.shutdown()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark result-file download throughput against a local server"
+    )
+    parser.add_argument("--small-count", type=int, default=500)
+    parser.add_argument("--small-kb", type=int, default=64)
+    parser.add_argument("--large-count", type=int, default=4)
+    parser.add_argument("--large-mb", type=int, default=128)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+
+    args = parser.parse_args()
+
+    main(
+        args.small_count,
+        args.small_kb,
+        args.large_count,
+        args.large_mb,
+        args.workers,
+    )
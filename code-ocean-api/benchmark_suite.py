@@ -0,0 +1,319 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from rich.console import Console
+from rich.progress import Progress
+from rich.table import Table
+
+import get_url
+from get_url import (
+    DEFAULT_LISTING_WORKERS,
+    DEFAULT_SEGMENTS,
+    DEFAULT_WORKERS,
+    create_http_session,
+    download_file,
+    download_job,
+    list_all_files,
+)
+from manifest import MANIFEST_FILENAME
+from mock_codeocean import MockCodeOcean, MockConfig, TreeSpec
+from throttle import Governor
+
+DEFAULT_REPEAT = 3
+DEFAULT_API_LATENCY_MS = 20.0
+DEFAULT_FILE_LATENCY_MS = 10.0
+
+SCENARIOS = {
+    "deep": TreeSpec(
+        depth=6, folders_per_level=2, files_per_folder=2, file_size=64 * 1024
+    ),
+    "wide": TreeSpec(
+        depth=1, folders_per_level=100, files_per_folder=5, file_size=16 * 1024
+    ),
+    "many-small": TreeSpec(
+        depth=2, folders_per_level=5, files_per_folder=20, file_size=4 * 1024
+    ),
+    "few-huge": TreeSpec(
+        depth=0, folders_per_level=0, files_per_folder=4, file_size=64 * 1024 * 1024
+    ),
+}
+
+
+def run_repeated(run: Callable[[], None], repeat: int) -> list[float]:
+    """Run ``run`` ``repeat`` times and return the elapsed seconds of each run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def downloaded_bytes(job_dir: Path) -> int:
+    return sum(
+        path.stat().st_size
+        for path in job_dir.rglob("*")
+        if path.is_file() and path.name != MANIFEST_FILENAME
+    )
+
+
+def benchmark_scenario(
+    name: str, spec: TreeSpec, config: MockConfig, work_dir: Path, repeat: int
+) -> list[dict]:
+    """
+    Benchmark listing and downloads of one synthetic tree.
+
+    Returns:
+        One result dict per (operation, configuration)
+    """
+    results = []
+    governor = Governor()
+
+    with MockCodeOcean(spec, config) as mock:
+        co_client = mock.client()
+        governor.mount(co_client.session, mock.url)
+        total_mb = spec.total_bytes / (1024 * 1024)
+
+        def record(
+            operation: str,
+            setting: str,
+            timings: list[float],
+            ok: bool,
+            rate: float,
+            unit: str,
+        ) -> None:
+            median = statistics.median(timings)
+            logging.info("%s / %s / %s: %.2fs", name, operation, setting, median)
+            results.append(
+                {
+                    "scenario": name,
+                    "operation": operation,
+                    "setting": setting,
+                    "timings_s": timings,
+                    "median_s": median,
+                    "rate": rate / median if median > 0 else None,
+                    "unit": unit,
+                    "ok": ok,
+                }
+            )
+
+        # list_all_files: serial vs. fanned-out listing
+        for workers in sorted({1, DEFAULT_LISTING_WORKERS}):
+            listed: list[int] = []
+            timings = run_repeated(
+                lambda: listed.append(
+                    len(list_all_files(co_client, "bench", workers=workers))
+                ),
+                repeat,
+            )
+            record(
+                "list_all_files",
+                f"{workers} listing worker(s)",
+                timings,
+                all(count == spec.file_count for count in listed),
+                spec.folder_count,
+                "folders/s",
+            )
+
+        # download_file: the first file of the tree over a pooled session
+        file_path = next(iter(mock.sizes))
+        file_size = mock.sizes[file_path]
+        url = co_client.computations.get_result_file_urls(
+            "bench", file_path
+        ).download_url
+        session = create_http_session(DEFAULT_WORKERS * DEFAULT_SEGMENTS, governor)
+        dest_path = work_dir / "single" / "file.bin"
+
+        def fetch_one() -> None:
+            dest_path.unlink(missing_ok=True)
+            with Progress(transient=True) as progress:
+                download_file(
+                    url, dest_path, progress, expected_size=file_size, session=session
+                )
+
+        timings = run_repeated(fetch_one, repeat)
+        record(
+            "download_file",
+            f"1 x {file_size / 1024:.0f} KB",
+            timings,
+            dest_path.stat().st_size == file_size,
+            file_size / (1024 * 1024),
+            "MB/s",
+        )
+
+        # download_job: end to end, at several worker and segment counts
+        settings = [(1, 1), (DEFAULT_WORKERS, 1), (DEFAULT_WORKERS, DEFAULT_SEGMENTS)]
+        for workers, segments in settings:
+            job_dir = work_dir / "bench"
+            complete: list[bool] = []
+
+            def fetch_job() -> None:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                # Keep download_job's summary tables and progress bars out of the results
+                with contextlib.redirect_stdout(io.StringIO()):
+                    download_job(
+                        co_client,
+                        "bench",
+                        max_file_size_mb=None,
+                        workers=workers,
+                        segments=segments,
+                        segment_threshold_mb=1,
+                        session=session,
+                    )
+                complete.append(downloaded_bytes(job_dir) == spec.total_bytes)
+
+            timings = run_repeated(fetch_job, repeat)
+            record(
+                "download_job",
+                f"{workers} worker(s), {segments} segment(s)",
+                timings,
+                all(complete),
+                total_mb,
+                "MB/s",
+            )
+
+        logging.info("%s: mock request counts %s", name, mock.request_counts)
+
+    return results
+
+
+def main(
+    scenarios: list[str],
+    repeat: int = DEFAULT_REPEAT,
+    api_latency_ms: float = DEFAULT_API_LATENCY_MS,
+    file_latency_ms: float = DEFAULT_FILE_LATENCY_MS,
+    bandwidth_mbps: float | None = None,
+    api_error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    drop_rate: float = 0.0,
+    seed: int = 0,
+    json_path: Path | None = None,
+) -> None:
+    """
+    Benchmark listing and downloads against a local mock of Code Ocean.
+
+    Args:
+        scenarios: Names of the synthetic trees in ``SCENARIOS`` to run
+        repeat: Number of timed runs per operation (the median is reported)
+        api_latency_ms: Latency added to every API request
+        file_latency_ms: Latency added before every file response
+        bandwidth_mbps: Per-connection file bandwidth in MB/s (None for unthrottled)
+        api_error_rate: Fraction of API requests answered with 503
+        throttle_rate: Fraction of API requests answered with 429
+        drop_rate: Fraction of file transfers cut off half-way
+        seed: Seed for file contents and failure injection
+        json_path: Optional path to save the raw results as JSON
+    """
+    config = MockConfig(
+        api_latency_s=api_latency_ms / 1000,
+        file_latency_s=file_latency_ms / 1000,
+        bandwidth_bps=bandwidth_mbps * 1024 * 1024 if bandwidth_mbps else None,
+        api_error_rate=api_error_rate,
+        throttle_rate=throttle_rate,
+        drop_rate=drop_rate,
+        seed=seed,
+    )
+    work_dir = Path(tempfile.mkdtemp(prefix="co_benchmark_suite_"))
+    # download_job writes under the download root
+    get_url.DOWNLOAD_ROOT = work_dir
+
+    results: list[dict] = []
+    try:
+        for name in scenarios:
+            spec = SCENARIOS[name]
+            logging.info(
+                "Scenario %s: %d folders, %d files, %.1f MB",
+                name,
+                spec.folder_count,
+                spec.file_count,
+                spec.total_bytes / (1024 * 1024),
+            )
+            results.extend(benchmark_scenario(name, spec, config, work_dir, repeat))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Operation", style="white")
+    table.add_column("Setting", style="white")
+    table.add_column("Median (s)", justify="right")
+    table.add_column("Rate", justify="right", style="green")
+    table.add_column("Complete", justify="center")
+
+    for result in results:
+        rate = f"{result['rate']:.1f} {result['unit']}" if result["rate"] else "-"
+        table.add_row(
+            result["scenario"],
+            result["operation"],
+            result["setting"],
+            f"{result['median_s']:.2f}",
+            rate,
+            "[green]✓[/green]" if result["ok"] else "[red]✗[/red]",
+        )
+
+    Console().print(table)
+
+    if json_path is not None:
+        json_path.write_text(
+            json.dumps({"config": vars(config), "results": results}, indent=2)
+        )
+        logging.info("Saved results to %s", json_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark listing and downloads against a local Code Ocean mock server"
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Synthetic tree to benchmark (repeatable, default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--api-latency-ms", type=float, default=DEFAULT_API_LATENCY_MS)
+    parser.add_argument(
+        "--file-latency-ms", type=float, default=DEFAULT_FILE_LATENCY_MS
+    )
+    parser.add_argument(
+        "--bandwidth-mbps",
+        type=float,
+        default=0,
+        help="Per-connection file bandwidth in MB/s (default: 0, unthrottled)",
+    )
+    parser.add_argument("--api-error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--json", type=Path, default=None, help="Save raw results to this file"
+    )
+
+    args = parser.parse_args()
+
+    main(
+        args.scenario or list(SCENARIOS),
+        args.repeat,
+        args.api_latency_ms,
+        args.file_latency_ms,
+        args.bandwidth_mbps or None,
+        args.api_error_rate,
+        args.throttle_rate,
+        args.drop_rate,
+        args.seed,
+        args.json,
+    )
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import shutil
+import sys
+import uuid
+from pathlib import Path
+
+BLOB_DIRNAME = ".blobs"
+# Smaller files aren't worth an extra request or re-reading to deduplicate
+DEFAULT_DEDUP_MIN_SIZE_MB = 1.0
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+# Linux ioctl to share a file's extents (btrfs, XFS); see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+
+def normalize_etag(etag: str | None) -> str | None:
+    """Strip quotes and the weak prefix from an ETag, keeping only safe characters."""
+    if not etag:
+        return None
+    etag = etag.strip()
+    if etag.startswith("W/"):
+        # Weak ETags don't identify content
+        return None
+    etag = etag.strip('"')
+    return etag if etag and all(c.isalnum() or c == "-" for c in etag) else None
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    """Clone ``src`` to ``dest`` sharing its extents, where the filesystem allows."""
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl
+
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+def link_or_copy(src: Path, dest: Path) -> str:
+    """
+    Atomically place a hardlink (or reflink, or copy) of ``src`` at ``dest``.
+
+    Returns:
+        How the file was placed: "hardlink", "reflink" or "copy"
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f"{dest.name}.{uuid.uuid4().hex[:8]}.link")
+
+    try:
+        os.link(src, tmp_path)
+        method = "hardlink"
+    except OSError:
+        # Different volume or too many links to the blob
+        if _reflink(src, tmp_path):
+            method = "reflink"
+        else:
+            shutil.copyfile(src, tmp_path)
+            method = "copy"
+
+    os.replace(tmp_path, dest)
+    return method
+
+
+class BlobStore:
+    """
+    Content-addressed store of result files shared by all jobs.
+
+    Blobs live under ``<root>/<xx>/<size>-<kind>-<digest>`` and job trees hold
+    hardlinks to them, so identical files are stored once. A blob is keyed by
+    its size plus either its storage ETag (known before downloading, so a
+    matching file isn't transferred at all) or its SHA-256 (computed after
+    downloading, so identical files without a usable ETag still share
+    storage). Hardlinked results must be treated as read-only: editing one
+    copy edits all of them.
+    """
+
+    def __init__(self, root: Path, min_size_mb: float = DEFAULT_DEDUP_MIN_SIZE_MB):
+        self.root = root
+        self.min_size = int(min_size_mb * 1024 * 1024)
+        root.mkdir(parents=True, exist_ok=True)
+
+    def wants(self, size: int) -> bool:
+        return size >= self.min_size
+
+    def _path(self, size: int, kind: str, digest: str) -> Path:
+        return self.root / digest[:2] / f"{size}-{kind}-{digest}"
+
+    def lookup(self, size: int, etag: str | None) -> Path | None:
+        """Return the blob of a file with this size and ETag, if already stored."""
+        etag = normalize_etag(etag)
+        if etag is None:
+            return None
+        blob = self._path(size, "etag", etag)
+        return blob if blob.exists() else None
+
+    def _store(self, path: Path, blob: Path) -> bool:
+        """
+        Add ``path`` as ``blob``; return False if the blob already existed.
+
+        Raises:
+            OSError: If the blob couldn't be linked (e.g. disk full, permission
+                denied), so it isn't mistaken for a stored one
+        """
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+            return True
+        except FileExistsError:
+            return False
+
+    def add(self, path: Path, size: int, etag: str | None = None) -> bool:
+        """
+        Store a freshly downloaded file, or swap it for a link to an identical blob.
+
+        Returns:
+            True if the file was already in the store (its storage was reclaimed)
+
+        Raises:
+            OSError: If the file couldn't be stored; it is left as a plain file
+        """
+        digest = file_sha256(path)
+        blob = self._path(size, "sha256", digest)
+        deduplicated = False
+
+        if not self._store(path, blob):
+            if not os.path.samefile(path, blob):
+                link_or_copy(blob, path)
+                deduplicated = True
+            path = blob
+
+        etag = normalize_etag(etag)
+        if etag is not None:
+            self._store(path, self._path(size, "etag", etag))
+
+        return deduplicated
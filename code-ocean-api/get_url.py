@@ -1,6 +1,21 @@
 import argparse
+import functools
 import json
 import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import requests
@@ -19,6 +34,25 @@ from rich.progress import (
 from rich.prompt import Confirm
 from rich.table import Table
 
+from archive import ARCHIVE_SUFFIX, JobArchiveWriter, load_archive_index
+from blob_store import (
+    BLOB_DIRNAME,
+    DEFAULT_DEDUP_MIN_SIZE_MB,
+    BlobStore,
+    link_or_copy,
+)
+from job_store import JobStore, is_job_store
+from manifest import DownloadManifest
+from metrics import (
+    BatchMetrics,
+    JobMetrics,
+    TransferStats,
+    summary_table,
+    write_report,
+)
+from path_filter import PathFilter
+from throttle import Governor, TokenBucket
+from url_cache import FileURLCache
 from utils import get_codeocean_client
 
 # Hard-coded root directory for downloads
@@ -26,28 +60,76 @@ from utils import get_codeocean_client
 DOWNLOAD_ROOT = Path(r"\\?\C:\data\codeocean_downloads")
 DEFAULT_MAX_FILE_SIZE_MB = 500
 DEFAULT_FORCE_DOWNLOAD = False
+DEFAULT_VERIFY = False
 DEFAULT_AUTO_DOWNLOAD = True
+DEFAULT_WORKERS = 4
+DEFAULT_LISTING_WORKERS = 8
+DEFAULT_STATUS_WORKERS = 8
+DEFAULT_STATUS_RATE = 10.0
+DEFAULT_RESUME_ATTEMPTS = 3
+DEFAULT_SEGMENTS = 4
+DEFAULT_SEGMENT_THRESHOLD_MB = 100
+DEFAULT_ARCHIVE = False
+DEFAULT_FOLLOW_INTERVAL_S = 300
+# Per-job and per-batch JSON timing reports are written under the download root
+REPORTS_DIRNAME = "reports"
+# Computation states after which results no longer change
+TERMINAL_STATES = ("completed", "failed", "stopped")
+# In archive mode, files are buffered in memory up to this size before spilling
+# to a local temporary file
+ARCHIVE_SPOOL_BYTES = 64 * 1024 * 1024
+
+# Streaming chunk size adapts to the file size within these bounds
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# Coalesce progress bar updates to at most one per this many bytes
+PROGRESS_UPDATE_BYTES = 1024 * 1024
+# Errors after which a transfer is resumed rather than abandoned
+TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# Partial downloads are written next to their destination and renamed on success
+PART_SUFFIX = ".part"
+JOURNAL_SUFFIX = ".part.json"
+# Commit the partial-file offset to the journal roughly every 8 MiB
+JOURNAL_INTERVAL_BYTES = 8 * 1024 * 1024
 
 
 def load_jobs_from_json(jobs_file: Path) -> dict[str, str]:
     """
     Load jobs from a jobs.json file and return a dict of job_key -> computation_id.
 
+    Also accepts a ``JobStore`` database (every batch in it, keyed
+    ``<batch>/<job_key>``), so a batch whose submission was interrupted can
+    still be downloaded.
+    A computation shared by several jobs (e.g. reused by later batches from
+    the sweep ledger) is listed once, under its first job key, so it is never
+    downloaded twice at the same time.
+
     Args:
-        jobs_file: Path to the jobs.json file
+        jobs_file: Path to the jobs.json (or jobs.db) file
 
     Returns:
         Dictionary mapping job key to computation ID
     """
-    with open(jobs_file, "r") as f:
-        data = json.load(f)
+    if is_job_store(jobs_file):
+        with JobStore(jobs_file) as store:
+            data = store.load_batches()
+    else:
+        with open(jobs_file, "r") as f:
+            data = json.load(f)
 
     jobs_dict: dict[str, str] = {}
 
     if "jobs" in data:
+        seen: set[str] = set()
         for job_key, job_info in data["jobs"].items():
             computation_id = job_info.get("computation_id")
-            if computation_id:
+            if computation_id and computation_id not in seen:
+                seen.add(computation_id)
                 jobs_dict[job_key] = computation_id
 
     return jobs_dict
@@ -78,68 +160,899 @@ def check_computation_status(
         return None, False
 
 
+def check_computation_statuses(
+    co_client: CodeOcean,
+    jobs_dict: dict[str, str],
+    workers: int = DEFAULT_STATUS_WORKERS,
+    rate_limiter: TokenBucket | None = None,
+) -> Iterator[tuple[str, str, ComputationState | None, bool]]:
+    """
+    Check the status of many computations concurrently.
+
+    Args:
+        co_client: Code Ocean client
+        jobs_dict: Dictionary mapping job key to computation ID
+        workers: Maximum number of status requests in flight
+        rate_limiter: Optional limiter acquired once per status request
+
+    Yields:
+        Tuples of (job_key, computation_id, state, has_results) as they arrive
+    """
+
+    def check(
+        job_key: str, computation_id: str
+    ) -> tuple[str, str, ComputationState | None, bool]:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        state, has_results = check_computation_status(co_client, computation_id)
+        return job_key, computation_id, state, has_results
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            executor.submit(check, job_key, computation_id)
+            for job_key, computation_id in jobs_dict.items()
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _status_row(
+    job_key: str,
+    computation_id: str,
+    state: ComputationState | None,
+    has_results: bool,
+) -> tuple[list[str], bool]:
+    """Format a status table row and tell whether the job is ready to download."""
+    if state is None:
+        return [
+            job_key,
+            computation_id,
+            "[red]Error[/red]",
+            "?",
+            "[red]Skip[/red]",
+        ], False
+
+    if state.value in TERMINAL_STATES and has_results:
+        return [
+            job_key,
+            computation_id,
+            f"[green]{state.value}[/green]",
+            "[green]✓[/green]",
+            "[green]Download[/green]",
+        ], True
+
+    action = (
+        "[yellow]Skip (no results)[/yellow]"
+        if not has_results
+        else f"[yellow]Skip ({state.value})[/yellow]"
+    )
+    return [
+        job_key,
+        computation_id,
+        f"[yellow]{state.value}[/yellow]",
+        "[yellow]✗[/yellow]" if not has_results else "[yellow]?[/yellow]",
+        action,
+    ], False
+
+
 def list_all_files(
-    co_client: CodeOcean, computation_id: str, path: str = ""
+    co_client: CodeOcean,
+    computation_id: str,
+    path: str = "",
+    workers: int = DEFAULT_LISTING_WORKERS,
+    path_filter: PathFilter | None = None,
+    metrics: JobMetrics | None = None,
+    failed_folders: list[str] | None = None,
 ) -> list[FolderItem]:
     """
-    Recursively list all files in a computation result.
-    Returns a list of FolderItem objects representing files (not directories).
+    List all files in a computation result, breadth-first.
+
+    Folder listings are fanned out across a thread pool, so at most ``workers``
+    ``list_computation_results`` calls are in flight at any time. Folders and
+    files rejected by ``path_filter`` are pruned during the walk, so excluded
+    subtrees are never listed. The latency of every listing call and the
+    total listing time are recorded in ``metrics`` when given. Folders whose
+    listing failed are appended to ``failed_folders`` when given, since the
+    returned listing is then incomplete.
+    Returns a list of FolderItem objects representing files (not directories),
+    sorted by path.
     """
     files: list[FolderItem] = []
+    folder_count = 0
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending: dict[Future[Folder], str] = {}
+
+        def list_folder(folder_path: str) -> Folder:
+            call_start = time.perf_counter()
+            try:
+                return co_client.computations.list_computation_results(
+                    computation_id=computation_id, path=folder_path
+                )
+            finally:
+                if metrics is not None:
+                    metrics.listing.record(time.perf_counter() - call_start)
+
+        def submit(folder_path: str) -> None:
+            pending[executor.submit(list_folder, folder_path)] = folder_path
+
+        submit(path)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                folder_path = pending.pop(future)
+                folder_count += 1
+
+                try:
+                    results: Folder = future.result()
+                except Exception as e:
+                    logging.warning(
+                        "Error listing folder '%s' of %s: %s",
+                        folder_path,
+                        computation_id,
+                        e,
+                    )
+                    if failed_folders is not None:
+                        failed_folders.append(folder_path)
+                    continue
+
+                for item in results.items:
+                    # Go by the item type: empty files have a size of 0 too
+                    if item.type == "folder":
+                        if path_filter is None or path_filter.wants_folder(item.path):
+                            submit(item.path)
+                    elif path_filter is None or path_filter.wants_file(item.path):
+                        files.append(item)
+
+    elapsed = time.perf_counter() - start_time
+    if metrics is not None:
+        metrics.add_phase("listing", elapsed)
+    logging.info(
+        "Listed %d folder(s), %d file(s) in %.2fs (%.1f folders/s)",
+        folder_count,
+        len(files),
+        elapsed,
+        folder_count / elapsed if elapsed > 0 else float("inf"),
+    )
+
+    return sorted(files, key=lambda item: item.path)
+
+
+def create_http_session(
+    pool_size: int = DEFAULT_WORKERS, governor: Governor | None = None
+) -> requests.Session:
+    """
+    Create a keep-alive HTTP session for downloading result files.
+
+    The connection pool is sized for ``pool_size`` concurrent transfers, so
+    worker threads reuse TLS connections instead of opening one per file.
+    With a ``governor``, throttled (429/503) and server-error responses are
+    retried with its backoff policy.
+    """
+    session = requests.Session()
+    if governor is not None:
+        for prefix in ("https://", "http://"):
+            governor.mount(session, prefix, pool_size, count_requests=False)
+        return session
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def adaptive_chunk_size(total_size: int) -> int:
+    """Pick a streaming chunk size of roughly 1/64 of the file, within bounds."""
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, total_size // 64))
+
+
+class _ProgressAdvancer:
+    """Accumulate per-chunk advances and forward them to rich in batches."""
+
+    def __init__(self, progress: Progress, task_id: int | None):
+        self.progress = progress
+        self.task_id = task_id
+        self.pending = 0
+
+    def advance(self, nbytes: int) -> None:
+        self.pending += nbytes
+        if self.pending >= PROGRESS_UPDATE_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.task_id is not None and self.pending:
+            self.progress.update(self.task_id, advance=self.pending)  # type: ignore[arg-type]
+        self.pending = 0
+
+
+def read_journal(journal_path: Path, part_path: Path, expected_size: int) -> int:
+    """
+    Return the offset a partial download can safely resume from.
+
+    The journal is only trusted when it was written for the same remote file
+    size; the offset is capped to what actually made it into the .part file.
+    """
+    if not journal_path.exists() or not part_path.exists():
+        return 0
 
     try:
-        results: Folder = co_client.computations.list_computation_results(
-            computation_id=computation_id, path=path
-        )
+        journal = json.loads(journal_path.read_text())
+    except (OSError, ValueError) as e:
+        logging.debug("Ignoring unreadable journal %s: %s", journal_path, e)
+        return 0
 
-        for item in results.items:
-            item_path: str = item.path
-            item_size: int | None = item.size
+    if journal.get("size") != expected_size:
+        return 0
 
-            # Check if item is a directory (size is None or 0)
-            if item_size is None or item_size == 0:
-                sub_files = list_all_files(co_client, computation_id, item_path)
-                files.extend(sub_files)
-            else:
-                files.append(item)
+    return min(int(journal.get("offset", 0)), part_path.stat().st_size)
 
-    except Exception as e:
-        logging.debug("Error listing path %s: %s", path, e)
 
-    return files
+def write_journal(journal_path: Path, expected_size: int, offset: int) -> None:
+    """Atomically record the committed offset of a partial download."""
+    tmp_path = journal_path.with_name(journal_path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"size": expected_size, "offset": offset}))
+    os.replace(tmp_path, journal_path)
 
 
 def download_file(
-    url: str, dest_path: Path, progress: Progress, task_id: int | None = None
+    url: str,
+    dest_path: Path,
+    progress: Progress,
+    task_id: int | None = None,
+    expected_size: int | None = None,
+    max_attempts: int = DEFAULT_RESUME_ATTEMPTS,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    stats: TransferStats | None = None,
 ) -> None:
-    """Download a file from URL to destination path with progress tracking."""
+    """
+    Download a file from URL to destination path with progress tracking.
+
+    Uses ``session`` (see ``create_http_session``) when given so connections
+    are reused across files. ``chunk_size`` defaults to ``adaptive_chunk_size``.
+    When ``bandwidth`` is given, every chunk acquires its size in bytes from it.
+    Time to first response and resumed attempts are recorded in ``stats``.
+
+    Data is streamed into ``<dest>.part`` and the committed offset is recorded
+    in a ``<dest>.part.json`` journal. Interrupted downloads (in this run or a
+    previous one) resume with an HTTP Range request from the last committed
+    offset. The .part file is atomically renamed to ``dest_path`` only once the
+    full file has been received, so ``dest_path`` never holds a truncated file.
+    """
     dest_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = dest_path.with_name(dest_path.name + PART_SUFFIX)
+    journal_path = dest_path.with_name(dest_path.name + JOURNAL_SUFFIX)
+
+    offset = (
+        read_journal(journal_path, part_path, expected_size)
+        if expected_size is not None
+        else 0
+    )
+    if offset:
+        logging.info("Resuming %s from byte %d", dest_path.name, offset)
+
+    http = session if session is not None else requests
+    advancer = _ProgressAdvancer(progress, task_id)
+
+    for attempt in range(1, max_attempts + 1):
+        if expected_size and offset == expected_size:
+            # Every byte is already committed (the last attempt failed after
+            # the final chunk, or a previous run died before the rename); a
+            # Range request from the end of the file would be answered 416
+            if task_id is not None:
+                progress.update(task_id, total=expected_size, completed=offset)  # type: ignore[arg-type]
+            break
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        try:
+            request_start = time.perf_counter()
+            response = http.get(url, headers=headers, stream=True, timeout=30)
+            if stats is not None and stats.ttfb_s is None:
+                stats.ttfb_s = time.perf_counter() - request_start
+            response.raise_for_status()
+
+            if offset and response.status_code != 206:
+                # Server ignored the Range header, start over
+                offset = 0
+
+            total_size = offset + int(response.headers.get("Content-Length", 0))
+            if expected_size is None:
+                expected_size = total_size
+            elif "Content-Length" in response.headers and total_size != expected_size:
+                # The file changed since it was listed (e.g. a log still being
+                # written while following); download its current version
+                if offset:
+                    response.close()
+                    offset = 0
+                    response = http.get(url, stream=True, timeout=30)
+                    response.raise_for_status()
+                    total_size = int(response.headers.get("Content-Length", 0))
+                logging.info(
+                    "%s changed size since it was listed (%d -> %d bytes)",
+                    dest_path.name,
+                    expected_size,
+                    total_size,
+                )
+                expected_size = total_size
+
+            if task_id is not None:
+                if total_size > 0:
+                    progress.update(task_id, total=total_size)  # type: ignore[arg-type]
+                progress.update(task_id, completed=offset)  # type: ignore[arg-type]
+
+            with response, open(part_path, "r+b" if offset else "wb") as f:
+                f.seek(offset)
+                f.truncate()
+                uncommitted = 0
+
+                for chunk in response.iter_content(
+                    chunk_size=chunk_size or adaptive_chunk_size(total_size)
+                ):
+                    if chunk:
+                        if bandwidth is not None:
+                            bandwidth.acquire(len(chunk))
+                        f.write(chunk)
+                        offset += len(chunk)
+                        uncommitted += len(chunk)
+                        advancer.advance(len(chunk))
+                        if uncommitted >= JOURNAL_INTERVAL_BYTES:
+                            f.flush()
+                            write_journal(journal_path, expected_size, offset)
+                            uncommitted = 0
+            break
+
+        except TRANSIENT_ERRORS as e:
+            if part_path.exists():
+                offset = min(offset, part_path.stat().st_size)
+                write_journal(journal_path, expected_size or 0, offset)
+            if attempt == max_attempts:
+                raise
+            if stats is not None:
+                stats.retries += 1
+            logging.warning(
+                "Transfer of %s interrupted at byte %d (attempt %d/%d): %s",
+                dest_path.name,
+                offset,
+                attempt,
+                max_attempts,
+                e,
+            )
+        finally:
+            advancer.flush()
+
+    if expected_size and offset != expected_size:
+        write_journal(journal_path, expected_size, offset)
+        raise IOError(
+            f"Incomplete download of {dest_path.name}: "
+            f"received {offset} of {expected_size} bytes"
+        )
 
-    response = requests.get(url, stream=True, timeout=30)
-    response.raise_for_status()
+    os.replace(part_path, dest_path)
+    journal_path.unlink(missing_ok=True)
 
-    total_size = int(response.headers.get("Content-Length", 0))
 
-    if task_id is not None and total_size > 0:
-        progress.update(task_id, total=total_size)  # type: ignore[arg-type]
+def _read_segment_journal(
+    journal_path: Path, part_path: Path, expected_size: int, segment_count: int
+) -> list[list[int]] | None:
+    """Return the [start, end, committed] segment table of a resumable download."""
+    if not journal_path.exists() or not part_path.exists():
+        return None
+
+    try:
+        journal = json.loads(journal_path.read_text())
+    except (OSError, ValueError) as e:
+        logging.debug("Ignoring unreadable journal %s: %s", journal_path, e)
+        return None
+
+    segments = journal.get("segments")
+    if (
+        journal.get("size") != expected_size
+        or not isinstance(segments, list)
+        or len(segments) != segment_count
+        or part_path.stat().st_size != expected_size
+    ):
+        return None
+
+    return [[int(v) for v in segment] for segment in segments]
+
+
+def _probe_etag(url: str, session: requests.Session | None = None) -> str | None:
+    """Fetch the storage ETag of ``url`` with a one-byte range request."""
+    http = session if session is not None else requests
+    try:
+        with http.get(
+            url, headers={"Range": "bytes=0-0"}, stream=True, timeout=30
+        ) as response:
+            response.raise_for_status()
+            return response.headers.get("ETag")
+    except requests.RequestException as e:
+        logging.debug("Could not probe ETag: %s", e)
+        return None
+
+
+def _supports_range(url: str, session: requests.Session | None = None) -> bool:
+    """Probe whether the server honours byte-range requests for ``url``."""
+    http = session if session is not None else requests
+    with http.get(
+        url, headers={"Range": "bytes=0-0"}, stream=True, timeout=30
+    ) as response:
+        response.raise_for_status()
+        return response.status_code == 206
+
+
+def download_file_segmented(
+    url: str,
+    dest_path: Path,
+    progress: Progress,
+    task_id: int | None,
+    expected_size: int,
+    segments: int = DEFAULT_SEGMENTS,
+    max_attempts: int = DEFAULT_RESUME_ATTEMPTS,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    stats: TransferStats | None = None,
+) -> None:
+    """
+    Download a large file as ``segments`` concurrent byte-range requests.
+
+    The ``<dest>.part`` file is preallocated to ``expected_size`` and each
+    segment writes its range through its own file handle. Per-segment progress
+    is committed to the ``<dest>.part.json`` journal, so a failed segment is
+    retried (and an interrupted download resumed) from where it stopped. Falls
+    back to ``download_file`` if the server does not support range requests.
+    """
+    if not _supports_range(url, session):
+        logging.info("Range requests not supported for %s", dest_path.name)
+        download_file(
+            url,
+            dest_path,
+            progress,
+            task_id,
+            expected_size,
+            max_attempts,
+            session,
+            chunk_size,
+            bandwidth,
+            stats,
+        )
+        return
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = dest_path.with_name(dest_path.name + PART_SUFFIX)
+    journal_path = dest_path.with_name(dest_path.name + JOURNAL_SUFFIX)
+
+    table = _read_segment_journal(journal_path, part_path, expected_size, segments)
+    if table is None:
+        bounds = [expected_size * i // segments for i in range(segments + 1)]
+        table = [[bounds[i], bounds[i + 1], bounds[i]] for i in range(segments)]
+        with open(part_path, "wb") as f:
+            f.truncate(expected_size)
+    else:
+        logging.info("Resuming segmented download of %s", dest_path.name)
+
+    http = session if session is not None else requests
+    chunk_size = chunk_size or adaptive_chunk_size(expected_size // segments)
+    journal_lock = threading.Lock()
+
+    def commit() -> None:
+        with journal_lock:
+            tmp_path = journal_path.with_name(journal_path.name + ".tmp")
+            tmp_path.write_text(json.dumps({"size": expected_size, "segments": table}))
+            os.replace(tmp_path, journal_path)
+
+    commit()
+
+    if task_id is not None:
+        already_done = sum(committed - start for start, _, committed in table)
+        progress.update(task_id, total=expected_size, completed=already_done)  # type: ignore[arg-type]
+
+    def fetch_segment(segment: list[int]) -> None:
+        _, end, _ = segment
+        advancer = _ProgressAdvancer(progress, task_id)
+
+        for attempt in range(1, max_attempts + 1):
+            if segment[2] >= end:
+                return
+            headers = {"Range": f"bytes={segment[2]}-{end - 1}"}
+
+            try:
+                request_start = time.perf_counter()
+                with http.get(
+                    url, headers=headers, stream=True, timeout=30
+                ) as response:
+                    if stats is not None and stats.ttfb_s is None:
+                        stats.ttfb_s = time.perf_counter() - request_start
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise IOError("Server ignored the Range header")
+
+                    with open(part_path, "r+b") as f:
+                        f.seek(segment[2])
+                        uncommitted = 0
+
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            if chunk:
+                                chunk = chunk[: end - segment[2]]
+                                if bandwidth is not None:
+                                    bandwidth.acquire(len(chunk))
+                                f.write(chunk)
+                                segment[2] += len(chunk)
+                                uncommitted += len(chunk)
+                                advancer.advance(len(chunk))
+                                if uncommitted >= JOURNAL_INTERVAL_BYTES:
+                                    f.flush()
+                                    commit()
+                                    uncommitted = 0
+                commit()
+
+            except TRANSIENT_ERRORS as e:
+                commit()
+                if attempt == max_attempts:
+                    raise
+                if stats is not None:
+                    stats.retries += 1
+                logging.warning(
+                    "Segment %d-%d of %s interrupted at byte %d (attempt %d/%d): %s",
+                    segment[0],
+                    end,
+                    dest_path.name,
+                    segment[2],
+                    attempt,
+                    max_attempts,
+                    e,
+                )
+            finally:
+                advancer.flush()
+
+        if segment[2] < end:
+            raise IOError(f"Incomplete segment {segment[0]}-{end} of {dest_path.name}")
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        for future in [executor.submit(fetch_segment, seg) for seg in table]:
+            future.result()
+
+    os.replace(part_path, dest_path)
+    journal_path.unlink(missing_ok=True)
+
+
+def download_to_archive(
+    url: str,
+    archive: JobArchiveWriter,
+    name: str,
+    progress: Progress,
+    task_id: int | None = None,
+    expected_size: int | None = None,
+    max_attempts: int = DEFAULT_RESUME_ATTEMPTS,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    stats: TransferStats | None = None,
+) -> None:
+    """
+    Download a file from URL straight into a job archive as member ``name``.
+
+    The body is buffered in a spooled temporary file (in memory up to
+    ``ARCHIVE_SPOOL_BYTES``) so concurrent downloads don't hold the archive
+    while streaming, then appended to the archive in one write. Interrupted
+    transfers resume from the buffered offset with an HTTP Range request.
+    """
+    http = session if session is not None else requests
+    advancer = _ProgressAdvancer(progress, task_id)
+
+    with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_BYTES) as spool:
+        offset = 0
+
+        for attempt in range(1, max_attempts + 1):
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+            try:
+                request_start = time.perf_counter()
+                response = http.get(url, headers=headers, stream=True, timeout=30)
+                if stats is not None and stats.ttfb_s is None:
+                    stats.ttfb_s = time.perf_counter() - request_start
+                response.raise_for_status()
+
+                if offset and response.status_code != 206:
+                    # Server ignored the Range header, start over
+                    offset = 0
+                    spool.seek(0)
+                    spool.truncate()
+
+                total_size = offset + int(response.headers.get("Content-Length", 0))
+                if expected_size is None:
+                    expected_size = total_size
+                elif (
+                    "Content-Length" in response.headers and total_size != expected_size
+                ):
+                    # The file changed since it was listed; take its current version
+                    if offset:
+                        response.close()
+                        offset = 0
+                        spool.seek(0)
+                        spool.truncate()
+                        response = http.get(url, stream=True, timeout=30)
+                        response.raise_for_status()
+                        total_size = int(response.headers.get("Content-Length", 0))
+                    logging.info(
+                        "%s changed size since it was listed (%d -> %d bytes)",
+                        name,
+                        expected_size,
+                        total_size,
+                    )
+                    expected_size = total_size
 
-    with open(dest_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
                 if task_id is not None:
-                    progress.update(task_id, advance=len(chunk))  # type: ignore[arg-type]
+                    if total_size > 0:
+                        progress.update(task_id, total=total_size)  # type: ignore[arg-type]
+                    progress.update(task_id, completed=offset)  # type: ignore[arg-type]
+
+                with response:
+                    for chunk in response.iter_content(
+                        chunk_size=chunk_size or adaptive_chunk_size(total_size)
+                    ):
+                        if chunk:
+                            if bandwidth is not None:
+                                bandwidth.acquire(len(chunk))
+                            spool.write(chunk)
+                            offset += len(chunk)
+                            advancer.advance(len(chunk))
+                break
+
+            except TRANSIENT_ERRORS as e:
+                if attempt == max_attempts:
+                    raise
+                if stats is not None:
+                    stats.retries += 1
+                logging.warning(
+                    "Transfer of %s interrupted at byte %d (attempt %d/%d): %s",
+                    name,
+                    offset,
+                    attempt,
+                    max_attempts,
+                    e,
+                )
+            finally:
+                advancer.flush()
 
+        if expected_size and offset != expected_size:
+            raise IOError(
+                f"Incomplete download of {name}: "
+                f"received {offset} of {expected_size} bytes"
+            )
 
-def download_job(
+        spool.seek(0)
+        archive.add(name, spool, offset)
+
+
+def download_result_file(
+    co_client: CodeOcean,
+    job_id: str,
+    file_item: FolderItem,
+    job_download_dir: Path,
+    progress: Progress,
+    manifest: DownloadManifest | None = None,
+    segments: int = DEFAULT_SEGMENTS,
+    segment_threshold_mb: float = DEFAULT_SEGMENT_THRESHOLD_MB,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    url_cache: FileURLCache | None = None,
+    archive: JobArchiveWriter | None = None,
+    metrics: JobMetrics | None = None,
+    blob_store: BlobStore | None = None,
+) -> bool:
+    """
+    Resolve the download URL for a single result file and download it.
+
+    Safe to call from worker threads; rich's Progress serializes its own updates.
+    Files larger than ``segment_threshold_mb`` are split into ``segments``
+    concurrent range requests. Completed files are recorded in ``manifest``
+    when one is given. URLs come from ``url_cache`` when one is given; a URL
+    rejected with 403 (e.g. expired) is re-resolved once and the transfer
+    resumed. When ``archive`` is given the file is appended to it instead of
+    being written under ``job_download_dir``. URL wait, time to first byte,
+    transfer time, retries and errors are recorded in ``metrics`` when given.
+    With a ``blob_store``, a file whose size and ETag match a stored blob is
+    linked from it instead of downloaded, and downloaded files are added to it.
+
+    Returns:
+        True if the file was downloaded, False otherwise
+    """
+    file_path: str = file_item.path
+    file_size: int = file_item.size or 0
+
+    def resolve_url() -> str:
+        if url_cache is not None:
+            return url_cache.get(job_id, file_path)
+        url_response: FileURLs = co_client.computations.get_result_file_urls(
+            computation_id=job_id, path=file_path
+        )
+        return url_response.download_url
+
+    # Get download URL
+    url_start = time.perf_counter()
+    try:
+        download_url: str = resolve_url()
+    except Exception as e:
+        logging.error("Failed to get URL for %s: %s", file_path, e)
+        if metrics is not None:
+            metrics.record_file(file_path, file_size, 0.0, error=f"URL: {e}")
+        return False
+    finally:
+        if metrics is not None:
+            metrics.url_resolution.record(time.perf_counter() - url_start)
+
+    # Determine local path (preserve structure from Code Ocean)
+    # Remove leading slash and create path relative to job directory
+    relative_path_str: str = file_path.lstrip("/")
+    dest_path: Path = job_download_dir / relative_path_str
+
+    # Link identical files already downloaded for any job instead of fetching them
+    store = (
+        blob_store
+        if blob_store is not None and archive is None and blob_store.wants(file_size)
+        else None
+    )
+    etag: str | None = None
+    if store is not None:
+        etag = _probe_etag(download_url, session)
+        blob = store.lookup(file_size, etag)
+        if blob is not None:
+            try:
+                link_or_copy(blob, dest_path)
+                logging.info("Linked from blob store: %s", relative_path_str)
+                if manifest is not None:
+                    manifest.record(file_item)
+                if metrics is not None:
+                    metrics.record_deduplicated()
+                return True
+            except OSError as e:
+                logging.warning(
+                    "Could not link %s from blob store, downloading: %s",
+                    relative_path_str,
+                    e,
+                )
+
+    # Create file task
+    file_task = progress.add_task(
+        f"[green]{relative_path_str}", total=file_size, visible=True
+    )
+
+    stats = TransferStats()
+    transfer_start = time.perf_counter()
+
+    try:
+        for attempt in (1, 2):
+            try:
+                if archive is not None:
+                    download_to_archive(
+                        download_url,
+                        archive,
+                        relative_path_str,
+                        progress,
+                        file_task,
+                        file_size,
+                        session=session,
+                        chunk_size=chunk_size,
+                        bandwidth=bandwidth,
+                        stats=stats,
+                    )
+                elif segments > 1 and file_size > segment_threshold_mb * 1024 * 1024:
+                    download_file_segmented(
+                        download_url,
+                        dest_path,
+                        progress,
+                        file_task,
+                        file_size,
+                        segments,
+                        session=session,
+                        chunk_size=chunk_size,
+                        bandwidth=bandwidth,
+                        stats=stats,
+                    )
+                else:
+                    download_file(
+                        download_url,
+                        dest_path,
+                        progress,
+                        file_task,
+                        expected_size=file_size,
+                        session=session,
+                        chunk_size=chunk_size,
+                        bandwidth=bandwidth,
+                        stats=stats,
+                    )
+                break
+            except requests.HTTPError as e:
+                if attempt == 2 or e.response is None or e.response.status_code != 403:
+                    raise
+                logging.info(
+                    "Download URL for %s was rejected, re-resolving",
+                    relative_path_str,
+                )
+                if url_cache is not None:
+                    url_cache.invalidate(job_id, file_path)
+                stats.retries += 1
+                download_url = resolve_url()
+        logging.info("Downloaded: %s", relative_path_str)
+        if store is not None:
+            try:
+                if store.add(dest_path, file_size, etag):
+                    logging.info("Deduplicated: %s", relative_path_str)
+                    if metrics is not None:
+                        metrics.record_deduplicated()
+            except OSError as e:
+                logging.warning(
+                    "Could not add %s to blob store: %s", relative_path_str, e
+                )
+        if manifest is not None:
+            manifest.record(file_item)
+        if metrics is not None:
+            metrics.record_file(
+                file_path, file_size, time.perf_counter() - transfer_start, stats
+            )
+        return True
+    except Exception as e:
+        logging.error("Failed to download %s: %s", relative_path_str, e)
+        if metrics is not None:
+            metrics.record_file(
+                file_path,
+                file_size,
+                time.perf_counter() - transfer_start,
+                stats,
+                error=str(e),
+            )
+        return False
+    finally:
+        progress.remove_task(file_task)
+
+
+@dataclass
+class JobPlan:
+    """Files of a computation that still need to be downloaded."""
+
+    job_id: str
+    job_download_dir: Path
+    manifest: DownloadManifest | None
+    files_to_download: list[FolderItem]
+    # Set in archive mode, where files go into one tar per job instead
+    archive_path: Path | None = None
+    # Folders that couldn't be listed; the job can't be complete without them
+    failed_folders: list[str] = field(default_factory=list)
+
+    @property
+    def destination(self) -> Path:
+        return self.archive_path or self.job_download_dir
+
+    def open_archive(self) -> JobArchiveWriter | None:
+        return JobArchiveWriter(self.archive_path) if self.archive_path else None
+
+
+def plan_job(
     co_client: CodeOcean,
     job_id: str,
     max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
     force_download: bool = DEFAULT_FORCE_DOWNLOAD,
     auto_download: bool = DEFAULT_AUTO_DOWNLOAD,
-) -> bool:
+    listing_workers: int = DEFAULT_LISTING_WORKERS,
+    verify: bool = DEFAULT_VERIFY,
+    path_filter: PathFilter | None = None,
+    archive: bool = DEFAULT_ARCHIVE,
+    follow: bool = False,
+    metrics: JobMetrics | None = None,
+) -> JobPlan | None:
     """
-    Download all files for a given Code Ocean job_id, preserving folder structure.
+    Check a computation, list its results and decide which files to download.
+
+    Prints the download summary and, unless ``auto_download``, asks for
+    confirmation.
 
     Args:
         co_client: Code Ocean client
@@ -147,9 +1060,18 @@ def download_job(
         max_file_size_mb: Maximum file size in MB to download (None for no limit)
         force_download: If True, download files even if they already exist locally
         auto_download: If True, skip confirmation prompt (default: True)
+        listing_workers: Number of result folders to list concurrently
+        verify: If True, check local file sizes against the listing instead of
+            trusting the job's download manifest
+        path_filter: Include/exclude patterns applied while listing results
+        archive: If True, plan downloads into ``<job_id>.tar`` under the download
+            root, skipping files already in its index
+        follow: If True, also plan computations that are still running; files
+            that are new or have grown since the last sync are downloaded
+        metrics: Records listing latencies when given
 
     Returns:
-        True if download was successful, False otherwise
+        The job's download plan, or None if the job can't or shouldn't be downloaded
     """
     logging.info("Retrieving computation information for job_id: %s", job_id)
 
@@ -166,35 +1088,60 @@ def download_job(
         )
 
         # Check if computation is completed
-        if state and state.value not in ["completed", "failed", "stopped"]:
+        if not follow and state and state.value not in TERMINAL_STATES:
             logging.warning(
                 "Computation %s is not in a terminal state (current state: %s). Skipping.",
                 job_id,
                 state.value,
             )
-            return False
+            return None
 
         if not has_results:
             logging.warning(
                 "Computation %s has no results to download. Skipping.", job_id
             )
-            return False
+            return None
 
     except Exception as e:
         logging.error("Failed to retrieve computation %s: %s", job_id, e)
-        return False
+        return None
 
     # List all files in the computation results
     logging.info("Scanning computation results...")
-    all_files: list[FolderItem] = list_all_files(co_client, job_id)
+    failed_folders: list[str] = []
+    all_files: list[FolderItem] = list_all_files(
+        co_client,
+        job_id,
+        workers=listing_workers,
+        path_filter=path_filter,
+        metrics=metrics,
+        failed_folders=failed_folders,
+    )
 
     if not all_files:
         logging.warning("No files found in computation results for job_id: %s", job_id)
-        return False
+        return None
 
-    # Create download directory
     job_download_dir = DOWNLOAD_ROOT / job_id
-    job_download_dir.mkdir(parents=True, exist_ok=True)
+    manifest: DownloadManifest | None = None
+    archive_path: Path | None = None
+
+    if archive:
+        # The archive index plays the role of the manifest
+        archive_path = DOWNLOAD_ROOT / f"{job_id}{ARCHIVE_SUFFIX}"
+        archived = load_archive_index(archive_path)
+
+        def is_current(file_item: FolderItem) -> bool:
+            member = archived.get(file_item.path.lstrip("/"))
+            return member is not None and member.size == file_item.size
+
+    else:
+        # Create download directory
+        job_download_dir.mkdir(parents=True, exist_ok=True)
+        manifest = DownloadManifest(job_download_dir)
+
+        def is_current(file_item: FolderItem) -> bool:
+            return manifest.is_current(file_item, verify)
 
     # Filter files by size and existence if specified
     files_to_download: list[FolderItem] = []
@@ -222,10 +1169,8 @@ def download_job(
             )
             continue
 
-        # Check if file already exists
-        rel_path: str = path.lstrip("/")
-        dest_file_path: Path = job_download_dir / rel_path
-        if dest_file_path.exists() and not force_download:
+        # Check if file already exists (per the job manifest or archive index)
+        if not force_download and is_current(file_item):
             existing_files.append((path, file_size_mb))
             logging.info("File already exists, skipping: %s", path)
         else:
@@ -240,6 +1185,8 @@ def download_job(
     console.print(f"Files to download: {len(files_to_download)}")
     console.print(f"Files skipped (size): {len(skipped_files)}")
     console.print(f"Files already exist: {len(existing_files)}")
+    if failed_folders:
+        console.print(f"[red]Folders that failed to list: {len(failed_folders)}[/red]")
 
     if files_to_download:
         console.print("\n[green]Files to download:[/green]")
@@ -285,9 +1232,18 @@ def download_job(
 
         console.print(existing_table)
 
+    plan = JobPlan(
+        job_id,
+        job_download_dir,
+        manifest,
+        files_to_download,
+        archive_path,
+        failed_folders,
+    )
+
     if not files_to_download:
         logging.info("No files to download after filtering.")
-        return True
+        return plan
 
     total_size_mb: float = sum(
         (item.size or 0) / (1024 * 1024) for item in files_to_download
@@ -302,21 +1258,31 @@ def download_job(
     message = (
         f"\nAbout to download {len(files_to_download)} file(s) "
         f"({total_size_mb:.2f} MB){size_filter_msg}{force_msg}\n"
-        f"Download root: {DOWNLOAD_ROOT}\n"
+        f"Download to: {plan.destination}\n"
         f"Proceed?"
     )
 
     if not auto_download:
         if not Confirm.ask(message, default=False):
             logging.info("Download cancelled by user.")
-            return False
+            return None
     else:
         console.print("\n[green]Auto-download enabled, proceeding...[/green]")
 
-    # Download files with progress tracking
-    console.print("\n[bold green]Downloading files...[/bold green]")
+    return plan
 
-    progress = Progress(
+
+def write_job_report(metrics: JobMetrics) -> Path:
+    """Write a job's timing report to ``DOWNLOAD_ROOT/reports`` and return its path."""
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(metrics.started_at))
+    report_path = DOWNLOAD_ROOT / REPORTS_DIRNAME / f"{metrics.job_id}_{stamp}.json"
+    write_report(report_path, metrics.to_dict())
+    return report_path
+
+
+def make_progress() -> Progress:
+    """Create the progress display used for file downloads."""
+    return Progress(
         TextColumn("[bold blue]{task.description}", justify="right"),
         BarColumn(bar_width=None),
         "[progress.percentage]{task.percentage:>3.1f}%",
@@ -328,48 +1294,402 @@ def download_job(
         TimeRemainingColumn(),
     )
 
-    with progress:
-        overall_task = progress.add_task("[cyan]Overall", total=len(files_to_download))
 
-        for file_item in files_to_download:
-            file_path: str = file_item.path
-            file_size: int = file_item.size or 0
+def download_job(
+    co_client: CodeOcean,
+    job_id: str,
+    max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
+    force_download: bool = DEFAULT_FORCE_DOWNLOAD,
+    auto_download: bool = DEFAULT_AUTO_DOWNLOAD,
+    workers: int = DEFAULT_WORKERS,
+    listing_workers: int = DEFAULT_LISTING_WORKERS,
+    verify: bool = DEFAULT_VERIFY,
+    segments: int = DEFAULT_SEGMENTS,
+    segment_threshold_mb: float = DEFAULT_SEGMENT_THRESHOLD_MB,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    path_filter: PathFilter | None = None,
+    archive: bool = DEFAULT_ARCHIVE,
+    follow: bool = False,
+    metrics: JobMetrics | None = None,
+    blob_store: BlobStore | None = None,
+) -> bool:
+    """
+    Download all files for a given Code Ocean job_id, preserving folder structure.
 
-            # Get download URL
-            try:
-                url_response: FileURLs = co_client.computations.get_result_file_urls(
-                    computation_id=job_id, path=file_path
-                )
-                download_url: str = url_response.download_url
-            except Exception as e:
-                logging.error("Failed to get URL for %s: %s", file_path, e)
-                progress.update(overall_task, advance=1)
-                continue
+    Args:
+        co_client: Code Ocean client
+        job_id: The Code Ocean computation ID to download results from
+        max_file_size_mb: Maximum file size in MB to download (None for no limit)
+        force_download: If True, download files even if they already exist locally
+        auto_download: If True, skip confirmation prompt (default: True)
+        workers: Number of files to resolve and download concurrently
+        listing_workers: Number of result folders to list concurrently
+        verify: If True, check local file sizes against the listing instead of
+            trusting the job's download manifest
+        segments: Number of concurrent range requests per large file
+        segment_threshold_mb: Files larger than this (in MB) are downloaded in segments
+        session: Shared HTTP session for file transfers (one sized for
+            ``workers * segments`` connections is created if None)
+        chunk_size: Streaming chunk size in bytes (None to adapt to file size)
+        bandwidth: Optional limiter acquired for every byte transferred
+        path_filter: Include/exclude patterns applied while listing results
+        archive: If True, stream files into a single ``<job_id>.tar`` (read it
+            back with ``archive.JobArchive``) instead of a folder tree
+        follow: If True, sync the current results of a running computation
+        metrics: Collects phase timings; a JSON report of them is written under
+            ``DOWNLOAD_ROOT/reports`` once files have been downloaded
+        blob_store: Content-addressed store shared across jobs; files already
+            in it are hardlinked instead of downloaded
 
-            # Determine local path (preserve structure from Code Ocean)
-            # Remove leading slash and create path relative to job directory
-            relative_path_str: str = file_path.lstrip("/")
-            dest_path: Path = job_download_dir / relative_path_str
+    Returns:
+        True if every folder was listed and every file was downloaded (or none
+        needed to be), False otherwise
+    """
+    if metrics is None:
+        metrics = JobMetrics(job_id)
+
+    plan = plan_job(
+        co_client,
+        job_id,
+        max_file_size_mb,
+        force_download,
+        auto_download,
+        listing_workers,
+        verify,
+        path_filter,
+        archive,
+        follow,
+        metrics,
+    )
 
-            # Create file task
-            file_task = progress.add_task(
-                f"[green]{relative_path_str}", total=file_size, visible=True
-            )
+    if plan is None:
+        return False
 
-            try:
-                download_file(download_url, dest_path, progress, file_task)
-                logging.info("Downloaded: %s", relative_path_str)
-            except Exception as e:
-                logging.error("Failed to download %s: %s", relative_path_str, e)
-            finally:
-                progress.remove_task(file_task)
-                progress.update(overall_task, advance=1)
+    if not plan.files_to_download:
+        return not plan.failed_folders
+
+    # Download files with progress tracking
+    console = Console()
+    console.print("\n[bold green]Downloading files...[/bold green]")
+
+    if session is None:
+        session = create_http_session(workers * max(1, segments))
+
+    progress = make_progress()
+    # Files in folders that couldn't be listed are missing too
+    failed_count = len(plan.failed_folders)
+
+    job_archive = plan.open_archive()
+    transfer_start = time.perf_counter()
+
+    with (
+        progress,
+        FileURLCache(co_client, workers) as url_cache,
+        ThreadPoolExecutor(max_workers=max(1, workers)) as executor,
+    ):
+        overall_task = progress.add_task(
+            "[cyan]Overall", total=len(plan.files_to_download)
+        )
+
+        # Resolve download URLs ahead of the download workers
+        url_cache.prefetch(job_id, (item.path for item in plan.files_to_download))
+
+        futures = [
+            executor.submit(
+                download_result_file,
+                co_client,
+                job_id,
+                file_item,
+                plan.job_download_dir,
+                progress,
+                plan.manifest,
+                segments,
+                segment_threshold_mb,
+                session,
+                chunk_size,
+                bandwidth,
+                url_cache,
+                job_archive,
+                metrics,
+                blob_store,
+            )
+            for file_item in plan.files_to_download
+        ]
+
+        for future in as_completed(futures):
+            if not future.result():
+                failed_count += 1
+            progress.update(overall_task, advance=1)
+
+    if job_archive is not None:
+        job_archive.close()
+
+    metrics.add_phase("transfer", time.perf_counter() - transfer_start)
+    report_path = write_job_report(metrics)
+    logging.info("Wrote download report to %s", report_path)
+
+    if failed_count:
+        logging.warning(
+            "%d of %d file(s) and %d folder listing(s) failed for job %s",
+            failed_count - len(plan.failed_folders),
+            len(plan.files_to_download),
+            len(plan.failed_folders),
+            job_id,
+        )
 
     console.print(
-        f"\n[bold green]✓[/bold green] Download complete. Files saved to: {job_download_dir}"
+        f"\n[bold green]✓[/bold green] Download complete. Files saved to: {plan.destination}"
     )
 
-    return True
+    return failed_count == 0
+
+
+def follow_job(
+    co_client: CodeOcean,
+    job_id: str,
+    interval_s: float = DEFAULT_FOLLOW_INTERVAL_S,
+    max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
+    workers: int = DEFAULT_WORKERS,
+    listing_workers: int = DEFAULT_LISTING_WORKERS,
+    verify: bool = DEFAULT_VERIFY,
+    segments: int = DEFAULT_SEGMENTS,
+    segment_threshold_mb: float = DEFAULT_SEGMENT_THRESHOLD_MB,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    path_filter: PathFilter | None = None,
+    archive: bool = DEFAULT_ARCHIVE,
+    metrics: JobMetrics | None = None,
+    blob_store: BlobStore | None = None,
+) -> bool:
+    """
+    Keep a local copy of a computation's results in sync while it runs.
+
+    Every ``interval_s`` seconds the results are re-listed and files that are
+    new or whose size changed since the last sync (per the job manifest or
+    archive index) are downloaded. The state is checked before each listing,
+    so the sync that follows the computation reaching a terminal state is
+    complete, and following stops after it.
+
+    Args:
+        co_client: Code Ocean client
+        job_id: The Code Ocean computation ID to follow
+        interval_s: Seconds to wait between syncs
+        metrics: Accumulates the timings of all syncs (one report is rewritten
+            after each sync)
+        (other arguments as for ``download_job``)
+
+    Returns:
+        True if the computation finished and its final results were synced,
+        False if its state could not be retrieved
+    """
+    if session is None:
+        session = create_http_session(workers * max(1, segments))
+    if metrics is None:
+        metrics = JobMetrics(job_id)
+
+    sync_count = 0
+
+    while True:
+        try:
+            computation: Computation = co_client.computations.get_computation(job_id)
+        except Exception as e:
+            logging.error("Failed to retrieve computation %s: %s", job_id, e)
+            return False
+
+        state = computation.state.value if computation.state else None
+        finished = state in TERMINAL_STATES
+
+        if computation.has_results:
+            sync_count += 1
+            logging.info(
+                "Sync %d of computation %s (state: %s)", sync_count, job_id, state
+            )
+            download_job(
+                co_client,
+                job_id,
+                max_file_size_mb,
+                False,
+                True,
+                workers,
+                listing_workers,
+                verify,
+                segments,
+                segment_threshold_mb,
+                session,
+                chunk_size,
+                bandwidth,
+                path_filter,
+                archive,
+                follow=True,
+                metrics=metrics,
+                blob_store=blob_store,
+            )
+        else:
+            logging.info("Computation %s has no results yet (state: %s)", job_id, state)
+
+        if finished:
+            logging.info(
+                "Computation %s is %s, stopped following after %d sync(s)",
+                job_id,
+                state,
+                sync_count,
+            )
+            return True
+
+        logging.info("Next sync of %s in %.0fs", job_id, interval_s)
+        time.sleep(interval_s)
+
+
+def download_jobs(
+    co_client: CodeOcean,
+    job_ids: Iterable[str],
+    max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
+    force_download: bool = DEFAULT_FORCE_DOWNLOAD,
+    workers: int = DEFAULT_WORKERS,
+    listing_workers: int = DEFAULT_LISTING_WORKERS,
+    verify: bool = DEFAULT_VERIFY,
+    segments: int = DEFAULT_SEGMENTS,
+    segment_threshold_mb: float = DEFAULT_SEGMENT_THRESHOLD_MB,
+    session: requests.Session | None = None,
+    chunk_size: int | None = None,
+    bandwidth: TokenBucket | None = None,
+    path_filter: PathFilter | None = None,
+    archive: bool = DEFAULT_ARCHIVE,
+    metrics: BatchMetrics | None = None,
+    blob_store: BlobStore | None = None,
+) -> dict[str, bool]:
+    """
+    Download many jobs through one shared, pipelined work queue.
+
+    Jobs are planned (status check, listing, filtering) one after another as
+    ``job_ids`` yields them, and their files are queued on a single pool of
+    ``workers`` download threads, so listing job N+1 overlaps downloading job N.
+    ``workers`` and ``bandwidth`` therefore bound the whole batch rather than
+    each job. Downloads proceed without confirmation. A computation ID yielded
+    again is skipped, since concurrent downloads of the same files would
+    corrupt each other's ``.part`` files and journals.
+
+    Args:
+        co_client: Code Ocean client
+        job_ids: Computation IDs to download; may be a lazily filled iterator
+        metrics: Collects each job's phase timings; a JSON report per job is
+            written under ``DOWNLOAD_ROOT/reports``
+        (other arguments as for ``download_job``)
+
+    Returns:
+        Dictionary mapping computation ID to whether all of its folders were
+        listed and all of its files downloaded
+    """
+    if session is None:
+        session = create_http_session(workers * max(1, segments))
+    if metrics is None:
+        metrics = BatchMetrics()
+
+    results: dict[str, bool] = {}
+    failed_counts: dict[str, int] = {}
+    remaining: dict[str, int] = {}
+    archives: dict[str, JobArchiveWriter] = {}
+    transfer_starts: dict[str, float] = {}
+    lock = threading.Lock()
+    progress = make_progress()
+
+    with (
+        progress,
+        FileURLCache(co_client, workers) as url_cache,
+        ThreadPoolExecutor(max_workers=max(1, workers)) as executor,
+    ):
+
+        def on_file_done(job_id: str, job_task: int, future: Future[bool]) -> None:
+            with lock:
+                if not future.result():
+                    failed_counts[job_id] += 1
+                remaining[job_id] -= 1
+                finished = remaining[job_id] == 0
+            progress.update(job_task, advance=1)  # type: ignore[arg-type]
+            if finished:
+                progress.remove_task(job_task)  # type: ignore[arg-type]
+                if job_id in archives:
+                    archives.pop(job_id).close()
+                metrics.job(job_id).add_phase(
+                    "transfer", time.perf_counter() - transfer_starts[job_id]
+                )
+                logging.info("Finished downloading job %s", job_id)
+
+        for job_id in job_ids:
+            if job_id in results:
+                logging.info("Job %s is already being downloaded, skipping", job_id)
+                continue
+
+            plan = plan_job(
+                co_client,
+                job_id,
+                max_file_size_mb,
+                force_download,
+                True,
+                listing_workers,
+                verify,
+                path_filter,
+                archive,
+                metrics=metrics.job(job_id),
+            )
+            results[job_id] = plan is not None and not plan.failed_folders
+
+            if plan is None or not plan.files_to_download:
+                continue
+
+            job_task = progress.add_task(
+                f"[cyan]{job_id}", total=len(plan.files_to_download)
+            )
+            job_archive = plan.open_archive()
+            with lock:
+                # Files in folders that couldn't be listed are missing too
+                failed_counts[job_id] = len(plan.failed_folders)
+                remaining[job_id] = len(plan.files_to_download)
+                transfer_starts[job_id] = time.perf_counter()
+                if job_archive is not None:
+                    archives[job_id] = job_archive
+
+            # Resolve download URLs ahead of the download workers
+            url_cache.prefetch(job_id, (item.path for item in plan.files_to_download))
+
+            for file_item in plan.files_to_download:
+                future = executor.submit(
+                    download_result_file,
+                    co_client,
+                    job_id,
+                    file_item,
+                    plan.job_download_dir,
+                    progress,
+                    plan.manifest,
+                    segments,
+                    segment_threshold_mb,
+                    session,
+                    chunk_size,
+                    bandwidth,
+                    url_cache,
+                    job_archive,
+                    metrics.job(job_id),
+                    blob_store,
+                )
+                future.add_done_callback(
+                    functools.partial(on_file_done, job_id, job_task)
+                )
+
+    # A job only succeeded if every one of its files was downloaded
+    for job_id, failed_count in failed_counts.items():
+        results[job_id] = failed_count == 0
+        if failed_count:
+            logging.warning(
+                "%d file(s) or folder listing(s) failed for job %s",
+                failed_count,
+                job_id,
+            )
+        write_job_report(metrics.job(job_id))
+
+    return results
 
 
 def main(
@@ -378,6 +1698,24 @@ def main(
     max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
     force_download: bool = DEFAULT_FORCE_DOWNLOAD,
     auto_download: bool = DEFAULT_AUTO_DOWNLOAD,
+    workers: int = DEFAULT_WORKERS,
+    listing_workers: int = DEFAULT_LISTING_WORKERS,
+    verify: bool = DEFAULT_VERIFY,
+    segments: int = DEFAULT_SEGMENTS,
+    segment_threshold_mb: float = DEFAULT_SEGMENT_THRESHOLD_MB,
+    pool_size: int | None = None,
+    chunk_size: int | None = None,
+    status_workers: int = DEFAULT_STATUS_WORKERS,
+    status_rate: float = DEFAULT_STATUS_RATE,
+    max_bandwidth_mbps: float | None = None,
+    api_rate: float | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    archive: bool = DEFAULT_ARCHIVE,
+    follow: bool = False,
+    follow_interval_s: float = DEFAULT_FOLLOW_INTERVAL_S,
+    dedup: bool = False,
+    dedup_min_size_mb: float = DEFAULT_DEDUP_MIN_SIZE_MB,
 ) -> None:
     """
     Download files from Code Ocean computations.
@@ -388,12 +1726,82 @@ def main(
         max_file_size_mb: Maximum file size in MB to download (None for no limit)
         force_download: If True, download files even if they already exist locally
         auto_download: If True, skip confirmation prompt (default: True)
+        workers: Number of files to download concurrently (shared by all jobs
+            in batch mode)
+        listing_workers: Number of result folders to list concurrently per job
+        verify: If True, check local file sizes against the listing instead of
+            trusting the download manifest
+        segments: Number of concurrent range requests per large file
+        segment_threshold_mb: Files larger than this (in MB) are downloaded in segments
+        pool_size: HTTP connection pool size shared by all downloads
+            (None for ``workers * segments``)
+        chunk_size: Streaming chunk size in bytes (None to adapt to file size)
+        status_workers: Number of job statuses to check concurrently in batch mode
+        status_rate: Maximum job status requests per second in batch mode
+        max_bandwidth_mbps: Total download bandwidth limit in MB/s (None for no limit)
+        api_rate: Maximum Code Ocean API requests per second (None for no limit)
+        include: Glob patterns of result paths to download (None for all)
+        exclude: Glob patterns of result paths (files or folders) to skip
+        archive: If True, stream each job's files into a single indexed tar
+        follow: If True, keep syncing a running computation (single job mode)
+            until it finishes
+        follow_interval_s: Seconds between syncs when following
+        dedup: If True, store files in a content-addressed blob store shared by
+            all jobs and hardlink them into job folders, so identical files are
+            downloaded and stored once
+        dedup_min_size_mb: Only deduplicate files at least this large
     """
+    # One governor throttles API requests and file bandwidth, and backs off on
+    # 429/5xx responses for everything below
+    governor = Governor(
+        requests_per_second=api_rate,
+        bytes_per_second=max_bandwidth_mbps * 1024 * 1024
+        if max_bandwidth_mbps
+        else None,
+    )
+    bandwidth = governor.bandwidth
+
     logging.info("Initializing Code Ocean client...")
-    co_client = get_codeocean_client()
+    # Status checks, folder listings, URL prefetches and download workers
+    # (re-resolving URLs) can all be waiting on the API at once
+    co_client = get_codeocean_client(
+        governor, status_workers + listing_workers + 2 * workers
+    )
+    session = create_http_session(pool_size or workers * max(1, segments), governor)
+    path_filter = PathFilter(include or [], exclude or []) or None
+    run_metrics = BatchMetrics()
+    blob_store = (
+        BlobStore(DOWNLOAD_ROOT / BLOB_DIRNAME, dedup_min_size_mb) if dedup else None
+    )
+    if blob_store is not None and archive:
+        logging.warning("--dedup has no effect with --archive")
 
     # Determine which mode we're in
-    if jobs_file is not None:
+    if follow:
+        if job_id is None:
+            logging.error("--follow requires --job-id")
+            return
+
+        # Incremental sync of a (possibly running) computation
+        follow_job(
+            co_client,
+            job_id,
+            follow_interval_s,
+            max_file_size_mb,
+            workers,
+            listing_workers,
+            verify,
+            segments,
+            segment_threshold_mb,
+            session,
+            chunk_size,
+            bandwidth,
+            path_filter,
+            archive,
+            run_metrics.job(job_id),
+            blob_store,
+        )
+    elif jobs_file is not None:
         # Batch mode: process jobs from file
         logging.info("Loading jobs from file: %s", jobs_file)
 
@@ -409,7 +1817,8 @@ def main(
 
         logging.info("Found %d job(s) in %s", len(jobs_dict), jobs_file)
 
-        # Check status of all jobs first
+        # Check job statuses concurrently; downloads start on ready jobs while
+        # the remaining statuses are still being fetched
         console = Console()
         console.print("\n[bold cyan]Checking job status...[/bold cyan]")
 
@@ -420,38 +1829,105 @@ def main(
         status_table.add_column("Has Results", justify="center")
         status_table.add_column("Action", style="white")
 
+        ready_jobs: queue.Queue[tuple[str, str] | None] = queue.Queue()
         jobs_to_download: list[tuple[str, str]] = []
 
-        for job_key, computation_id in jobs_dict.items():
-            state, has_results = check_computation_status(co_client, computation_id)
-
-            if state is None:
-                status_table.add_row(
-                    job_key, computation_id, "[red]Error[/red]", "?", "[red]Skip[/red]"
-                )
-            elif state.value in ["completed", "failed", "stopped"] and has_results:
-                status_table.add_row(
+        def collect_statuses() -> None:
+            status_start = time.perf_counter()
+            try:
+                for (
                     job_key,
                     computation_id,
-                    f"[green]{state.value}[/green]",
-                    "[green]✓[/green]",
-                    "[green]Download[/green]",
-                )
-                jobs_to_download.append((job_key, computation_id))
-            else:
-                action = (
-                    "[yellow]Skip (no results)[/yellow]"
-                    if not has_results
-                    else f"[yellow]Skip ({state.value})[/yellow]"
-                )
-                status_table.add_row(
-                    job_key,
+                    state,
+                    has_results,
+                ) in check_computation_statuses(
+                    co_client,
+                    jobs_dict,
+                    status_workers,
+                    TokenBucket(status_rate),
+                ):
+                    row, ready = _status_row(
+                        job_key, computation_id, state, has_results
+                    )
+                    status_table.add_row(*row)
+                    console.print(" | ".join(row))
+                    if ready:
+                        jobs_to_download.append((job_key, computation_id))
+                        ready_jobs.put((job_key, computation_id))
+            finally:
+                run_metrics.add_phase("status", time.perf_counter() - status_start)
+                ready_jobs.put(None)
+
+        status_thread = threading.Thread(target=collect_statuses, daemon=True)
+        status_thread.start()
+
+        if not auto_download:
+            # Keep confirmation prompts from interleaving with status output
+            status_thread.join()
+
+        results: dict[str, bool] = {}
+
+        if auto_download:
+            # Files from every ready job share one download queue, so listing the
+            # next job overlaps downloading the previous ones
+            results = download_jobs(
+                co_client,
+                (computation_id for _, computation_id in iter(ready_jobs.get, None)),
+                max_file_size_mb,
+                force_download,
+                workers,
+                listing_workers,
+                verify,
+                segments,
+                segment_threshold_mb,
+                session,
+                chunk_size,
+                bandwidth,
+                path_filter,
+                archive,
+                run_metrics,
+                blob_store,
+            )
+        else:
+            # Download each completed job in turn, prompting for confirmation
+            idx = 0
+            while (ready_job := ready_jobs.get()) is not None:
+                job_key, computation_id = ready_job
+                idx += 1
+                console.print(f"\n[bold cyan]{'=' * 80}[/bold cyan]")
+                console.print(f"[bold cyan]Processing job {idx}: {job_key}[/bold cyan]")
+                console.print(f"[bold cyan]{'=' * 80}[/bold cyan]\n")
+
+                results[computation_id] = download_job(
+                    co_client,
                     computation_id,
-                    f"[yellow]{state.value if state else 'unknown'}[/yellow]",
-                    "[yellow]✗[/yellow]" if not has_results else "[yellow]?[/yellow]",
-                    action,
+                    max_file_size_mb,
+                    force_download,
+                    auto_download,
+                    workers,
+                    listing_workers,
+                    verify,
+                    segments,
+                    segment_threshold_mb,
+                    session,
+                    chunk_size,
+                    bandwidth,
+                    path_filter,
+                    archive,
+                    metrics=run_metrics.job(computation_id),
+                    blob_store=blob_store,
                 )
 
+        status_thread.join()
+        success_count = sum(results.values())
+
+        if is_job_store(jobs_file):
+            # Jobs with failed files stay not downloaded, so a re-run picks them up
+            with JobStore(jobs_file) as store:
+                for computation_id, success in results.items():
+                    store.mark_downloaded(computation_id, success)
+
+        console.print("\n[bold cyan]Job status[/bold cyan]")
         console.print(status_table)
         console.print(
             f"\n[bold]Jobs ready to download: {len(jobs_to_download)} / {len(jobs_dict)}[/bold]"
@@ -461,26 +1937,6 @@ def main(
             logging.info("No jobs are ready to download.")
             return
 
-        # Download each completed job
-        success_count = 0
-        for idx, (job_key, computation_id) in enumerate(jobs_to_download, 1):
-            console.print(f"\n[bold cyan]{'=' * 80}[/bold cyan]")
-            console.print(
-                f"[bold cyan]Processing job {idx}/{len(jobs_to_download)}: {job_key}[/bold cyan]"
-            )
-            console.print(f"[bold cyan]{'=' * 80}[/bold cyan]\n")
-
-            success = download_job(
-                co_client,
-                computation_id,
-                max_file_size_mb,
-                force_download,
-                auto_download,
-            )
-
-            if success:
-                success_count += 1
-
         console.print(f"\n[bold green]{'=' * 80}[/bold green]")
         console.print(
             f"[bold green]Batch download complete: {success_count}/{len(jobs_to_download)} jobs downloaded successfully[/bold green]"
@@ -489,11 +1945,50 @@ def main(
 
     elif job_id is not None:
         # Single job mode
-        download_job(co_client, job_id, max_file_size_mb, force_download, auto_download)
+        download_job(
+            co_client,
+            job_id,
+            max_file_size_mb,
+            force_download,
+            auto_download,
+            workers,
+            listing_workers,
+            verify,
+            segments,
+            segment_threshold_mb,
+            session,
+            chunk_size,
+            bandwidth,
+            path_filter,
+            archive,
+            metrics=run_metrics.job(job_id),
+            blob_store=blob_store,
+        )
     else:
         logging.error("Must provide either --job-id or --jobs-file")
         return
 
+    # Summarize where the time went, to tune worker counts and tell slow
+    # listings or throttling on the Code Ocean side from slow transfers
+    run_metrics.http_retries = dict(governor.retries_by_status)
+    console = Console()
+    console.print("\n[bold magenta]Download timings[/bold magenta]")
+    console.print(summary_table(run_metrics))
+    if run_metrics.http_retries:
+        console.print(
+            "Retried HTTP responses: "
+            + ", ".join(
+                f"{status} x{count}"
+                for status, count in sorted(run_metrics.http_retries.items())
+            )
+        )
+
+    if jobs_file is not None:
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(run_metrics.started_at))
+        report_path = DOWNLOAD_ROOT / REPORTS_DIRNAME / f"batch_{stamp}.json"
+        write_report(report_path, run_metrics.to_dict())
+        console.print(f"Batch report: {report_path}")
+
 
 if __name__ == "__main__":
     logging.basicConfig(
@@ -515,7 +2010,7 @@ if __name__ == "__main__":
     job_group.add_argument(
         "--jobs-file",
         type=Path,
-        help="Path to jobs.json file containing multiple jobs to download",
+        help="Path to a jobs.json file (or jobs.db store) of jobs to download",
     )
     parser.add_argument(
         "--max-size-mb",
@@ -533,10 +2028,138 @@ if __name__ == "__main__":
         action="store_true",
         help="Disable auto-download and prompt for confirmation",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of files to download concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--listing-workers",
+        type=int,
+        default=DEFAULT_LISTING_WORKERS,
+        help=f"Number of result folders to list concurrently (default: {DEFAULT_LISTING_WORKERS})",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check local file sizes against the remote listing instead of trusting the download manifest",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=DEFAULT_SEGMENTS,
+        help=f"Number of concurrent range requests per large file (default: {DEFAULT_SEGMENTS}, use 1 to disable)",
+    )
+    parser.add_argument(
+        "--segment-threshold-mb",
+        type=float,
+        default=DEFAULT_SEGMENT_THRESHOLD_MB,
+        help=f"Download files larger than this in segments (default: {DEFAULT_SEGMENT_THRESHOLD_MB} MB)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="HTTP connection pool size (default: workers x segments)",
+    )
+    parser.add_argument(
+        "--chunk-size-kb",
+        type=int,
+        default=0,
+        help="Streaming chunk size in KB (default: 0, adapt to file size)",
+    )
+    parser.add_argument(
+        "--status-workers",
+        type=int,
+        default=DEFAULT_STATUS_WORKERS,
+        help=f"Number of job statuses to check concurrently with --jobs-file (default: {DEFAULT_STATUS_WORKERS})",
+    )
+    parser.add_argument(
+        "--status-rate",
+        type=float,
+        default=DEFAULT_STATUS_RATE,
+        help=f"Maximum job status requests per second with --jobs-file (default: {DEFAULT_STATUS_RATE})",
+    )
+    parser.add_argument(
+        "--max-bandwidth-mbps",
+        type=float,
+        default=0,
+        help="Total download bandwidth limit in MB/s (default: 0, no limit)",
+    )
+    parser.add_argument(
+        "--api-rate",
+        type=float,
+        default=0,
+        help="Maximum Code Ocean API requests per second (default: 0, no limit; 429/5xx responses are always retried with backoff)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="Only download result paths matching this glob (repeatable), e.g. '*.json' or 'metrics/*.csv'",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="Skip result files or folders matching this glob (repeatable); excluded folders are not listed",
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Stream each job's files into a single indexed <job_id>.tar instead of a folder tree",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="With --job-id, keep syncing new or grown result files of a running computation until it finishes",
+    )
+    parser.add_argument(
+        "--follow-interval",
+        type=float,
+        default=DEFAULT_FOLLOW_INTERVAL_S,
+        help=f"Seconds between syncs with --follow (default: {DEFAULT_FOLLOW_INTERVAL_S})",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Store identical files once across jobs in a content-addressed blob store, hardlinked into each job folder",
+    )
+    parser.add_argument(
+        "--dedup-min-size-mb",
+        type=float,
+        default=DEFAULT_DEDUP_MIN_SIZE_MB,
+        help=f"Only deduplicate files at least this large (default: {DEFAULT_DEDUP_MIN_SIZE_MB} MB)",
+    )
 
     args = parser.parse_args()
 
     max_size: float | None = None if args.max_size_mb <= 0 else args.max_size_mb
     auto_download: bool = not args.no_auto_download
 
-    main(args.job_id, args.jobs_file, max_size, args.force, auto_download)
+    main(
+        args.job_id,
+        args.jobs_file,
+        max_size,
+        args.force,
+        auto_download,
+        args.workers,
+        args.listing_workers,
+        args.verify,
+        args.segments,
+        args.segment_threshold_mb,
+        args.pool_size,
+        args.chunk_size_kb * 1024 or None,
+        args.status_workers,
+        args.status_rate,
+        args.max_bandwidth_mbps or None,
+        args.api_rate or None,
+        args.include,
+        args.exclude,
+        args.archive,
+        args.follow,
+        args.follow_interval,
+        args.dedup,
+        args.dedup_min_size_mb,
+    )
@@ -0,0 +1,548 @@
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+import httpx
+from codeocean import CodeOcean
+from codeocean.models.computation import Computation
+from codeocean.models.folder import FileURLs, Folder, FolderItem
+from rich.console import Console
+from rich.progress import Progress
+
+import get_url
+from get_url import (
+    DEFAULT_FORCE_DOWNLOAD,
+    DEFAULT_MAX_FILE_SIZE_MB,
+    DEFAULT_RESUME_ATTEMPTS,
+    JOURNAL_INTERVAL_BYTES,
+    JOURNAL_SUFFIX,
+    PART_SUFFIX,
+    TERMINAL_STATES,
+    adaptive_chunk_size,
+    load_jobs_from_json,
+    make_progress,
+    read_journal,
+    write_journal,
+)
+from manifest import DownloadManifest
+from path_filter import PathFilter
+from throttle import Governor
+from utils import CODEOCEAN_DOMAIN, get_codeocean_token
+
+DEFAULT_MAX_REQUESTS = 32
+DEFAULT_MAX_DOWNLOADS = 16
+
+
+class GovernedAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    ``httpx`` counterpart of ``throttle.GovernedAdapter``.
+
+    Throttled (429/503) and server-error responses are retried with the
+    governor's bounded backoff, honouring ``Retry-After``. A backoff pauses
+    every request through the governor, without blocking the event loop.
+    """
+
+    def __init__(self, governor: Governor, **kwargs):
+        self.governor = governor
+        super().__init__(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            while (delay := self.governor.cooldown_remaining()) > 0:
+                await asyncio.sleep(delay)
+            response = await super().handle_async_request(request)
+
+            # httpx responses have the status_code and headers the policy reads
+            delay = self.governor.retry_delay(request.method, response, attempt)  # type: ignore[arg-type]
+            if delay is None:
+                return response
+
+            attempt += 1
+            logging.warning(
+                "%s %s returned %d, retrying in %.1fs (attempt %d/%d)",
+                request.method,
+                request.url.copy_with(query=None),
+                response.status_code,
+                delay,
+                attempt,
+                self.governor.max_retries,
+            )
+            await response.aclose()
+            self.governor.back_off(delay, response.status_code)
+
+
+class AsyncCodeOcean:
+    """
+    Minimal asyncio client for the Code Ocean computation endpoints we use.
+
+    Mirrors ``codeocean.computation.Computations`` on top of ``httpx``; at most
+    ``max_requests`` API calls are in flight at any time.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, max_requests: int):
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_requests)
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self._semaphore:
+            response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def get_computation(self, computation_id: str) -> Computation:
+        res = await self._request("GET", f"computations/{computation_id}")
+        return Computation.from_dict(res.json())
+
+    async def list_computation_results(
+        self, computation_id: str, path: str = ""
+    ) -> Folder:
+        res = await self._request(
+            "POST", f"computations/{computation_id}/results", json={"path": path}
+        )
+        return Folder.from_dict(res.json())
+
+    async def get_result_file_urls(self, computation_id: str, path: str) -> FileURLs:
+        res = await self._request(
+            "GET", f"computations/{computation_id}/results/urls", params={"path": path}
+        )
+        return FileURLs.from_dict(res.json())
+
+
+def create_api_client(
+    max_requests: int = DEFAULT_MAX_REQUESTS, governor: Governor | None = None
+) -> httpx.AsyncClient:
+    """
+    Create an authenticated ``httpx`` client for the Code Ocean API.
+
+    Requests are retried with backoff on 429/5xx responses per ``governor``
+    (a default ``Governor`` if None).
+    """
+    return httpx.AsyncClient(
+        base_url=f"{CODEOCEAN_DOMAIN}/api/v1/",
+        auth=(get_codeocean_token(), ""),
+        headers={
+            "Content-Type": "application/json",
+            "Min-Server-Version": CodeOcean.MIN_SERVER_VERSION,
+        },
+        transport=GovernedAsyncTransport(
+            governor or Governor(), limits=httpx.Limits(max_connections=max_requests)
+        ),
+        timeout=30,
+    )
+
+
+async def list_all_files(
+    api: AsyncCodeOcean,
+    computation_id: str,
+    path: str = "",
+    path_filter: PathFilter | None = None,
+    failed_folders: list[str] | None = None,
+) -> list[FolderItem]:
+    """
+    List all files in a computation result, listing sibling folders concurrently.
+    Folders and files rejected by ``path_filter`` are pruned during the walk.
+    Folders whose listing failed are appended to ``failed_folders`` when given.
+    Returns a list of FolderItem objects representing files (not directories).
+    """
+    try:
+        results = await api.list_computation_results(computation_id, path)
+    except Exception as e:
+        logging.warning("Error listing folder '%s' of %s: %s", path, computation_id, e)
+        if failed_folders is not None:
+            failed_folders.append(path)
+        return []
+
+    files: list[FolderItem] = []
+    folders: list[str] = []
+    for item in results.items:
+        # Go by the item type: empty files have a size of 0 too
+        if item.type == "folder":
+            if path_filter is None or path_filter.wants_folder(item.path):
+                folders.append(item.path)
+        elif path_filter is None or path_filter.wants_file(item.path):
+            files.append(item)
+
+    for sub_files in await asyncio.gather(
+        *(
+            list_all_files(api, computation_id, folder, path_filter, failed_folders)
+            for folder in folders
+        )
+    ):
+        files.extend(sub_files)
+
+    return files
+
+
+async def download_file(
+    files_client: httpx.AsyncClient,
+    url: str,
+    dest_path: Path,
+    progress: Progress,
+    task_id: int,
+    expected_size: int,
+    max_attempts: int = DEFAULT_RESUME_ATTEMPTS,
+) -> None:
+    """
+    Stream a presigned URL into ``dest_path`` via a resumable ``.part`` file.
+
+    Uses the same ``.part``/``.part.json`` layout as ``get_url.download_file``,
+    so partial downloads can be resumed by either entry point. Like it, a
+    dropped connection is retried up to ``max_attempts`` times in this run,
+    resuming with a Range request from the last received byte.
+    """
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = dest_path.with_name(dest_path.name + PART_SUFFIX)
+    journal_path = dest_path.with_name(dest_path.name + JOURNAL_SUFFIX)
+
+    offset = read_journal(journal_path, part_path, expected_size)
+
+    for attempt in range(1, max_attempts + 1):
+        if expected_size and offset == expected_size:
+            # Every byte is already committed (the last attempt failed after
+            # the final chunk, or a previous run died before the rename); a
+            # Range request from the end of the file would be answered 416
+            progress.update(task_id, completed=offset)  # type: ignore[arg-type]
+            break
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        try:
+            async with files_client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    offset = 0
+
+                progress.update(task_id, completed=offset)  # type: ignore[arg-type]
+
+                with open(part_path, "r+b" if offset else "wb") as f:
+                    f.seek(offset)
+                    f.truncate()
+                    uncommitted = 0
+
+                    async for chunk in response.aiter_bytes(
+                        adaptive_chunk_size(expected_size)
+                    ):
+                        f.write(chunk)
+                        offset += len(chunk)
+                        uncommitted += len(chunk)
+                        progress.update(task_id, advance=len(chunk))  # type: ignore[arg-type]
+                        if uncommitted >= JOURNAL_INTERVAL_BYTES:
+                            f.flush()
+                            write_journal(journal_path, expected_size, offset)
+                            uncommitted = 0
+            break
+
+        except httpx.TransportError as e:
+            if part_path.exists():
+                offset = min(offset, part_path.stat().st_size)
+                write_journal(journal_path, expected_size, offset)
+            if attempt == max_attempts:
+                raise
+            logging.warning(
+                "Transfer of %s interrupted at byte %d (attempt %d/%d): %s",
+                dest_path.name,
+                offset,
+                attempt,
+                max_attempts,
+                e,
+            )
+
+    if offset != expected_size:
+        write_journal(journal_path, expected_size, offset)
+        raise IOError(
+            f"Incomplete download of {dest_path.name}: "
+            f"received {offset} of {expected_size} bytes"
+        )
+
+    os.replace(part_path, dest_path)
+    journal_path.unlink(missing_ok=True)
+
+
+async def download_result_file(
+    api: AsyncCodeOcean,
+    files_client: httpx.AsyncClient,
+    download_slots: asyncio.Semaphore,
+    job_id: str,
+    file_item: FolderItem,
+    manifest: DownloadManifest,
+    progress: Progress,
+) -> bool:
+    """Resolve the download URL for a single result file and download it."""
+    relative_path_str: str = file_item.path.lstrip("/")
+
+    async with download_slots:
+        try:
+            url_response = await api.get_result_file_urls(job_id, file_item.path)
+        except Exception as e:
+            logging.error("Failed to get URL for %s: %s", file_item.path, e)
+            return False
+
+        file_task = progress.add_task(
+            f"[green]{relative_path_str}", total=file_item.size or 0
+        )
+        try:
+            await download_file(
+                files_client,
+                url_response.download_url,
+                manifest.local_path(file_item.path),
+                progress,
+                file_task,
+                file_item.size or 0,
+            )
+            logging.info("Downloaded: %s", relative_path_str)
+            manifest.record(file_item)
+            return True
+        except Exception as e:
+            logging.error("Failed to download %s: %s", relative_path_str, e)
+            return False
+        finally:
+            progress.remove_task(file_task)
+
+
+async def download_job(
+    api: AsyncCodeOcean,
+    files_client: httpx.AsyncClient,
+    download_slots: asyncio.Semaphore,
+    job_id: str,
+    progress: Progress,
+    max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
+    force_download: bool = DEFAULT_FORCE_DOWNLOAD,
+    path_filter: PathFilter | None = None,
+) -> bool:
+    """
+    Download all files for a given Code Ocean job_id, preserving folder structure.
+
+    Same filtering rules as ``get_url.download_job``, without the confirmation
+    prompt and summary tables.
+
+    Returns:
+        True if every folder was listed and every file was downloaded (or none
+        needed to be), False otherwise
+    """
+    try:
+        computation = await api.get_computation(job_id)
+    except Exception as e:
+        logging.error("Failed to retrieve computation %s: %s", job_id, e)
+        return False
+
+    state = computation.state
+    if state and state.value not in TERMINAL_STATES:
+        logging.warning(
+            "Computation %s is not in a terminal state (current state: %s). Skipping.",
+            job_id,
+            state.value,
+        )
+        return False
+
+    if not computation.has_results:
+        logging.warning("Computation %s has no results to download. Skipping.", job_id)
+        return False
+
+    failed_folders: list[str] = []
+    all_files = await list_all_files(
+        api, job_id, path_filter=path_filter, failed_folders=failed_folders
+    )
+    if not all_files:
+        logging.warning("No files found in computation results for job_id: %s", job_id)
+        return False
+
+    manifest = DownloadManifest(get_url.DOWNLOAD_ROOT / job_id)
+    files_to_download: list[FolderItem] = []
+    skipped_count = 0
+    existing_count = 0
+
+    for file_item in all_files:
+        size_mb = (file_item.size or 0) / (1024 * 1024)
+        if max_file_size_mb is not None and size_mb > max_file_size_mb:
+            skipped_count += 1
+        elif not force_download and manifest.is_current(file_item):
+            existing_count += 1
+        else:
+            files_to_download.append(file_item)
+
+    logging.info(
+        "Job %s: %d file(s) found, %d to download, %d skipped (size), %d already exist",
+        job_id,
+        len(all_files),
+        len(files_to_download),
+        skipped_count,
+        existing_count,
+    )
+
+    job_task = progress.add_task(f"[cyan]{job_id}", total=len(files_to_download))
+
+    async def download_and_advance(file_item: FolderItem) -> bool:
+        ok = await download_result_file(
+            api, files_client, download_slots, job_id, file_item, manifest, progress
+        )
+        progress.update(job_task, advance=1)  # type: ignore[arg-type]
+        return ok
+
+    results = await asyncio.gather(
+        *(download_and_advance(file_item) for file_item in files_to_download)
+    )
+    progress.remove_task(job_task)
+
+    failed_count = results.count(False)
+    if failed_count or failed_folders:
+        logging.warning(
+            "%d of %d file(s) and %d folder listing(s) failed for job %s",
+            failed_count,
+            len(files_to_download),
+            len(failed_folders),
+            job_id,
+        )
+
+    # Files in folders that couldn't be listed are missing too
+    return failed_count == 0 and not failed_folders
+
+
+async def main(
+    job_id: str | None = None,
+    jobs_file: Path | None = None,
+    max_file_size_mb: float | None = DEFAULT_MAX_FILE_SIZE_MB,
+    force_download: bool = DEFAULT_FORCE_DOWNLOAD,
+    max_requests: int = DEFAULT_MAX_REQUESTS,
+    max_downloads: int = DEFAULT_MAX_DOWNLOADS,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> None:
+    """
+    Download files from Code Ocean computations on a single event loop.
+
+    Args:
+        job_id: Single job ID to download (mutually exclusive with jobs_file)
+        jobs_file: Path to jobs.json file containing multiple jobs (mutually exclusive with job_id)
+        max_file_size_mb: Maximum file size in MB to download (None for no limit)
+        force_download: If True, download files even if they already exist locally
+        max_requests: Maximum number of concurrent Code Ocean API requests
+        max_downloads: Maximum number of concurrent file downloads
+        include: Glob patterns of result paths to download (None for all)
+        exclude: Glob patterns of result paths (files or folders) to skip
+    """
+    if jobs_file is not None:
+        if not jobs_file.exists():
+            logging.error("Jobs file not found: %s", jobs_file)
+            return
+        job_ids = list(load_jobs_from_json(jobs_file).values())
+        if not job_ids:
+            logging.error("No jobs found in %s", jobs_file)
+            return
+    elif job_id is not None:
+        job_ids = [job_id]
+    else:
+        logging.error("Must provide either --job-id or --jobs-file")
+        return
+
+    path_filter = PathFilter(include or [], exclude or []) or None
+    download_slots = asyncio.Semaphore(max_downloads)
+    # API requests and file transfers back off together on 429/5xx responses,
+    # as with get_url.py's governed sessions
+    governor = Governor()
+    files_transport = GovernedAsyncTransport(
+        governor, limits=httpx.Limits(max_connections=max_downloads)
+    )
+
+    async with (
+        create_api_client(max_requests, governor) as api_client,
+        httpx.AsyncClient(transport=files_transport, timeout=30) as files_client,
+    ):
+        api = AsyncCodeOcean(api_client, max_requests)
+        with make_progress() as progress:
+            results = await asyncio.gather(
+                *(
+                    download_job(
+                        api,
+                        files_client,
+                        download_slots,
+                        computation_id,
+                        progress,
+                        max_file_size_mb,
+                        force_download,
+                        path_filter,
+                    )
+                    for computation_id in job_ids
+                )
+            )
+
+    Console().print(
+        f"\n[bold green]Download complete: {sum(results)}/{len(job_ids)} jobs "
+        f"downloaded successfully to {get_url.DOWNLOAD_ROOT}[/bold green]"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Download all files for Code Ocean computation(s) using asyncio"
+    )
+
+    job_group = parser.add_mutually_exclusive_group(required=True)
+    job_group.add_argument(
+        "--job-id",
+        type=str,
+        help="The Code Ocean computation ID to download results from",
+    )
+    job_group.add_argument(
+        "--jobs-file",
+        type=Path,
+        help="Path to jobs.json file containing multiple jobs to download",
+    )
+    parser.add_argument(
+        "--max-size-mb",
+        type=float,
+        default=DEFAULT_MAX_FILE_SIZE_MB,
+        help=f"Maximum file size in MB to download (default: {DEFAULT_MAX_FILE_SIZE_MB} MB, use 0 for no limit)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Force download even if files already exist locally",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=DEFAULT_MAX_REQUESTS,
+        help=f"Maximum concurrent Code Ocean API requests (default: {DEFAULT_MAX_REQUESTS})",
+    )
+    parser.add_argument(
+        "--max-downloads",
+        type=int,
+        default=DEFAULT_MAX_DOWNLOADS,
+        help=f"Maximum concurrent file downloads (default: {DEFAULT_MAX_DOWNLOADS})",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="Only download result paths matching this glob (repeatable)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="Skip result files or folders matching this glob (repeatable)",
+    )
+
+    args = parser.parse_args()
+
+    max_size: float | None = None if args.max_size_mb <= 0 else args.max_size_mb
+
+    asyncio.run(
+        main(
+            args.job_id,
+            args.jobs_file,
+            max_size,
+            args.force,
+            args.max_requests,
+            args.max_downloads,
+            args.include,
+            args.exclude,
+        )
+    )
@@ -0,0 +1,35 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Protocol
+
+
+class JobRecorder(Protocol):
+    """Anything jobs can be recorded to as their state changes."""
+
+    def record(self, job_key: str, job_info: dict[str, Any]) -> None: ...
+
+
+def _jsonable(job_info: dict[str, Any]) -> dict[str, Any]:
+    """Copy a job record, turning SDK objects (e.g. the run response) into strings."""
+    job_data = job_info.copy()
+    if "response" in job_data and not isinstance(
+        job_data["response"], (dict, str, type(None))
+    ):
+        job_data["response"] = str(job_data["response"])
+    return job_data
+
+
+def save_jobs_snapshot(path: Path, batch_data: dict[str, Any]) -> None:
+    """Atomically write a batch in the ``jobs_*.json`` format."""
+    snapshot = {
+        **batch_data,
+        "jobs": {
+            job_key: _jsonable(job_info)
+            for job_key, job_info in batch_data["jobs"].items()
+        },
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,166 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import requests
+from codeocean.error import Error as CodeOceanError
+
+from throttle import SERVER_ERROR_STATUSES, THROTTLED_STATUSES
+
+# Classes of errors a job can end with
+ERROR_THROTTLED = "throttled"
+ERROR_SERVER = "server_error"
+ERROR_NETWORK = "network"
+ERROR_CLIENT = "client_error"
+ERROR_COMPUTATION_FAILED = "computation_failed"
+ERROR_OTHER = "other"
+# Only transient infrastructure errors are retried by default; rejected
+# parameters (4xx), stopped computations and failed computations (which
+# usually fail again, at full compute cost) are not. Add
+# ERROR_COMPUTATION_FAILED to a policy's retry_on to opt in.
+DEFAULT_RETRY_ON = (ERROR_THROTTLED, ERROR_SERVER, ERROR_NETWORK)
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF_S = 60.0
+DEFAULT_RETRY_BACKOFF_FACTOR = 2.0
+DEFAULT_MAX_RETRY_BACKOFF_S = 30 * 60.0
+# Status of a job waiting to be resubmitted
+STATUS_RETRY_SCHEDULED = "retry_scheduled"
+# Fields of a job record that belong to one attempt
+_ATTEMPT_FIELDS = ("computation_id", "status", "error", "error_class")
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Class of an exception raised while talking to Code Ocean.
+
+    The SDK's session hook wraps HTTP errors in ``codeocean.error.Error``,
+    which carries the status code and the original ``requests.HTTPError``.
+    """
+    status: int | None = None
+    if isinstance(error, CodeOceanError):
+        status = error.status_code
+    elif isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+    if status is not None:
+        if status in THROTTLED_STATUSES:
+            return ERROR_THROTTLED
+        if status in SERVER_ERROR_STATUSES or status >= 500:
+            return ERROR_SERVER
+        if 400 <= status < 500:
+            return ERROR_CLIENT
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return ERROR_NETWORK
+    return ERROR_OTHER
+
+
+def error_class_of(job_info: dict[str, Any]) -> str | None:
+    """Class of the error a job ended with, or None if it didn't fail."""
+    status = str(job_info.get("status")).lower()
+    if status == "submission_failed":
+        return job_info.get("error_class", ERROR_OTHER)
+    if status == "failed":
+        return ERROR_COMPUTATION_FAILED
+    return None
+
+
+def attempt_history(job_info: dict[str, Any]) -> dict[str, Any]:
+    """Fields linking a job's attempts, to carry over to its next submission."""
+    return {k: job_info[k] for k in ("attempt", "attempts") if k in job_info}
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how often failed jobs are resubmitted.
+
+    Attempt ``n`` (counting the first submission as attempt 1) is retried
+    after ``backoff_s * backoff_factor ** (n - 1)`` seconds, capped at
+    ``max_backoff_s``, as long as fewer than ``max_attempts`` were made and
+    its error class is in ``retry_on``.
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    backoff_s: float = DEFAULT_RETRY_BACKOFF_S
+    backoff_factor: float = DEFAULT_RETRY_BACKOFF_FACTOR
+    max_backoff_s: float = DEFAULT_MAX_RETRY_BACKOFF_S
+    retry_on: tuple[str, ...] = field(default=DEFAULT_RETRY_ON)
+
+    def delay(self, attempt: int) -> float:
+        return min(
+            self.max_backoff_s, self.backoff_s * self.backoff_factor ** (attempt - 1)
+        )
+
+    def should_retry(self, job_info: dict[str, Any]) -> bool:
+        return (
+            error_class_of(job_info) in self.retry_on
+            and job_info.get("attempt", 1) < self.max_attempts
+        )
+
+
+class RetryScheduler:
+    """
+    Failed jobs waiting out their backoff before being resubmitted.
+
+    A scheduled job's failed attempt is moved to its ``attempts`` list (with
+    its computation ID, status and error), its ``attempt`` number is
+    incremented and its status becomes ``retry_scheduled`` until it is due.
+    """
+
+    def __init__(self, policy: RetryPolicy | None = None):
+        self.policy = policy or RetryPolicy()
+        self._heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, job_key: str, job_info: dict[str, Any]) -> float | None:
+        """
+        Schedule a failed job for resubmission if the policy allows it.
+
+        Returns:
+            Seconds until the retry, or None if the job won't be retried
+        """
+        if not self.policy.should_retry(job_info):
+            return None
+
+        attempt = job_info.get("attempt", 1)
+        delay = self.policy.delay(attempt)
+        error_class = error_class_of(job_info)
+
+        job_info.setdefault("attempts", []).append(
+            {
+                "attempt": attempt,
+                **{k: job_info.get(k) for k in _ATTEMPT_FIELDS},
+                "error_class": error_class,
+            }
+        )
+        for k in ("error", "error_class", "response", "downloaded"):
+            job_info.pop(k, None)
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        job_info.update(
+            computation_id=None,
+            status=STATUS_RETRY_SCHEDULED,
+            attempt=attempt + 1,
+            retry_at=retry_at.isoformat(),
+        )
+
+        heapq.heappush(self._heap, (time.monotonic() + delay, job_key))
+        return delay
+
+    def next_due_in(self) -> float | None:
+        """Seconds until the next retry is due, or None if none is scheduled."""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def pop_due(self, limit: int | None = None) -> list[str]:
+        """Job keys whose retry is due, at most ``limit`` of them, earliest first."""
+        due: list[str] = []
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            if limit is not None and len(due) >= limit:
+                break
+            due.append(heapq.heappop(self._heap)[1])
+        return due
@@ -0,0 +1,350 @@
+import argparse
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+DEFAULT_JOB_STORE = Path("jobs.db")
+JOB_STORE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+# Jobs are finished once they reach one of these states
+FINISHED_STATES = (
+    "completed",
+    "failed",
+    "stopped",
+    "submission_failed",
+    "error_checking_status",
+)
+# Wait this long for another process's write lock before failing
+BUSY_TIMEOUT_MS = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch TEXT PRIMARY KEY,
+    submitted_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    batch TEXT NOT NULL REFERENCES batches (batch),
+    job_key TEXT NOT NULL,
+    computation_id TEXT,
+    run_settings TEXT,
+    status TEXT,
+    error TEXT,
+    downloaded INTEGER,
+    extra TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT,
+    PRIMARY KEY (batch, job_key)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, updated_at);
+CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at);
+CREATE INDEX IF NOT EXISTS jobs_computation_id ON jobs (computation_id);
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    computation_id TEXT,
+    old_status TEXT,
+    new_status TEXT NOT NULL,
+    at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transitions_job ON transitions (batch, job_key, at);
+CREATE INDEX IF NOT EXISTS transitions_at ON transitions (at);
+"""
+
+# Job record fields stored in their own columns; the rest go to ``extra``
+_COLUMNS = ("computation_id", "run_settings", "status", "error", "downloaded")
+
+
+def utc_now() -> str:
+    """Current UTC time in SQLite's ``datetime('now')`` format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def is_job_store(path: Path) -> bool:
+    return path.suffix.lower() in JOB_STORE_SUFFIXES
+
+
+class JobStore:
+    """
+    SQLite record of submitted jobs, their states and state transitions.
+
+    The database is opened in WAL mode, so the submitter, the monitor and any
+    number of downloaders or ad-hoc ``sqlite3`` sessions can read it while one
+    of them writes. Timestamps are UTC ``YYYY-MM-DD HH:MM:SS`` strings, which
+    compare directly with SQLite's ``datetime('now', '-1 hour')``.
+    """
+
+    def __init__(self, path: Path = DEFAULT_JOB_STORE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode, NORMAL only risks the last transactions on power loss
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def batch(self, batch: str, submitted_at: str | None = None) -> "BatchRecorder":
+        """Register a batch and return a recorder for its jobs."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO batches (batch, submitted_at) VALUES (?, ?)",
+                (batch, submitted_at or utc_now()),
+            )
+        return BatchRecorder(self, batch)
+
+    def record(self, batch: str, job_key: str, job_info: dict[str, Any]) -> None:
+        """Insert or update a job, logging a transition if its status changed."""
+        now = utc_now()
+        status = job_info.get("status")
+        run_settings = job_info.get("run_settings")
+        extra = {
+            k: v
+            if isinstance(v, (dict, list, str, int, float, bool, type(None)))
+            else str(v)
+            for k, v in job_info.items()
+            if k not in _COLUMNS
+        }
+        downloaded = job_info.get("downloaded")
+        finished_at = now if str(status).lower() in FINISHED_STATES else None
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT status FROM jobs WHERE batch = ? AND job_key = ?",
+                (batch, job_key),
+            ).fetchone()
+            old_status = row["status"] if row is not None else None
+
+            self._conn.execute(
+                """
+                INSERT INTO jobs (
+                    batch, job_key, computation_id, run_settings, status, error,
+                    downloaded, extra, created_at, updated_at, finished_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (batch, job_key) DO UPDATE SET
+                    computation_id = excluded.computation_id,
+                    run_settings = excluded.run_settings,
+                    status = excluded.status,
+                    error = excluded.error,
+                    downloaded = COALESCE(excluded.downloaded, jobs.downloaded),
+                    extra = excluded.extra,
+                    updated_at = excluded.updated_at,
+                    finished_at = CASE
+                        WHEN excluded.status IS jobs.status THEN jobs.finished_at
+                        ELSE excluded.finished_at
+                    END
+                """,
+                (
+                    batch,
+                    job_key,
+                    job_info.get("computation_id"),
+                    json.dumps(run_settings) if run_settings is not None else None,
+                    status,
+                    job_info.get("error"),
+                    None if downloaded is None else int(downloaded),
+                    json.dumps(extra) if extra else None,
+                    now,
+                    now,
+                    finished_at,
+                ),
+            )
+
+            if status is not None and status != old_status:
+                self._conn.execute(
+                    """
+                    INSERT INTO transitions
+                        (batch, job_key, computation_id, old_status, new_status, at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        batch,
+                        job_key,
+                        job_info.get("computation_id"),
+                        old_status,
+                        status,
+                        now,
+                    ),
+                )
+
+    def mark_downloaded(self, computation_id: str, downloaded: bool) -> None:
+        """Record whether the results of a computation were downloaded."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET downloaded = ?, updated_at = ? WHERE computation_id = ?",
+                (int(downloaded), utc_now(), computation_id),
+            )
+
+    def _job_info(self, row: sqlite3.Row) -> dict[str, Any]:
+        job_info: dict[str, Any] = json.loads(row["extra"]) if row["extra"] else {}
+        job_info.update(
+            computation_id=row["computation_id"],
+            run_settings=json.loads(row["run_settings"])
+            if row["run_settings"]
+            else None,
+            status=row["status"],
+        )
+        if row["error"] is not None:
+            job_info["error"] = row["error"]
+        if row["downloaded"] is not None:
+            job_info["downloaded"] = bool(row["downloaded"])
+        return job_info
+
+    def query(
+        self,
+        batch: str | None = None,
+        status: str | None = None,
+        finished_within_minutes: float | None = None,
+    ) -> list[sqlite3.Row]:
+        """
+        Select jobs, most recently updated last.
+
+        Args:
+            batch: Only jobs of this batch
+            status: Only jobs currently in this state
+            finished_within_minutes: Only jobs that finished this recently
+
+        Returns:
+            Rows of the ``jobs`` table
+        """
+        clauses, params = [], []
+        if batch is not None:
+            clauses.append("batch = ?")
+            params.append(batch)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if finished_within_minutes is not None:
+            clauses.append("finished_at >= datetime('now', ?)")
+            params.append(f"-{finished_within_minutes} minutes")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY updated_at, batch, job_key",
+                params,
+            ).fetchall()
+
+    def load_batches(self, batch: str | None = None) -> dict[str, Any]:
+        """
+        Load jobs in the ``jobs_*.json`` batch format.
+
+        Job keys are prefixed with their batch (``<batch>/<job_key>``), since
+        several batches usually reuse the same keys.
+
+        Returns:
+            ``{"batch_submission_time_utc": ..., "jobs": {job_key: job_info}}``
+        """
+        with self._lock:
+            batches = self._conn.execute(
+                "SELECT * FROM batches WHERE ? IS NULL OR batch = ? ORDER BY submitted_at",
+                (batch, batch),
+            ).fetchall()
+        jobs = {
+            f"{row['batch']}/{row['job_key']}": self._job_info(row)
+            for row in self.query(batch=batch)
+        }
+        return {
+            "batch_submission_time_utc": batches[-1]["submitted_at"]
+            if batches
+            else None,
+            "jobs": jobs,
+        }
+
+    def transitions(self, batch: str, job_key: str) -> list[sqlite3.Row]:
+        """State history of a job, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM transitions WHERE batch = ? AND job_key = ? ORDER BY id",
+                (batch, job_key),
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BatchRecorder:
+    """Records the jobs of one batch; a ``JobRecorder`` backed by the store."""
+
+    def __init__(self, store: JobStore, batch: str):
+        self.store = store
+        self.batch = batch
+
+    def record(self, job_key: str, job_info: dict[str, Any]) -> None:
+        self.store.record(self.batch, job_key, job_info)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the sweep job store")
+    parser.add_argument(
+        "db", type=Path, nargs="?", default=DEFAULT_JOB_STORE, help="Job store"
+    )
+    parser.add_argument("--batch", default=None, help="Only jobs of this batch")
+    parser.add_argument("--status", default=None, help="Only jobs in this state")
+    parser.add_argument(
+        "--finished-within",
+        type=float,
+        default=None,
+        metavar="MINUTES",
+        help="Only jobs that finished in the last MINUTES",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Show each job's state transitions",
+    )
+
+    args = parser.parse_args()
+
+    with JobStore(args.db) as store:
+        rows = store.query(args.batch, args.status, args.finished_within)
+
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Batch", style="dim")
+        table.add_column("Job Key", style="cyan")
+        table.add_column("Computation ID", style="dim")
+        table.add_column("Status", style="white")
+        table.add_column("Updated (UTC)", style="white")
+        table.add_column("Finished (UTC)", style="white")
+        table.add_column("Downloaded", justify="center")
+        if args.history:
+            table.add_column("History", style="white")
+
+        for row in rows:
+            downloaded = {None: "", 0: "[red]✗[/red]", 1: "[green]✓[/green]"}
+            cells = [
+                row["batch"],
+                row["job_key"],
+                row["computation_id"] or "-",
+                row["status"] or "-",
+                row["updated_at"],
+                row["finished_at"] or "",
+                downloaded[row["downloaded"]],
+            ]
+            if args.history:
+                cells.append(
+                    " → ".join(
+                        f"{t['new_status']} ({t['at'][11:]})"
+                        for t in store.transitions(row["batch"], row["job_key"])
+                    )
+                )
+            table.add_row(*cells)
+
+        Console().print(table)
+        Console().print(f"\n[bold]{len(rows)} job(s)[/bold]")
@@ -1,113 +1,246 @@
+import argparse
 import json
+import queue
+import threading
 import time
+from collections import Counter
 from datetime import datetime, timezone
-from itertools import product
 from pathlib import Path
 from typing import Any, Dict
 
-from codeocean.computation import NamedRunParam, RunParams
-
+from get_url import (
+    DEFAULT_LISTING_WORKERS,
+    DEFAULT_MAX_FILE_SIZE_MB,
+    DEFAULT_WORKERS,
+    download_jobs,
+)
+from job_records import save_jobs_snapshot
+from job_retry import RetryPolicy, RetryScheduler
+from job_store import JobStore
+from monitor import is_pending, watch_jobs
+from sweep import SubmissionQueue, fill_running_slots, resubmit_job
+from sweep_ledger import SweepLedger
+from sweep_spec import SweepSpec, parse_shard
+from throttle import Governor, TokenBucket
 from utils import get_codeocean_client
 
-co_client = get_codeocean_client()
-capsule_id = "2a66df60-f96d-401e-8384-2e4aedeee818"
+# Throttle API requests; 429/5xx responses are retried with backoff
+API_REQUESTS_PER_SECOND = 5
+# Submit up to this many runs concurrently, starting at most this many per second
+SUBMIT_WORKERS = 4
+SUBMISSIONS_PER_SECOND = 2
+# Keep at most this many computations running (None for no cap); finished ones
+# are backfilled from the queue as the monitor sees them finish
+MAX_RUNNING_COMPUTATIONS: int | None = 8
+# Resubmit submissions that failed on transient errors (see
+# job_retry.DEFAULT_RETRY_ON), up to 3 attempts, 1 min then 2 min apart. Failed
+# computations aren't resubmitted unless ERROR_COMPUTATION_FAILED is added to
+# retry_on
+RETRY_POLICY = RetryPolicy(max_attempts=3, backoff_s=60.0, backoff_factor=2.0)
+# Status requests in flight at once while monitoring
+MONITOR_WORKERS = 8
+# Download each job's results as soon as it completes, while the rest still run
+HARVEST_RESULTS = True
+HARVEST_MAX_FILE_SIZE_MB = DEFAULT_MAX_FILE_SIZE_MB
+# Every configuration ever run, so completed or running ones aren't run again
+SWEEP_LEDGER_FILE = Path("sweep_ledger.jsonl")
+# Jobs, their states and state transitions of every batch
+JOB_STORE_FILE = Path("jobs.db")
+
+# Sweep run when no spec file is given (see README for the spec format)
+DEFAULT_SWEEP = {
+    "capsule_id": "2a66df60-f96d-401e-8384-2e4aedeee818",
+    "sampling": {"method": "grid"},
+    "parameters": {
+        "learning_rate": [5e-4],
+        "embedding_network": ["identity", "lru"],
+        "_window": [[100, 100]],
+        "offset": [
+            '{"type": "inferred", "prior_low": -1.0, "prior_high": 1.0}',
+            '{"type": "fixed", "value": 0.0}',
+        ],
+    },
+    "derived": {
+        "apply_feature_engineering": "embedding_network != 'lru'",
+        "window_size_min": "_window[0]",
+        "window_size_max": "_window[1]",
+        "n_simulations": "2_000_000 if embedding_network == 'lru' else 4_000_000",
+    },
+    # Runs are roughly proportional to their number of simulations
+    "scheduling": {"order": "shortest-first", "cost": "n_simulations"},
+    # The order of earlier batches, so job keys stay comparable across them
+    "fields": [
+        "learning_rate",
+        "embedding_network",
+        "apply_feature_engineering",
+        "window_size_min",
+        "window_size_max",
+        "n_simulations",
+        "offset",
+    ],
+}
+
+parser = argparse.ArgumentParser(description="Submit and monitor a capsule sweep")
+parser.add_argument(
+    "spec",
+    type=Path,
+    nargs="?",
+    default=None,
+    help="Sweep spec (.json, or .yaml with PyYAML); default: DEFAULT_SWEEP",
+)
+parser.add_argument(
+    "--shard",
+    type=parse_shard,
+    default=(0, 1),
+    help="Submit only shard INDEX/COUNT of the sweep (e.g. 0/4), for running "
+    "several submitters in parallel",
+)
+args = parser.parse_args()
+
+sweep = SweepSpec.load(args.spec) if args.spec else SweepSpec.from_dict(DEFAULT_SWEEP)
+shard_index, shard_count = args.shard
+
+# Submitters, status polls and the harvest's listings, URL prefetches and
+# downloads share the client's connection pool
+co_client = get_codeocean_client(
+    Governor(requests_per_second=API_REQUESTS_PER_SECOND),
+    SUBMIT_WORKERS + MONITOR_WORKERS + DEFAULT_LISTING_WORKERS + 2 * DEFAULT_WORKERS,
+)
+capsule_id = sweep.capsule_id or DEFAULT_SWEEP["capsule_id"]
 respt = co_client.capsules.get_capsule(capsule_id)
 print(respt)
 
+# Generated lazily, as submission slots free up, and ordered by priority and
+# estimated cost
+submission_queue = SubmissionQueue(
+    sweep.runs(shard_index, shard_count),
+    order=sweep.order,
+    cost=sweep.cost,
+    priority=sweep.priority,
+)
+print(
+    f"Sweep: {len(sweep)} point(s) ({sweep.method}), "
+    f"submitting shard {shard_index}/{shard_count} {sweep.order}, "
+    f"at most {MAX_RUNNING_COMPUTATIONS or 'unlimited'} running"
+)
 
-learning_rates = [5e-4]
-embedding_network = ["identity", "lru"]
-win = [(100, 100)]
-offset = [
-    '{"type": "inferred", "prior_low": -1.0, "prior_high": 1.0}',
-    '{"type": "fixed", "value": 0.0}',
-]
-
-parameters_to_vary = [
-    {
-        "learning_rate": lr,
-        "embedding_network": embed,
-        "apply_feature_engineering": not embed == "lru",
-        "window_size_min": win[0],
-        "window_size_max": win[1],
-        "n_simulations": 2_000_000 if embed == "lru" else 4_000_000,
-        "offset": o,
-    }
-    for lr, embed, win, o in product(learning_rates, embedding_network, win, offset)
-]
-
-jobs: Dict[str, Dict[str, Any]] = {}
 batch_submission_time = datetime.now(timezone.utc)
 batch_submission_time_str = batch_submission_time.isoformat()
 batch_submission_time_filename = batch_submission_time.strftime("%Y%m%d_%H%M%S")
+if shard_count > 1:
+    batch_submission_time_filename += f"_shard{shard_index}of{shard_count}"
 
 print("=" * 80)
 print("SUBMITTING JOBS")
 print("=" * 80)
 
-for run_idx, run_settings in enumerate(parameters_to_vary):
-    param_str = "_".join([f"{k}={v}" for k, v in run_settings.items()])
-    job_key = f"run_{run_idx}_{param_str}"
-    print(f"Running pipeline with settings: {run_settings}")
+# Start the ledger from the batches submitted before it existed
+seed_ledger = not SWEEP_LEDGER_FILE.exists()
+ledger = SweepLedger(SWEEP_LEDGER_FILE)
+if seed_ledger:
+    for previous_jobs_file in sorted(Path().glob("jobs_null_*.json")):
+        with open(previous_jobs_file, "r") as f:
+            seeded = ledger.seed_from_batch(json.load(f), capsule_id)
+        print(
+            f"Added {seeded} configuration(s) from {previous_jobs_file} to the ledger"
+        )
+print(f"Sweep ledger {SWEEP_LEDGER_FILE}: {len(ledger)} known configuration(s)")
+
+# Every job is written to the store as soon as it is accepted, and again on
+# every state change, so the batch can be recovered (or downloaded with
+# get_url.py --jobs-file jobs.db) if this dies
+job_store = JobStore(JOB_STORE_FILE)
+batch_name = f"null_{batch_submission_time_filename}"
+batch_jobs = job_store.batch(batch_name, batch_submission_time_str)
+print(f"Recording batch {batch_name} in {JOB_STORE_FILE}")
+
+# Completed jobs are queued for download_jobs, which lists and downloads them
+# in a background thread while monitoring continues
+completed_jobs: queue.Queue[str | None] = queue.Queue()
+harvest_results: Dict[str, bool] = {}
+
+
+def harvest() -> None:
+    harvest_results.update(
+        download_jobs(
+            co_client,
+            iter(completed_jobs.get, None),
+            max_file_size_mb=HARVEST_MAX_FILE_SIZE_MB,
+        )
+    )
 
-    named_params = [
-        NamedRunParam(param_name=param_name, value=str(param_value))
-        for param_name, param_value in run_settings.items()
-    ]
-    named_params.append(NamedRunParam(param_name="base_output_dir", value="/results"))
 
-    run_params = RunParams(
-        capsule_id=capsule_id,
-        named_parameters=named_params,
-    )
+harvest_thread = threading.Thread(target=harvest, daemon=True)
+if HARVEST_RESULTS:
+    harvest_thread.start()
+
+jobs: Dict[str, Dict[str, Any]] = {}
+submission_rate = TokenBucket(SUBMISSIONS_PER_SECOND)
+retries = RetryScheduler(RETRY_POLICY)
+
+
+def schedule_retries(failed_jobs: Dict[str, Dict[str, Any]]) -> None:
+    """Schedule the retryable failures among ``failed_jobs``."""
+    for job_key, job_info in failed_jobs.items():
+        delay = retries.schedule(job_key, job_info)
+        if delay is not None:
+            print(
+                f"  -> {job_key} will be retried in {delay:.0f}s "
+                f"(attempt {job_info['attempt']} of {RETRY_POLICY.max_attempts})"
+            )
+            batch_jobs.record(job_key, job_info)
+
 
-    try:
-        response = co_client.computations.run_capsule(run_params=run_params)
-        print(f"Started computation: {response}")
+def submit_queued() -> None:
+    """Fill the free running slots with due retries first, then queued runs."""
+    new_jobs: Dict[str, Dict[str, Any]] = {}
+
+    free_slots = None
+    if MAX_RUNNING_COMPUTATIONS is not None:
+        running = sum(is_pending(job_info) for job_info in jobs.values())
+        free_slots = max(0, MAX_RUNNING_COMPUTATIONS - running)
+    for job_key in retries.pop_due(free_slots):
+        new_jobs[job_key] = resubmit_job(
+            co_client, capsule_id, job_key, jobs, batch_jobs, submission_rate, ledger
+        )
 
-        computation_id = (
-            response.get("id") if isinstance(response, dict) else response.id
+    new_jobs.update(
+        fill_running_slots(
+            co_client,
+            capsule_id,
+            submission_queue,
+            jobs,
+            MAX_RUNNING_COMPUTATIONS,
+            batch_jobs,
+            workers=SUBMIT_WORKERS,
+            rate_limiter=submission_rate,
+            ledger=ledger,
         )
+    )
+
+    schedule_retries(new_jobs)
+    # Reused computations may have completed before this run
+    if HARVEST_RESULTS:
+        for job_info in new_jobs.values():
+            if str(job_info["status"]).lower() == "completed":
+                completed_jobs.put(job_info["computation_id"])
+
 
-        jobs[job_key] = {
-            "computation_id": computation_id,
-            "run_settings": run_settings,
-            "status": "submitted",
-            "response": response,
-        }
-
-        print(f"  -> Job key: {job_key}, Computation ID: {computation_id}")
-    except Exception as e:
-        print(f"  -> ERROR submitting job {job_key}: {e}")
-        jobs[job_key] = {
-            "computation_id": None,
-            "run_settings": run_settings,
-            "status": "submission_failed",
-            "error": str(e),
-        }
-
-print(f"\nTotal jobs submitted: {len(jobs)}")
-print(f"Job keys: {list(jobs.keys())}")
+submit_queued()
+
+reused_count = sum("reused_from" in job_info for job_info in jobs.values())
+print(f"\nJobs submitted: {len(jobs)} ({reused_count} reused from earlier sweeps)")
+if submission_queue:
+    print("More runs are queued, to be submitted as running ones finish")
 
 jobs_file = Path(f"jobs_null_{batch_submission_time_filename}.json")
 print(f"\nSaving job information to {jobs_file}...")
 
-jobs_to_save = {}
-for job_key, job_info in jobs.items():
-    job_data = job_info.copy()
-    if "response" in job_data and not isinstance(
-        job_data["response"], (dict, str, type(None))
-    ):
-        job_data["response"] = str(job_data["response"])
-    jobs_to_save[job_key] = job_data
-
 batch_data = {
     "batch_submission_time_utc": batch_submission_time_str,
-    "jobs": jobs_to_save,
+    "jobs": jobs,
 }
-
-with open(jobs_file, "w") as f:
-    json.dump(batch_data, f, indent=2)
+save_jobs_snapshot(jobs_file, batch_data)
 
 print(f"Job information saved to {jobs_file}")
 
@@ -115,52 +248,66 @@ print("\n" + "=" * 80)
 print("MONITORING JOB STATUS")
 print("=" * 80)
 
-terminal_states = ["completed", "failed", "stopped"]
-poll_interval = 30
-
+# Only pending jobs are polled, each on its own adaptive schedule, and only
+# state changes are printed. Freed slots are backfilled with due retries and
+# queued runs before each round of polls.
 while True:
-    all_done = True
+    for change in watch_jobs(
+        co_client,
+        jobs,
+        batch_jobs,
+        workers=MONITOR_WORKERS,
+        rate_limiter=TokenBucket(API_REQUESTS_PER_SECOND),
+        on_round=submit_queued,
+    ):
+        current_counts = Counter(job_info["status"] for job_info in jobs.values())
+        counts_str = ", ".join(
+            f"{status}: {count}" for status, count in sorted(current_counts.items())
+        )
+        error_str = f" ERROR: {change.error}" if change.error else ""
+        print(
+            f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {change.job_key:30} -> "
+            f"{change.new_status} (was: {change.old_status}){error_str}  [{counts_str}]"
+        )
+        ledger.record(
+            capsule_id, jobs[change.job_key]["run_settings"], jobs[change.job_key]
+        )
+        if HARVEST_RESULTS and change.new_status.lower() == "completed":
+            completed_jobs.put(change.computation_id)
+        if change.terminal:
+            schedule_retries({change.job_key: jobs[change.job_key]})
+
+    # Nothing is running; wait for the next retry, if any
+    next_retry_s = retries.next_due_in()
+    if next_retry_s is None and not submission_queue:
+        break
+    if next_retry_s:
+        print(f"\nWaiting {next_retry_s:.0f}s for the next retry...")
+        time.sleep(next_retry_s)
 
-    print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Status update:")
-    print("-" * 80)
+if HARVEST_RESULTS:
+    print("\nAll jobs finished; waiting for result downloads...")
+    completed_jobs.put(None)
+    harvest_thread.join()
 
+    # A job only counts as downloaded if every one of its files was; the rest
+    # can be fetched again with get_url.py --jobs-file jobs.db
     for job_key, job_info in jobs.items():
-        computation_id = job_info.get("computation_id")
-
-        if computation_id is None:
-            print(f"  {job_key:30} -> {job_info['status']}")
-            continue
-
-        try:
-            computation = co_client.computations.get_computation(computation_id)
-            state = (
-                computation.get("state")
-                if isinstance(computation, dict)
-                else computation.state
-            )
-
-            old_status = job_info["status"]
-            job_info["status"] = state
-
-            status_change = "" if old_status == state else f" (was: {old_status})"
-            print(f"  {job_key:30} -> {state}{status_change}")
-
-            if state.lower() not in terminal_states:
-                all_done = False
+        if job_info.get("computation_id") in harvest_results:
+            job_info["downloaded"] = harvest_results[job_info["computation_id"]]
+            batch_jobs.record(job_key, job_info)
+    print(
+        f"Downloaded results of {sum(harvest_results.values())}/"
+        f"{len(harvest_results)} completed computation(s)"
+    )
 
-        except Exception as e:
-            print(f"  {job_key:30} -> ERROR: {e}")
-            job_info["status"] = "error_checking_status"
-            job_info["error"] = str(e)
+ledger.close()
+job_store.close()
+save_jobs_snapshot(jobs_file, batch_data)
 
-    if all_done:
-        print("\n" + "=" * 80)
-        print("ALL JOBS COMPLETED")
-        print("=" * 80)
-        break
-
-    print(f"\nWaiting {poll_interval} seconds before next check...")
-    time.sleep(poll_interval)
+print("\n" + "=" * 80)
+print("ALL JOBS COMPLETED")
+print("=" * 80)
 
 print("\nFINAL JOB SUMMARY")
 print("=" * 80)
@@ -171,7 +318,15 @@ for job_key, job_info in jobs.items():
     status_counts[status] = status_counts.get(status, 0) + 1
 
     settings_str = str(job_info.get("run_settings", {}))
-    print(f"{job_key:50} | {settings_str:40} | {status}")
+    downloaded_str = ""
+    if "downloaded" in job_info:
+        downloaded_str = (
+            " | downloaded" if job_info["downloaded"] else " | download failed"
+        )
+    attempts_str = ""
+    if job_info.get("attempt", 1) > 1:
+        attempts_str = f" (attempt {job_info['attempt']})"
+    print(f"{job_key:50} | {settings_str:40} | {status}{attempts_str}{downloaded_str}")
 
 print("\n" + "-" * 80)
 print("Status Summary:")
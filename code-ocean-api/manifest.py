@@ -0,0 +1,119 @@
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from codeocean.models.folder import FolderItem
+
+MANIFEST_FILENAME = ".manifest.jsonl"
+
+
+@dataclass
+class ManifestEntry:
+    """A result file that has been fully downloaded into a job directory."""
+
+    path: str
+    size: int
+    downloaded_at: str
+
+
+class DownloadManifest:
+    """
+    Per-job record of completed downloads, stored as JSON lines.
+
+    Lets ``download_job`` decide which files are already present from a single
+    read of the manifest instead of a ``stat`` per file. Entries are appended as
+    downloads complete (safe to call from worker threads); the last entry for a
+    path wins.
+    """
+
+    def __init__(self, job_download_dir: Path):
+        self.job_download_dir = job_download_dir
+        self.manifest_path = job_download_dir / MANIFEST_FILENAME
+        self.entries: dict[str, ManifestEntry] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.manifest_path.exists():
+            return
+
+        line_count = 0
+        with open(self.manifest_path, "r") as f:
+            for line in f:
+                line_count += 1
+                try:
+                    entry = ManifestEntry(**json.loads(line))
+                except (TypeError, ValueError):
+                    # Tolerate a torn last line from an interrupted run
+                    logging.debug("Ignoring malformed manifest line: %r", line)
+                    continue
+                self.entries[entry.path] = entry
+
+        if line_count > len(self.entries):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the manifest with one line per path."""
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(asdict(entry)) + "\n")
+        tmp_path.replace(self.manifest_path)
+
+    def local_path(self, remote_path: str) -> Path:
+        """Local destination of a result file within the job directory."""
+        return self.job_download_dir / remote_path.lstrip("/")
+
+    def record(self, file_item: FolderItem) -> None:
+        """Record a result file as fully downloaded."""
+        entry = ManifestEntry(
+            path=file_item.path,
+            size=file_item.size or 0,
+            downloaded_at=datetime.now(timezone.utc).isoformat(),
+        )
+        with self._lock:
+            self.entries[entry.path] = entry
+            self.job_download_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_path, "a") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+
+    def is_current(self, file_item: FolderItem, verify: bool = False) -> bool:
+        """
+        Check whether a listed result file is already downloaded.
+
+        Files known to the manifest are trusted if their recorded size matches
+        the listing; with ``verify`` the local file size is checked as well.
+        Files missing from the manifest (e.g. downloaded before it existed) are
+        adopted if a local file with the listed size is present.
+        """
+        entry = self.entries.get(file_item.path)
+
+        if entry is not None and entry.size != file_item.size:
+            return False
+
+        if entry is not None and not verify:
+            return True
+
+        local_path = self.local_path(file_item.path)
+        try:
+            local_size = local_path.stat().st_size
+        except OSError:
+            return False
+
+        if local_size != file_item.size:
+            if verify:
+                logging.warning(
+                    "Size mismatch for %s: local %d bytes, remote %s bytes",
+                    file_item.path,
+                    local_size,
+                    file_item.size,
+                )
+            return False
+
+        if entry is None:
+            self.record(file_item)
+
+        return True
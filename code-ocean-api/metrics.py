@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from rich.table import Table
+
+# Upper bounds (in seconds) of the latency histogram buckets; the last bucket
+# collects everything slower
+LATENCY_BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Thread-safe collection of request latencies with percentile summaries."""
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the ``q``-th percentile (0-100) by nearest rank, or None if empty."""
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            samples = list(self.samples)
+
+        buckets = {f"<={bound:g}s": 0 for bound in LATENCY_BUCKETS_S}
+        buckets[f">{LATENCY_BUCKETS_S[-1]:g}s"] = 0
+        for sample in samples:
+            for bound in LATENCY_BUCKETS_S:
+                if sample <= bound:
+                    buckets[f"<={bound:g}s"] += 1
+                    break
+            else:
+                buckets[f">{LATENCY_BUCKETS_S[-1]:g}s"] += 1
+
+        return {
+            "count": len(samples),
+            "total_s": sum(samples),
+            "mean_s": sum(samples) / len(samples) if samples else None,
+            "p50_s": self.percentile(50),
+            "p95_s": self.percentile(95),
+            "max_s": max(samples, default=None),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class TransferStats:
+    """Timing of a single file transfer, filled in by the download functions."""
+
+    # Seconds from sending the first request to receiving its response headers
+    ttfb_s: float | None = None
+    # Transient failures after which the transfer was resumed or re-requested
+    retries: int = 0
+
+
+@dataclass
+class FileRecord:
+    """Outcome of one result file download."""
+
+    path: str
+    size: int
+    transfer_s: float
+    ttfb_s: float | None
+    retries: int
+    error: str | None = None
+
+    @property
+    def mbps(self) -> float | None:
+        if self.error or self.transfer_s <= 0:
+            return None
+        return self.size / (1024 * 1024) / self.transfer_s
+
+
+class JobMetrics:
+    """
+    Per-phase timings of one job download.
+
+    Listing records one latency per folder listed, URL resolution the time a
+    download worker waited for its URL, and each transfer a ``FileRecord``.
+    ``phases`` holds the wall-clock seconds of whole phases (listing, transfer).
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.started_at = time.time()
+        self.phases: dict[str, float] = {}
+        self.listing = LatencyHistogram()
+        self.url_resolution = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.files: list[FileRecord] = []
+        # Files linked from (or reclaimed by) the dedup blob store
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_deduplicated(self) -> None:
+        with self._lock:
+            self.deduplicated += 1
+
+    def record_file(
+        self,
+        path: str,
+        size: int,
+        transfer_s: float,
+        stats: TransferStats | None = None,
+        error: str | None = None,
+    ) -> None:
+        stats = stats or TransferStats()
+        if stats.ttfb_s is not None:
+            self.ttfb.record(stats.ttfb_s)
+        with self._lock:
+            self.files.append(
+                FileRecord(path, size, transfer_s, stats.ttfb_s, stats.retries, error)
+            )
+
+    @property
+    def bytes_downloaded(self) -> int:
+        return sum(record.size for record in self.files if record.error is None)
+
+    @property
+    def failed(self) -> list[FileRecord]:
+        return [record for record in self.files if record.error is not None]
+
+    @property
+    def retries(self) -> int:
+        return sum(record.retries for record in self.files)
+
+    @property
+    def throughput_mbps(self) -> float | None:
+        """Average MB/s over the wall-clock transfer phase."""
+        transfer_s = self.phases.get("transfer")
+        if not transfer_s:
+            return None
+        return self.bytes_downloaded / (1024 * 1024) / transfer_s
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "started_at": self.started_at,
+            "phases_s": dict(self.phases),
+            "files_downloaded": len(self.files) - len(self.failed),
+            "files_failed": len(self.failed),
+            "bytes_downloaded": self.bytes_downloaded,
+            "throughput_mbps": self.throughput_mbps,
+            "retries": self.retries,
+            "deduplicated": self.deduplicated,
+            "listing": self.listing.to_dict(),
+            "url_resolution": self.url_resolution.to_dict(),
+            "ttfb": self.ttfb.to_dict(),
+            "errors": [
+                {"path": record.path, "error": record.error} for record in self.failed
+            ],
+            "files": [asdict(record) | {"mbps": record.mbps} for record in self.files],
+        }
+
+
+class BatchMetrics:
+    """Metrics of every job in a run, plus run-wide API retry counts."""
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.phases: dict[str, float] = {}
+        self.jobs: dict[str, JobMetrics] = {}
+        # Retried API/transfer responses by HTTP status (from the Governor)
+        self.http_retries: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def job(self, job_id: str) -> JobMetrics:
+        """Return the metrics of ``job_id``, creating them on first use."""
+        with self._lock:
+            if job_id not in self.jobs:
+                self.jobs[job_id] = JobMetrics(job_id)
+            return self.jobs[job_id]
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        jobs = list(self.jobs.values())
+        return {
+            "started_at": self.started_at,
+            "elapsed_s": time.time() - self.started_at,
+            "phases_s": dict(self.phases),
+            "jobs": len(jobs),
+            "files_downloaded": sum(len(job.files) - len(job.failed) for job in jobs),
+            "files_failed": sum(len(job.failed) for job in jobs),
+            "bytes_downloaded": sum(job.bytes_downloaded for job in jobs),
+            "retries": sum(job.retries for job in jobs),
+            "http_retries_by_status": {
+                str(status): count for status, count in self.http_retries.items()
+            },
+            "job_summaries": [
+                {
+                    key: value
+                    for key, value in job.to_dict().items()
+                    if key not in ("files", "errors")
+                }
+                for job in jobs
+            ],
+        }
+
+
+def write_report(report_path: Path, report: dict[str, Any]) -> None:
+    """Write a metrics report as indented JSON."""
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2))
+
+
+def _ms(seconds: float | None) -> str:
+    return f"{seconds * 1000:.0f}" if seconds is not None else "-"
+
+
+def summary_table(batch: BatchMetrics) -> Table:
+    """Build a table of per-job timings for the end-of-run summary."""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Job", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("MB", justify="right")
+    table.add_column("Listing s", justify="right")
+    table.add_column("List ms p50/p95", justify="right")
+    table.add_column("URL ms p95", justify="right")
+    table.add_column("TTFB ms p50/p95", justify="right")
+    table.add_column("Transfer s", justify="right")
+    table.add_column("MB/s", justify="right", style="green")
+    table.add_column("Retries", justify="right")
+
+    for job in batch.jobs.values():
+        throughput = job.throughput_mbps
+        table.add_row(
+            job.job_id,
+            str(len(job.files) - len(job.failed)),
+            f"[red]{len(job.failed)}[/red]" if job.failed else "0",
+            f"{job.bytes_downloaded / (1024 * 1024):.1f}",
+            f"{job.phases.get('listing', 0.0):.1f}",
+            f"{_ms(job.listing.percentile(50))}/{_ms(job.listing.percentile(95))}",
+            _ms(job.url_resolution.percentile(95)),
+            f"{_ms(job.ttfb.percentile(50))}/{_ms(job.ttfb.percentile(95))}",
+            f"{job.phases.get('transfer', 0.0):.1f}",
+            f"{throughput:.1f}" if throughput is not None else "-",
+            str(job.retries),
+        )
+
+    return table
@@ -0,0 +1,317 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from codeocean import CodeOcean
+
+# Synthetic file contents are cut from this many bytes of seeded random data
+PATTERN_BYTES = 1024 * 1024
+# Responses are written (and bandwidth-throttled) in blocks of this size
+WRITE_BLOCK_BYTES = 64 * 1024
+PRESIGNED_URL_TTL_S = 3600
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """
+    Shape of a synthetic result tree.
+
+    Every folder holds ``files_per_folder`` files of ``file_size`` bytes and,
+    above ``depth``, ``folders_per_level`` subfolders.
+    """
+
+    depth: int
+    folders_per_level: int
+    files_per_folder: int
+    file_size: int
+
+    @property
+    def folder_count(self) -> int:
+        return sum(self.folders_per_level**level for level in range(self.depth + 1))
+
+    @property
+    def file_count(self) -> int:
+        return self.folder_count * self.files_per_folder
+
+    @property
+    def total_bytes(self) -> int:
+        return self.file_count * self.file_size
+
+
+@dataclass
+class MockConfig:
+    """Latency, bandwidth and failure injection of a ``MockCodeOcean`` server."""
+
+    # Added to every API request (listing, status, URL resolution)
+    api_latency_s: float = 0.0
+    # Added before the response headers of every file request
+    file_latency_s: float = 0.0
+    # Per-connection file bandwidth in bytes/s (None for unthrottled)
+    bandwidth_bps: float | None = None
+    # Fraction of API requests answered with 503 + Retry-After
+    api_error_rate: float = 0.0
+    # Fraction of API requests answered with 429 + Retry-After
+    throttle_rate: float = 0.0
+    # Fraction of file transfers cut off half-way through the body
+    drop_rate: float = 0.0
+    # Folders whose listing always fails with 500
+    failing_folders: tuple[str, ...] = ()
+    # Seeds both the file contents and the failure injection
+    seed: int = 0
+
+
+def build_tree(spec: TreeSpec) -> dict[str, list[dict]]:
+    """Return folder path -> listing items for a synthetic result tree."""
+    folders: dict[str, list[dict]] = {}
+
+    def add_folder(path: str, level: int) -> None:
+        items: list[dict] = []
+        for i in range(spec.files_per_folder):
+            name = f"file_{i:04d}.bin"
+            items.append(
+                {
+                    "name": name,
+                    "path": f"{path}/{name}" if path else name,
+                    "type": "file",
+                    "size": spec.file_size,
+                }
+            )
+        if level < spec.depth:
+            for i in range(spec.folders_per_level):
+                name = f"dir_{i:03d}"
+                child = f"{path}/{name}" if path else name
+                items.append({"name": name, "path": child, "type": "folder"})
+                add_folder(child, level + 1)
+        folders[path] = items
+
+    add_folder("", 0)
+    return folders
+
+
+class MockCodeOcean:
+    """
+    Local stand-in for the Code Ocean API and its presigned file storage.
+
+    Serves ``get_computation``, ``list_computation_results`` and
+    ``get_result_file_urls`` for any computation ID (all computations share
+    the synthetic ``tree``), plus the files those URLs point to, with Range
+    support. File contents are deterministic for a given seed and path and
+    are generated on the fly, so large trees need no disk space.
+    Use as a context manager; ``client()`` returns a real ``CodeOcean``
+    client pointed at the server.
+    """
+
+    def __init__(self, spec: TreeSpec, config: MockConfig | None = None):
+        self.spec = spec
+        self.config = config or MockConfig()
+        self.tree = build_tree(spec)
+        self.sizes = {
+            item["path"]: item["size"]
+            for items in self.tree.values()
+            for item in items
+            if item["type"] == "file"
+        }
+        pattern = random.Random(self.config.seed).randbytes(PATTERN_BYTES)
+        self._pattern = pattern + pattern
+        self._random = random.Random(self.config.seed)
+        self._random_lock = threading.Lock()
+        self.request_counts: dict[str, int] = {}
+        self._counts_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self) -> "MockCodeOcean":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def client(self) -> CodeOcean:
+        return CodeOcean(domain=self.url, token="mock-token")
+
+    def file_bytes(self, path: str, start: int = 0, end: int | None = None) -> bytes:
+        """Return bytes ``start:end`` of the synthetic file at ``path``."""
+        size = self.sizes[path]
+        end = size if end is None else min(end, size)
+        offset = zlib.crc32(path.encode()) % PATTERN_BYTES
+        chunks = []
+        position = start
+        while position < end:
+            base = (offset + position) % PATTERN_BYTES
+            length = min(end - position, PATTERN_BYTES)
+            chunks.append(self._pattern[base : base + length])
+            position += length
+        return b"".join(chunks)
+
+    def etag(self, path: str) -> str:
+        """Return an S3-style ETag that is equal for files with equal contents."""
+        offset = zlib.crc32(path.encode()) % PATTERN_BYTES
+        key = f"{self.config.seed}:{offset}:{self.sizes[path]}"
+        return f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+    def _chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < rate
+
+    def _count(self, route: str) -> None:
+        with self._counts_lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+            def send_json(self, status: int, body: object) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status in (429, 503):
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def api_fault(self) -> bool:
+                time.sleep(mock.config.api_latency_s)
+                if mock._chance(mock.config.throttle_rate):
+                    self.send_json(429, {"message": "Too many requests"})
+                    return True
+                if mock._chance(mock.config.api_error_rate):
+                    self.send_json(503, {"message": "Service unavailable"})
+                    return True
+                return False
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+
+                if parsed.path.startswith("/files/"):
+                    self.serve_file(parsed.path)
+                    return
+
+                if match := re.fullmatch(
+                    r"/api/v1/computations/([^/]+)/results/urls", parsed.path
+                ):
+                    mock._count("get_result_file_urls")
+                    if self.api_fault():
+                        return
+                    path = parse_qs(parsed.query).get("path", [""])[0]
+                    if path not in mock.sizes:
+                        self.send_json(404, {"message": f"No such file: {path}"})
+                        return
+                    signed_at = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+                    url = (
+                        f"{mock.url}/files/{match.group(1)}/{quote(path)}"
+                        f"?X-Amz-Date={signed_at}&X-Amz-Expires={PRESIGNED_URL_TTL_S}"
+                    )
+                    self.send_json(200, {"download_url": url, "view_url": url})
+                    return
+
+                if match := re.fullmatch(r"/api/v1/computations/([^/]+)", parsed.path):
+                    mock._count("get_computation")
+                    if self.api_fault():
+                        return
+                    self.send_json(
+                        200,
+                        {
+                            "id": match.group(1),
+                            "created": 0,
+                            "name": f"mock {match.group(1)}",
+                            "run_time": 0,
+                            "state": "completed",
+                            "has_results": True,
+                        },
+                    )
+                    return
+
+                self.send_json(404, {"message": "Not found"})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                if re.fullmatch(r"/api/v1/computations/[^/]+/results", self.path):
+                    mock._count("list_computation_results")
+                    if self.api_fault():
+                        return
+                    path = body.get("path", "").strip("/")
+                    if path in mock.config.failing_folders:
+                        self.send_json(500, {"message": "Internal server error"})
+                        return
+                    if path not in mock.tree:
+                        self.send_json(404, {"message": f"No such folder: {path}"})
+                        return
+                    self.send_json(200, {"items": mock.tree[path]})
+                    return
+
+                self.send_json(404, {"message": "Not found"})
+
+            def serve_file(self, url_path: str) -> None:
+                mock._count("file")
+                time.sleep(mock.config.file_latency_s)
+                path = unquote(url_path.split("/", 3)[3])
+                if path not in mock.sizes:
+                    self.send_json(404, {"message": f"No such file: {path}"})
+                    return
+
+                size = mock.sizes[path]
+                start, end = 0, size
+                range_header = self.headers.get("Range")
+                if range_header and (
+                    match := re.fullmatch(r"bytes=(\d+)-(\d*)", range_header)
+                ):
+                    start = int(match.group(1))
+                    if start >= size:
+                        # Like S3, reject a range starting past the last byte
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    end = int(match.group(2)) + 1 if match.group(2) else size
+                    end = min(end, size)
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(end - start))
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", mock.etag(path))
+                self.end_headers()
+
+                # A dropped transfer stops half-way and closes the connection
+                stop = end
+                if mock._chance(mock.config.drop_rate):
+                    stop = start + (end - start) // 2
+                    self.close_connection = True
+
+                position = start
+                while position < stop:
+                    block_end = min(stop, position + WRITE_BLOCK_BYTES)
+                    self.wfile.write(mock.file_bytes(path, position, block_end))
+                    if mock.config.bandwidth_bps:
+                        time.sleep((block_end - position) / mock.config.bandwidth_bps)
+                    position = block_end
+
+        return Handler
@@ -0,0 +1,196 @@
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
+
+from codeocean import CodeOcean
+
+from get_url import TERMINAL_STATES
+from job_records import JobRecorder
+from throttle import TokenBucket
+
+DEFAULT_MONITOR_WORKERS = 8
+# A job is re-polled soon after it changes state, then less and less often
+# while it stays in the same state
+MIN_POLL_INTERVAL_S = 10.0
+MAX_POLL_INTERVAL_S = 300.0
+POLL_BACKOFF = 1.5
+# Finishing is imminent in these states, so don't back off
+FAST_POLL_STATES = ("finalizing",)
+# Give up on a job after this many consecutive failed status requests
+MAX_STATUS_ERRORS = 5
+# Status of a job given up on; it is no longer polled
+STATUS_ERROR = "error_checking_status"
+
+
+@dataclass
+class StatusChange:
+    """A job observed in a new state (or given up on after repeated errors)."""
+
+    job_key: str
+    computation_id: str
+    old_status: str | None
+    new_status: str
+    error: str | None = None
+
+    @property
+    def terminal(self) -> bool:
+        """Whether the job won't be polled again."""
+        return (
+            self.new_status.lower() in TERMINAL_STATES
+            or self.new_status == STATUS_ERROR
+        )
+
+
+def is_pending(job_info: dict[str, Any]) -> bool:
+    """Whether a job has a computation that hasn't reached a terminal state."""
+    status = str(job_info.get("status")).lower()
+    return (
+        job_info.get("computation_id") is not None
+        and status not in TERMINAL_STATES
+        and status != STATUS_ERROR
+    )
+
+
+def get_state(
+    co_client: CodeOcean, computation_id: str, rate_limiter: TokenBucket | None = None
+) -> str:
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    computation = co_client.computations.get_computation(computation_id)
+    state = (
+        computation.get("state") if isinstance(computation, dict) else computation.state
+    )
+    return getattr(state, "value", state)
+
+
+def next_interval(
+    state: str,
+    interval_s: float,
+    changed: bool,
+    min_interval_s: float = MIN_POLL_INTERVAL_S,
+    max_interval_s: float = MAX_POLL_INTERVAL_S,
+) -> float:
+    """Poll interval after an observation of ``state``."""
+    if changed or state.lower() in FAST_POLL_STATES:
+        return min_interval_s
+    return min(max_interval_s, interval_s * POLL_BACKOFF)
+
+
+def watch_jobs(
+    co_client: CodeOcean,
+    jobs: dict[str, dict[str, Any]],
+    journal: JobRecorder | None = None,
+    workers: int = DEFAULT_MONITOR_WORKERS,
+    rate_limiter: TokenBucket | None = None,
+    min_interval_s: float = MIN_POLL_INTERVAL_S,
+    max_interval_s: float = MAX_POLL_INTERVAL_S,
+    on_round: Callable[[], None] | None = None,
+) -> Iterator[StatusChange]:
+    """
+    Poll the pending jobs of a batch until all of them reach a terminal state.
+
+    Each job has its own schedule: it is polled ``min_interval_s`` after a
+    state change and then ``POLL_BACKOFF`` times less often while its state
+    holds, up to ``max_interval_s``. Jobs are dropped from the poll set once
+    terminal, and the jobs due at the same time are polled concurrently.
+    ``jobs`` is updated in place and every change is journaled. Jobs the
+    caller adds to ``jobs`` while iterating (e.g. to backfill a finished
+    one), or gives a new computation ID (to retry one), are picked up and
+    polled too.
+
+    Args:
+        co_client: Code Ocean client
+        jobs: Job records of the batch by job key, updated in place
+        journal: Record of the batch to append status changes to
+        workers: Maximum number of concurrent status requests
+        rate_limiter: Optional limiter acquired before each status request
+        min_interval_s: Poll interval right after a state change
+        max_interval_s: Longest poll interval of a job whose state holds
+        on_round: Called before each round of polls, e.g. to submit more jobs
+
+    Yields:
+        One ``StatusChange`` per observed change, as it is observed
+    """
+    # job_key -> (next poll time, current interval)
+    schedule: dict[str, tuple[float, float]] = {}
+    # (job_key, computation_id) of every computation already scheduled
+    seen: set[tuple[str, str | None]] = set()
+    errors: dict[str, int] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        while True:
+            if on_round is not None:
+                on_round()
+            now = time.monotonic()
+            for job_key, job_info in list(jobs.items()):
+                computation = (job_key, job_info.get("computation_id"))
+                if computation not in seen and is_pending(job_info):
+                    seen.add(computation)
+                    schedule[job_key] = (now, min_interval_s)
+            if not schedule:
+                break
+
+            due = [job_key for job_key, (at, _) in schedule.items() if at <= now]
+            if not due:
+                time.sleep(min(at for at, _ in schedule.values()) - now)
+                continue
+
+            futures = {
+                executor.submit(
+                    get_state, co_client, jobs[job_key]["computation_id"], rate_limiter
+                ): job_key
+                for job_key in due
+            }
+
+            for future in as_completed(futures):
+                job_key = futures[future]
+                job_info = jobs[job_key]
+                _, interval_s = schedule[job_key]
+                old_status = job_info.get("status")
+
+                try:
+                    state = future.result()
+                except Exception as e:
+                    errors[job_key] = errors.get(job_key, 0) + 1
+                    if errors[job_key] < MAX_STATUS_ERRORS:
+                        retry_s = next_interval(
+                            "", interval_s, False, min_interval_s, max_interval_s
+                        )
+                        schedule[job_key] = (time.monotonic() + retry_s, retry_s)
+                        continue
+
+                    del schedule[job_key]
+                    job_info["status"] = STATUS_ERROR
+                    job_info["error"] = str(e)
+                    if journal is not None:
+                        journal.record(job_key, job_info)
+                    yield StatusChange(
+                        job_key,
+                        job_info["computation_id"],
+                        old_status,
+                        job_info["status"],
+                        str(e),
+                    )
+                    continue
+
+                errors.pop(job_key, None)
+                changed = state != old_status
+                if changed:
+                    job_info["status"] = state
+                    if journal is not None:
+                        journal.record(job_key, job_info)
+
+                if state.lower() in TERMINAL_STATES:
+                    del schedule[job_key]
+                else:
+                    interval_s = next_interval(
+                        state, interval_s, changed, min_interval_s, max_interval_s
+                    )
+                    schedule[job_key] = (time.monotonic() + interval_s, interval_s)
+
+                if changed:
+                    yield StatusChange(
+                        job_key, job_info["computation_id"], old_status, state
+                    )
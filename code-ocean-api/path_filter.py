@@ -0,0 +1,87 @@
+from collections.abc import Sequence
+from fnmatch import fnmatchcase
+
+
+def _split(path: str) -> list[str]:
+    return [part for part in path.strip("/").split("/") if part]
+
+
+def _match_parts(parts: list[str], patterns: list[str], prefix: bool) -> bool:
+    """
+    Match path components against glob components, where ``**`` spans any
+    number of components. With ``prefix``, also accept paths that are a
+    leading part of something the pattern could match.
+    """
+    if not patterns:
+        return not parts
+    if not parts:
+        return prefix or all(pattern == "**" for pattern in patterns)
+
+    head = patterns[0]
+    if head == "**":
+        return _match_parts(parts, patterns[1:], prefix) or _match_parts(
+            parts[1:], patterns, prefix
+        )
+    return fnmatchcase(parts[0], head) and _match_parts(parts[1:], patterns[1:], prefix)
+
+
+def matches(path: str, pattern: str) -> bool:
+    """
+    Check whether a result path, or any folder containing it, matches ``pattern``.
+
+    Patterns without a ``/`` match a file or folder name at any depth (``*.json``,
+    ``checkpoints``); patterns with a ``/`` are anchored at the result root and
+    may use ``**`` for any number of folders (``metrics/*.csv``, ``**/plots``).
+    """
+    parts = _split(path)
+    pattern_parts = _split(pattern)
+
+    if len(pattern_parts) == 1:
+        return any(fnmatchcase(part, pattern_parts[0]) for part in parts)
+
+    return any(
+        _match_parts(parts[:depth], pattern_parts, prefix=False)
+        for depth in range(1, len(parts) + 1)
+    )
+
+
+def could_contain(folder_path: str, pattern: str) -> bool:
+    """Check whether anything below ``folder_path`` could match ``pattern``."""
+    pattern_parts = _split(pattern)
+
+    if len(pattern_parts) == 1:
+        return True
+
+    return _match_parts(_split(folder_path), pattern_parts, prefix=True)
+
+
+class PathFilter:
+    """
+    Include/exclude glob filter for result paths, applied while listing.
+
+    A folder is only listed if it is not excluded and, when include patterns
+    are given, something below it could still be included; excluded subtrees
+    are therefore never listed at all.
+    """
+
+    def __init__(self, include: Sequence[str] = (), exclude: Sequence[str] = ()):
+        self.include = list(include)
+        self.exclude = list(exclude)
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def wants_folder(self, path: str) -> bool:
+        if any(matches(path, pattern) for pattern in self.exclude):
+            return False
+        return not self.include or any(
+            matches(path, pattern) or could_contain(path, pattern)
+            for pattern in self.include
+        )
+
+    def wants_file(self, path: str) -> bool:
+        if any(matches(path, pattern) for pattern in self.exclude):
+            return False
+        return not self.include or any(
+            matches(path, pattern) for pattern in self.include
+        )
@@ -0,0 +1,357 @@
+import heapq
+import itertools
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from codeocean import CodeOcean
+from codeocean.computation import NamedRunParam, RunParams
+
+from job_records import JobRecorder
+from job_retry import attempt_history, classify_error
+from monitor import is_pending
+from sweep_ledger import SweepLedger
+from throttle import TokenBucket
+
+DEFAULT_SUBMIT_WORKERS = 4
+# Orders in which queued runs are submitted, after priority (highest first)
+SUBMISSION_ORDERS = ("fifo", "shortest-first", "longest-first")
+DEFAULT_SUBMISSION_ORDER = "fifo"
+# Runs are only reordered within a window of this many upcoming runs, so a
+# lazily generated sweep is never held in memory as a whole
+DEFAULT_QUEUE_LOOKAHEAD = 10_000
+
+
+def make_job_key(run_idx: int, run_settings: dict[str, Any]) -> str:
+    param_str = "_".join([f"{k}={v}" for k, v in run_settings.items()])
+    return f"run_{run_idx}_{param_str}"
+
+
+def build_run_params(capsule_id: str, run_settings: dict[str, Any]) -> RunParams:
+    """Turn one parameter set into capsule run parameters."""
+    named_params = [
+        NamedRunParam(param_name=param_name, value=str(param_value))
+        for param_name, param_value in run_settings.items()
+    ]
+    named_params.append(NamedRunParam(param_name="base_output_dir", value="/results"))
+
+    return RunParams(
+        capsule_id=capsule_id,
+        named_parameters=named_params,
+    )
+
+
+def submit_job(
+    co_client: CodeOcean,
+    capsule_id: str,
+    job_key: str,
+    run_settings: dict[str, Any],
+    journal: JobRecorder | None = None,
+    rate_limiter: TokenBucket | None = None,
+    ledger: SweepLedger | None = None,
+    history: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Start one computation and record it in ``journal`` once it is accepted.
+
+    A ``submitting`` record is journaled before the request, so a crash while
+    it is in flight leaves a trace of the job that may have been started. If
+    ``ledger`` holds a completed or in-flight run of the same configuration,
+    that computation is reused and nothing is submitted. ``history`` holds
+    the fields linking earlier attempts of a resubmitted job (see
+    ``job_retry.RetryScheduler``) and is kept in its record.
+
+    Returns:
+        The job record (``computation_id``, ``run_settings``, ``status``, ...)
+    """
+    history = history or {}
+
+    if ledger is not None:
+        entry = ledger.reusable(capsule_id, run_settings)
+        if entry is not None:
+            job_info: dict[str, Any] = {
+                "computation_id": entry["computation_id"],
+                "run_settings": run_settings,
+                "status": entry["status"],
+                "reused_from": entry.get("job_key"),
+                **history,
+            }
+            print(
+                f"  -> Job key: {job_key}, reusing computation "
+                f"{entry['computation_id']} ({entry['status']})"
+            )
+            if journal is not None:
+                journal.record(job_key, job_info)
+            return job_info
+
+    if journal is not None:
+        journal.record(
+            job_key,
+            {
+                "computation_id": None,
+                "run_settings": run_settings,
+                "status": "submitting",
+                **history,
+            },
+        )
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+    try:
+        response = co_client.computations.run_capsule(
+            run_params=build_run_params(capsule_id, run_settings)
+        )
+        computation_id = (
+            response.get("id") if isinstance(response, dict) else response.id
+        )
+        job_info = {
+            "computation_id": computation_id,
+            "run_settings": run_settings,
+            "status": "submitted",
+            "response": response,
+            **history,
+        }
+        print(f"  -> Job key: {job_key}, Computation ID: {computation_id}")
+    except Exception as e:
+        print(f"  -> ERROR submitting job {job_key}: {e}")
+        job_info = {
+            "computation_id": None,
+            "run_settings": run_settings,
+            "status": "submission_failed",
+            "error": str(e),
+            "error_class": classify_error(e),
+            **history,
+        }
+
+    if journal is not None:
+        journal.record(job_key, job_info)
+    if ledger is not None:
+        ledger.record(capsule_id, run_settings, job_info, job_key)
+    return job_info
+
+
+def submit_indexed_jobs(
+    co_client: CodeOcean,
+    capsule_id: str,
+    runs: Iterable[tuple[int, dict[str, Any]]],
+    journal: JobRecorder | None = None,
+    workers: int = DEFAULT_SUBMIT_WORKERS,
+    rate_limiter: TokenBucket | None = None,
+    ledger: SweepLedger | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Submit ``(run index, run settings)`` pairs with bounded parallelism.
+
+    At most ``workers`` ``run_capsule`` requests are in flight, and ``runs``
+    is consumed only as submission slots free up, so it may be a lazy
+    generator. Each job is journaled as soon as it is accepted.
+
+    Args:
+        co_client: Code Ocean client
+        capsule_id: Capsule to run
+        runs: Run index (in the job key) and named parameters of each run
+        journal: Write-ahead record of the batch
+        workers: Maximum number of concurrent submissions
+        rate_limiter: Optional limiter acquired before each submission
+        ledger: Record of earlier sweeps; configurations that completed or are
+            still running there are reused instead of submitted
+
+    Returns:
+        Dictionary mapping job key to job record, in the order of ``runs``
+    """
+    jobs: dict[str, dict[str, Any]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending: dict[Future[dict[str, Any]], str] = {}
+
+        def collect(done: Iterable[Future[dict[str, Any]]]) -> None:
+            for future in done:
+                jobs[pending.pop(future)] = future.result()
+
+        for run_idx, run_settings in runs:
+            job_key = make_job_key(run_idx, run_settings)
+            # Keep the key order of the sweep, whatever order submissions finish in
+            jobs[job_key] = {}
+            print(f"Running pipeline with settings: {run_settings}")
+
+            pending[
+                executor.submit(
+                    submit_job,
+                    co_client,
+                    capsule_id,
+                    job_key,
+                    run_settings,
+                    journal,
+                    rate_limiter,
+                    ledger,
+                )
+            ] = job_key
+
+            if len(pending) >= workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        collect(list(pending))
+
+    return jobs
+
+
+class SubmissionQueue:
+    """
+    Runs waiting to be submitted, ordered by priority and estimated cost.
+
+    Higher ``priority`` runs go first; among equal priorities, runs are
+    submitted in sweep order (``fifo``), cheapest first (``shortest-first``,
+    for early results) or most expensive first (``longest-first``, which
+    shortens the whole sweep when running computations are capped). Ordering
+    only looks ``lookahead`` runs ahead of the sweep generator.
+    """
+
+    def __init__(
+        self,
+        runs: Iterable[tuple[int, dict[str, Any]]],
+        order: str = DEFAULT_SUBMISSION_ORDER,
+        cost: Callable[[dict[str, Any]], float] | None = None,
+        priority: Callable[[dict[str, Any]], float] | None = None,
+        lookahead: int = DEFAULT_QUEUE_LOOKAHEAD,
+    ):
+        if order not in SUBMISSION_ORDERS:
+            raise ValueError(
+                f"Unknown submission order {order!r}, expected one of {SUBMISSION_ORDERS}"
+            )
+        if order != "fifo" and cost is None:
+            raise ValueError(f"Submission order {order!r} needs a cost estimate")
+
+        self.order = order
+        self.cost = cost
+        self.priority = priority
+        self.lookahead = max(1, lookahead)
+        self._runs = iter(runs)
+        self._exhausted = False
+        self._heap: list[tuple[float, float, int, int, dict[str, Any]]] = []
+        self._sequence = itertools.count()
+
+    def _fill(self) -> None:
+        while not self._exhausted and len(self._heap) < self.lookahead:
+            try:
+                run_idx, run_settings = next(self._runs)
+            except StopIteration:
+                self._exhausted = True
+                break
+
+            priority = self.priority(run_settings) if self.priority else 0.0
+            cost = 0.0
+            if self.order != "fifo" and self.cost is not None:
+                cost = self.cost(run_settings)
+                if self.order == "longest-first":
+                    cost = -cost
+            heapq.heappush(
+                self._heap,
+                (-priority, cost, next(self._sequence), run_idx, run_settings),
+            )
+
+    def __bool__(self) -> bool:
+        self._fill()
+        return bool(self._heap)
+
+    def pop(self) -> tuple[int, dict[str, Any]] | None:
+        """Next run to submit, or None once the sweep is exhausted."""
+        self._fill()
+        if not self._heap:
+            return None
+        *_, run_idx, run_settings = heapq.heappop(self._heap)
+        return run_idx, run_settings
+
+    def take(self, count: int) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Pop up to ``count`` runs, lazily."""
+        for _ in range(count):
+            run = self.pop()
+            if run is None:
+                return
+            yield run
+
+
+def fill_running_slots(
+    co_client: CodeOcean,
+    capsule_id: str,
+    queue: SubmissionQueue,
+    jobs: dict[str, dict[str, Any]],
+    max_running: int | None = None,
+    journal: JobRecorder | None = None,
+    workers: int = DEFAULT_SUBMIT_WORKERS,
+    rate_limiter: TokenBucket | None = None,
+    ledger: SweepLedger | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Submit queued runs until ``max_running`` computations of ``jobs`` are active.
+
+    Runs reused from ``ledger`` that already finished and failed submissions
+    don't take a slot, so the queue is drained until the slots are full. Call
+    again whenever a computation finishes to backfill its slot.
+
+    Args:
+        co_client: Code Ocean client
+        capsule_id: Capsule to run
+        queue: Runs waiting to be submitted
+        jobs: Jobs of the batch so far; newly submitted jobs are added to it
+        max_running: Cap on active (submitted, not yet finished) computations;
+            None submits the whole queue
+        (other arguments as for ``submit_indexed_jobs``)
+
+    Returns:
+        The newly submitted jobs
+    """
+    submitted: dict[str, dict[str, Any]] = {}
+
+    while queue:
+        if max_running is None:
+            free = queue.lookahead
+        else:
+            free = max_running - sum(is_pending(job_info) for job_info in jobs.values())
+            if free <= 0:
+                break
+
+        new_jobs = submit_indexed_jobs(
+            co_client,
+            capsule_id,
+            queue.take(free),
+            journal,
+            workers,
+            rate_limiter,
+            ledger,
+        )
+        jobs.update(new_jobs)
+        submitted.update(new_jobs)
+
+    return submitted
+
+
+def resubmit_job(
+    co_client: CodeOcean,
+    capsule_id: str,
+    job_key: str,
+    jobs: dict[str, dict[str, Any]],
+    journal: JobRecorder | None = None,
+    rate_limiter: TokenBucket | None = None,
+    ledger: SweepLedger | None = None,
+) -> dict[str, Any]:
+    """
+    Submit a new attempt of a job scheduled for retry, replacing its record.
+
+    Returns:
+        The new job record, linked to the earlier attempts
+    """
+    job_info = jobs[job_key]
+    print(f"Retrying {job_key} (attempt {job_info.get('attempt', 1)})")
+    jobs[job_key] = submit_job(
+        co_client,
+        capsule_id,
+        job_key,
+        job_info["run_settings"],
+        journal,
+        rate_limiter,
+        ledger,
+        attempt_history(job_info),
+    )
+    return jobs[job_key]
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SWEEP_LEDGER = Path("sweep_ledger.jsonl")
+# Configurations last seen in these states are run again rather than reused
+RERUN_STATUSES = (
+    "failed",
+    "stopped",
+    "submitting",
+    "submission_failed",
+    "error_checking_status",
+)
+
+
+def settings_hash(capsule_id: str, run_settings: dict[str, Any]) -> str:
+    """
+    Hash a capsule run configuration independently of parameter order.
+
+    Values are compared by their string form, as they are passed to the capsule.
+    """
+    canonical = json.dumps(
+        {
+            "capsule_id": capsule_id,
+            "run_settings": {k: str(v) for k, v in run_settings.items()},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SweepLedger:
+    """
+    Persistent record of every configuration run across sweeps.
+
+    Each line maps the ``settings_hash`` of a capsule run configuration to its
+    latest computation ID and status; the last line for a hash wins. Before a
+    configuration is submitted, the ledger is consulted so that a run that
+    completed or is still in flight is reused instead of started again.
+    """
+
+    def __init__(self, path: Path = DEFAULT_SWEEP_LEDGER):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+
+        if path.exists():
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn final line from an interrupted run
+                        continue
+                    self._entries[entry["hash"]] = entry
+
+        self._file = open(path, "a")
+
+    def __enter__(self) -> "SweepLedger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self, capsule_id: str, run_settings: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Return the latest entry for this configuration, if it was ever run."""
+        with self._lock:
+            return self._entries.get(settings_hash(capsule_id, run_settings))
+
+    def reusable(
+        self, capsule_id: str, run_settings: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Return the entry of a completed or in-flight run of this configuration."""
+        entry = self.lookup(capsule_id, run_settings)
+        if (
+            entry is None
+            or entry.get("computation_id") is None
+            or str(entry.get("status")).lower() in RERUN_STATUSES
+        ):
+            return None
+        return entry
+
+    def record(
+        self,
+        capsule_id: str,
+        run_settings: dict[str, Any],
+        job_info: dict[str, Any],
+        job_key: str | None = None,
+    ) -> None:
+        """Append the current computation ID and status of a configuration."""
+        entry = {
+            "hash": settings_hash(capsule_id, run_settings),
+            "capsule_id": capsule_id,
+            "run_settings": run_settings,
+            "computation_id": job_info.get("computation_id"),
+            "status": job_info.get("status"),
+            "job_key": job_key,
+        }
+        with self._lock:
+            previous = self._entries.get(entry["hash"])
+            if entry["job_key"] is None and previous is not None:
+                entry["job_key"] = previous.get("job_key")
+            if previous is not None and all(
+                previous.get(k) == entry[k] for k in ("computation_id", "status")
+            ):
+                return
+            self._entries[entry["hash"]] = entry
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def seed_from_batch(self, batch_data: dict[str, Any], capsule_id: str) -> int:
+        """
+        Record the jobs of a batch saved before the ledger existed.
+
+        Configurations already in the ledger are left untouched.
+
+        Args:
+            batch_data: Batch in the ``jobs_*.json`` format
+            capsule_id: Capsule the batch was run on
+
+        Returns:
+            Number of configurations added
+        """
+        added = 0
+        for job_key, job_info in batch_data.get("jobs", {}).items():
+            run_settings = job_info.get("run_settings")
+            if not run_settings or self.lookup(capsule_id, run_settings):
+                continue
+            self.record(capsule_id, run_settings, job_info, job_key)
+            added += 1
+        return added
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
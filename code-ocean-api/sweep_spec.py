@@ -0,0 +1,321 @@
+import itertools
+import json
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sweep import DEFAULT_SUBMISSION_ORDER, SUBMISSION_ORDERS
+
+SAMPLING_METHODS = ("grid", "random", "lhs", "sobol")
+# Unit-cube points are drawn from scipy's Sobol engine in blocks of this size
+SOBOL_BLOCK_SIZE = 1024
+# Names available to derived-field expressions besides the parameters
+EXPRESSION_BUILTINS = {
+    "abs": abs,
+    "bool": bool,
+    "float": float,
+    "int": int,
+    "len": len,
+    "max": max,
+    "min": min,
+    "round": round,
+    "str": str,
+    "math": math,
+}
+
+
+@dataclass
+class Dimension:
+    """
+    One swept parameter.
+
+    Either a list of ``values`` (for the grid, or drawn uniformly when
+    sampling) or a continuous range ``low``..``high``, optionally sampled on a
+    log scale or rounded to integers. Ranges can only be sampled.
+    """
+
+    name: str
+    values: list[Any] | None = None
+    low: float | None = None
+    high: float | None = None
+    log: bool = False
+    integer: bool = False
+
+    @classmethod
+    def parse(cls, name: str, definition: Any) -> "Dimension":
+        if isinstance(definition, list):
+            return cls(name, values=definition)
+        if not isinstance(definition, dict):
+            # A scalar is a parameter fixed for the whole sweep
+            return cls(name, values=[definition])
+        if "values" in definition:
+            return cls(name, values=list(definition["values"]))
+        if "low" not in definition or "high" not in definition:
+            raise ValueError(
+                f"Parameter {name!r} needs either 'values' or 'low' and 'high'"
+            )
+        dimension = cls(
+            name,
+            low=float(definition["low"]),
+            high=float(definition["high"]),
+            log=bool(definition.get("log", False)),
+            integer=bool(definition.get("integer", False)),
+        )
+        if dimension.log and dimension.low <= 0:
+            raise ValueError(f"Parameter {name!r} needs low > 0 for a log scale")
+        return dimension
+
+    def at(self, u: float) -> Any:
+        """Map a coordinate of the unit interval to a value of this dimension."""
+        if self.values is not None:
+            return self.values[min(int(u * len(self.values)), len(self.values) - 1)]
+        assert self.low is not None and self.high is not None
+        if self.log:
+            value = math.exp(
+                math.log(self.low) + u * (math.log(self.high) - math.log(self.low))
+            )
+        else:
+            value = self.low + u * (self.high - self.low)
+        return round(value) if self.integer else value
+
+
+@dataclass
+class SweepSpec:
+    """
+    Declarative description of a parameter sweep.
+
+    Spec files are JSON (or YAML, if PyYAML is installed) of the form::
+
+        {
+          "capsule_id": "...",
+          "sampling": {"method": "grid" | "random" | "lhs" | "sobol",
+                       "n": 1000, "seed": 0},
+          "parameters": {
+            "embedding_network": ["identity", "lru"],
+            "learning_rate": {"low": 1e-4, "high": 1e-2, "log": true},
+            "seed": 0
+          },
+          "derived": {
+            "n_simulations": "2_000_000 if embedding_network == 'lru' else 4_000_000"
+          },
+          "scheduling": {"order": "shortest-first", "cost": "n_simulations",
+                         "priority": "1 if embedding_network == 'lru' else 0"},
+          "fields": ["embedding_network", "n_simulations", "learning_rate",
+                     "seed"]
+        }
+
+    ``derived`` fields are Python expressions of the parameters (and of the
+    derived fields before them). Parameters whose name starts with ``_`` are
+    only available to expressions and aren't passed to the capsule. The
+    ``scheduling`` expressions are evaluated on the final run settings to
+    order submissions (see ``sweep.SubmissionQueue``). ``fields`` optionally
+    orders the run settings, which is also their order in job keys; by
+    default parameters come first, then derived fields.
+    """
+
+    dimensions: list[Dimension]
+    derived: dict[str, str] = field(default_factory=dict)
+    method: str = "grid"
+    n: int | None = None
+    seed: int = 0
+    capsule_id: str | None = None
+    order: str = DEFAULT_SUBMISSION_ORDER
+    cost_expression: str | None = None
+    priority_expression: str | None = None
+    fields: list[str] | None = None
+
+    @classmethod
+    def from_dict(cls, spec: dict[str, Any]) -> "SweepSpec":
+        sampling = spec.get("sampling", {})
+        if isinstance(sampling, str):
+            sampling = {"method": sampling}
+        method = sampling.get("method", "grid")
+        if method not in SAMPLING_METHODS:
+            raise ValueError(
+                f"Unknown sampling method {method!r}, expected one of {SAMPLING_METHODS}"
+            )
+
+        dimensions = [
+            Dimension.parse(name, definition)
+            for name, definition in spec.get("parameters", {}).items()
+        ]
+        n = sampling.get("n")
+        if method == "grid":
+            ranges = [d.name for d in dimensions if d.values is None]
+            if ranges:
+                raise ValueError(
+                    f"Grid sweeps need lists of values, got ranges for {ranges}"
+                )
+        elif n is None:
+            raise ValueError(f"Sampling method {method!r} needs a number of points 'n'")
+
+        scheduling = spec.get("scheduling", {})
+        order = scheduling.get("order", DEFAULT_SUBMISSION_ORDER)
+        if order not in SUBMISSION_ORDERS:
+            raise ValueError(
+                f"Unknown submission order {order!r}, expected one of {SUBMISSION_ORDERS}"
+            )
+        if order != "fifo" and "cost" not in scheduling:
+            raise ValueError(f"Submission order {order!r} needs a 'cost' expression")
+
+        derived = dict(spec.get("derived", {}))
+        fields = spec.get("fields")
+        if fields is not None:
+            names = [d.name for d in dimensions if not d.name.startswith("_")]
+            names += [name for name in derived if name not in names]
+            if sorted(fields) != sorted(names):
+                raise ValueError(
+                    f"'fields' must list each run setting once, expected {names}"
+                )
+
+        return cls(
+            dimensions=dimensions,
+            derived=derived,
+            method=method,
+            n=n,
+            seed=int(sampling.get("seed", 0)),
+            capsule_id=spec.get("capsule_id"),
+            order=order,
+            cost_expression=scheduling.get("cost"),
+            priority_expression=scheduling.get("priority"),
+            fields=list(fields) if fields is not None else None,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "SweepSpec":
+        """Read a sweep spec from a ``.json``, ``.yaml`` or ``.yml`` file."""
+        with open(path, "r") as f:
+            if path.suffix.lower() in (".yaml", ".yml"):
+                try:
+                    import yaml
+                except ImportError as e:
+                    raise ImportError(
+                        "PyYAML is needed for YAML sweep specs (pip install pyyaml)"
+                    ) from e
+                return cls.from_dict(yaml.safe_load(f))
+            return cls.from_dict(json.load(f))
+
+    def __len__(self) -> int:
+        """Number of points in the sweep."""
+        if self.method == "grid":
+            return math.prod(len(d.values or []) for d in self.dimensions)
+        return self.n or 0
+
+    def _unit_points(self) -> Iterator[list[float]]:
+        """Yield points of the unit hypercube, one coordinate per dimension."""
+        n = self.n or 0
+        d = len(self.dimensions)
+        rng = random.Random(self.seed)
+
+        if self.method == "random":
+            for _ in range(n):
+                yield [rng.random() for _ in range(d)]
+
+        elif self.method == "lhs":
+            # Latin hypercube: each dimension's n strata are visited exactly once
+            strata = [rng.sample(range(n), n) for _ in range(d)]
+            for i in range(n):
+                yield [(strata[j][i] + rng.random()) / n for j in range(d)]
+
+        elif self.method == "sobol":
+            try:
+                from scipy.stats import qmc
+            except ImportError as e:
+                raise ImportError(
+                    "scipy is needed for Sobol sampling (pip install scipy)"
+                ) from e
+            sampler = qmc.Sobol(d=d, scramble=True, seed=self.seed)
+            remaining = n
+            while remaining > 0:
+                block = sampler.random(min(SOBOL_BLOCK_SIZE, remaining))
+                remaining -= len(block)
+                yield from (list(point) for point in block)
+
+    def _points(self) -> Iterator[dict[str, Any]]:
+        if self.method == "grid":
+            for values in itertools.product(*(d.values or [] for d in self.dimensions)):
+                yield {d.name: value for d, value in zip(self.dimensions, values)}
+        else:
+            for unit_point in self._unit_points():
+                yield {d.name: d.at(u) for d, u in zip(self.dimensions, unit_point)}
+
+    def settings(self, point: dict[str, Any]) -> dict[str, Any]:
+        """
+        Add the derived fields to a point and drop ``_`` helper parameters.
+
+        Settings are ordered as ``fields``, if given.
+        """
+        namespace = {"__builtins__": EXPRESSION_BUILTINS, **point}
+        for name, expression in self.derived.items():
+            namespace[name] = point[name] = evaluate(
+                expression, namespace, f"derived field {name!r}"
+            )
+        if self.fields is not None:
+            return {name: point[name] for name in self.fields}
+        return {
+            name: value for name, value in point.items() if not name.startswith("_")
+        }
+
+    def cost(self, run_settings: dict[str, Any]) -> float:
+        """Estimated cost of a run (0 without a cost expression)."""
+        if self.cost_expression is None:
+            return 0.0
+        namespace = {"__builtins__": EXPRESSION_BUILTINS, **run_settings}
+        return float(evaluate(self.cost_expression, namespace, "cost"))
+
+    def priority(self, run_settings: dict[str, Any]) -> float:
+        """Submission priority of a run, highest first (0 without an expression)."""
+        if self.priority_expression is None:
+            return 0.0
+        namespace = {"__builtins__": EXPRESSION_BUILTINS, **run_settings}
+        return float(evaluate(self.priority_expression, namespace, "priority"))
+
+    def runs(
+        self, shard_index: int = 0, shard_count: int = 1
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Like ``expand``, with the index of each point in the whole sweep."""
+        for i, run_settings in enumerate(self.expand(shard_index, shard_count)):
+            yield shard_index + i * shard_count, run_settings
+
+    def expand(
+        self, shard_index: int = 0, shard_count: int = 1
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily generate the run settings of one shard of the sweep.
+
+        Points are dealt round-robin, so shard ``i`` of ``k`` gets points
+        ``i``, ``i + k``, ``i + 2k``, ...; every shard generates the same
+        sequence (sampling is seeded), so shards can run in separate processes.
+
+        Args:
+            shard_index: Index of this shard, from 0 to ``shard_count - 1``
+            shard_count: Number of shards the sweep is split into
+
+        Yields:
+            Run settings of each point of the shard, in sweep order
+        """
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"Invalid shard {shard_index} of {shard_count}")
+        for point in itertools.islice(self._points(), shard_index, None, shard_count):
+            yield self.settings(point)
+
+
+def evaluate(expression: str, namespace: dict[str, Any], what: str) -> Any:
+    try:
+        return eval(expression, namespace)
+    except Exception as e:
+        raise ValueError(f"Could not evaluate {what} = {expression!r}: {e}") from e
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parse ``"i/k"`` (shard ``i`` of ``k``, counting from 0)."""
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError as e:
+        raise ValueError(f"Invalid shard {shard!r}, expected INDEX/COUNT") from e
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {shard!r}, expected 0 <= INDEX < COUNT")
+    return index, count
@@ -0,0 +1,53 @@
+import errno
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from blob_store import BlobStore
+
+CONTENT = b"result" * 1024
+
+
+class BlobStoreTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        self.work_dir = Path(work_dir.name)
+        self.store = BlobStore(self.work_dir / ".blobs", min_size_mb=0)
+
+    def downloaded(self, name: str) -> Path:
+        path = self.work_dir / name
+        path.write_bytes(CONTENT)
+        return path
+
+    def blobs(self) -> list[Path]:
+        return [path for path in self.store.root.rglob("*") if path.is_file()]
+
+    def test_identical_files_share_a_blob(self):
+        first = self.downloaded("a.bin")
+        second = self.downloaded("b.bin")
+
+        self.assertFalse(self.store.add(first, len(CONTENT), '"abc123"'))
+        self.assertTrue(self.store.add(second, len(CONTENT)))
+
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(second.read_bytes(), CONTENT)
+        self.assertIsNotNone(self.store.lookup(len(CONTENT), '"abc123"'))
+
+    def test_failed_link_is_not_reported_as_stored(self):
+        path = self.downloaded("a.bin")
+        disk_full = OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+        with mock.patch("blob_store.os.link", side_effect=disk_full):
+            with self.assertRaises(OSError):
+                self.store.add(path, len(CONTENT), '"abc123"')
+
+        self.assertEqual(self.blobs(), [])
+        self.assertIsNone(self.store.lookup(len(CONTENT), '"abc123"'))
+        self.assertEqual(path.read_bytes(), CONTENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from rich.progress import Progress
+
+import get_url_async
+from get_url import JOURNAL_SUFFIX, PART_SUFFIX, download_file, write_journal
+from mock_codeocean import MockCodeOcean, MockConfig, TreeSpec
+
+TREE = TreeSpec(depth=0, folders_per_level=0, files_per_folder=1, file_size=256 * 1024)
+
+
+class MockFileTestCase(unittest.TestCase):
+    """Downloads of one file of a mock server into a temporary directory."""
+
+    config = MockConfig()
+
+    def setUp(self):
+        self.mock = MockCodeOcean(TREE, self.config).__enter__()
+        self.addCleanup(self.mock.__exit__, None, None, None)
+        self.path, self.size = next(iter(self.mock.sizes.items()))
+        self.url = (
+            self.mock.client()
+            .computations.get_result_file_urls("c0", self.path)
+            .download_url
+        )
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        self.dest_path = Path(work_dir.name) / "file.bin"
+        self.part_path = self.dest_path.with_name(self.dest_path.name + PART_SUFFIX)
+        self.journal_path = self.dest_path.with_name(
+            self.dest_path.name + JOURNAL_SUFFIX
+        )
+
+    def interrupted_at(self, offset: int) -> None:
+        """Leave a ``.part`` file and journal committed up to ``offset``."""
+        self.part_path.write_bytes(self.mock.file_bytes(self.path, 0, offset))
+        write_journal(self.journal_path, self.size, offset)
+
+    def assert_downloaded(self) -> None:
+        self.assertEqual(self.dest_path.read_bytes(), self.mock.file_bytes(self.path))
+        self.assertFalse(self.part_path.exists())
+        self.assertFalse(self.journal_path.exists())
+
+    def download(self) -> None:
+        with Progress(transient=True, disable=True) as progress:
+            download_file(self.url, self.dest_path, progress, expected_size=self.size)
+
+    def download_async(self) -> None:
+        async def run() -> None:
+            with Progress(transient=True, disable=True) as progress:
+                task_id = progress.add_task("file", total=self.size)
+                async with httpx.AsyncClient() as files_client:
+                    await get_url_async.download_file(
+                        files_client,
+                        self.url,
+                        self.dest_path,
+                        progress,
+                        task_id,
+                        self.size,
+                    )
+
+        asyncio.run(run())
+
+
+class DownloadFileTest(MockFileTestCase):
+    def test_resumes_from_the_committed_offset(self):
+        self.interrupted_at(self.size // 2)
+        self.download()
+        self.assert_downloaded()
+        self.assertEqual(self.mock.request_counts["file"], 1)
+
+    def test_fully_committed_part_is_renamed_without_a_request(self):
+        self.interrupted_at(self.size)
+        self.download()
+        self.assert_downloaded()
+        self.assertNotIn("file", self.mock.request_counts)
+
+    def test_async_resumes_from_the_committed_offset(self):
+        self.interrupted_at(self.size // 2)
+        self.download_async()
+        self.assert_downloaded()
+        self.assertEqual(self.mock.request_counts["file"], 1)
+
+    def test_async_fully_committed_part_is_renamed_without_a_request(self):
+        self.interrupted_at(self.size)
+        self.download_async()
+        self.assert_downloaded()
+        self.assertNotIn("file", self.mock.request_counts)
+
+
+class DroppedTransferTest(MockFileTestCase):
+    # Half of the transfers are cut off half-way through the body
+    config = MockConfig(drop_rate=0.5, seed=1)
+
+    def test_resumes_after_dropped_connections(self):
+        with self.assertLogs(level="WARNING") as logs:
+            self.download()
+        self.assert_downloaded()
+        self.assertIn("interrupted", logs.output[0])
+        self.assertGreater(self.mock.request_counts["file"], 1)
+
+    def test_async_resumes_after_dropped_connections(self):
+        with self.assertLogs(level="WARNING") as logs:
+            self.download_async()
+        self.assert_downloaded()
+        self.assertIn("interrupted", logs.output[0])
+        self.assertGreater(self.mock.request_counts["file"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from rich.progress import Progress
+
+import get_url
+import get_url_async
+from get_url import download_job, download_jobs
+from manifest import MANIFEST_FILENAME
+from mock_codeocean import MockCodeOcean, MockConfig, TreeSpec
+
+TREE = TreeSpec(depth=1, folders_per_level=2, files_per_folder=2, file_size=4 * 1024)
+FAILING_FOLDER = "dir_001"
+
+
+class ListingFailureTest(unittest.TestCase):
+    """A job with a folder that can't be listed is not reported as downloaded."""
+
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        download_root = get_url.DOWNLOAD_ROOT
+        self.addCleanup(setattr, get_url, "DOWNLOAD_ROOT", download_root)
+        get_url.DOWNLOAD_ROOT = Path(work_dir.name)
+
+    def downloaded_files(self) -> set[str]:
+        job_dir = get_url.DOWNLOAD_ROOT / "c0"
+        return {
+            path.relative_to(job_dir).as_posix()
+            for path in job_dir.rglob("*")
+            if path.is_file() and path.name != MANIFEST_FILENAME
+        }
+
+    def run_against_mock(self, failing_folders: tuple[str, ...], download) -> object:
+        config = MockConfig(failing_folders=failing_folders)
+        with (
+            MockCodeOcean(TREE, config) as mock,
+            contextlib.redirect_stdout(io.StringIO()),
+            self.assertLogs(level="INFO") as logs,
+        ):
+            self.mock = mock
+            result = download(mock)
+        self.logs = logs.output
+        return result
+
+    def assert_listed_files_downloaded(self) -> None:
+        self.assertEqual(
+            self.downloaded_files(),
+            {
+                path
+                for path in self.mock.sizes
+                if not path.startswith(FAILING_FOLDER + "/")
+            },
+        )
+        self.assertTrue(any(FAILING_FOLDER in line for line in self.logs))
+
+    def test_download_jobs(self):
+        results = self.run_against_mock(
+            (), lambda mock: download_jobs(mock.client(), ["c0"])
+        )
+        self.assertEqual(results, {"c0": True})
+        self.assertEqual(self.downloaded_files(), set(self.mock.sizes))
+
+    def test_download_jobs_with_failed_listing(self):
+        results = self.run_against_mock(
+            (FAILING_FOLDER,), lambda mock: download_jobs(mock.client(), ["c0"])
+        )
+        self.assertEqual(results, {"c0": False})
+        self.assert_listed_files_downloaded()
+
+    def test_download_job_with_failed_listing(self):
+        ok = self.run_against_mock(
+            (FAILING_FOLDER,), lambda mock: download_job(mock.client(), "c0")
+        )
+        self.assertFalse(ok)
+        self.assert_listed_files_downloaded()
+
+    def test_async_download_job_with_failed_listing(self):
+        async def download(mock: MockCodeOcean) -> bool:
+            async with (
+                httpx.AsyncClient(base_url=f"{mock.url}/api/v1/") as api_client,
+                httpx.AsyncClient() as files_client,
+            ):
+                with Progress(disable=True) as progress:
+                    return await get_url_async.download_job(
+                        get_url_async.AsyncCodeOcean(api_client, 8),
+                        files_client,
+                        asyncio.Semaphore(4),
+                        "c0",
+                        progress,
+                    )
+
+        ok = self.run_against_mock(
+            (FAILING_FOLDER,), lambda mock: asyncio.run(download(mock))
+        )
+        self.assertFalse(ok)
+        self.assert_listed_files_downloaded()
+
+
+if __name__ == "__main__":
+    unittest.main()
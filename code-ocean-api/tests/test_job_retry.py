@@ -0,0 +1,292 @@
+import contextlib
+import io
+import json
+import socket
+import time
+import unittest
+
+import requests
+from codeocean import CodeOcean
+from codeocean.error import Error as CodeOceanError
+from requests.adapters import BaseAdapter
+
+from job_retry import (
+    DEFAULT_RETRY_ON,
+    ERROR_CLIENT,
+    ERROR_COMPUTATION_FAILED,
+    ERROR_NETWORK,
+    ERROR_OTHER,
+    ERROR_SERVER,
+    ERROR_THROTTLED,
+    STATUS_RETRY_SCHEDULED,
+    RetryPolicy,
+    RetryScheduler,
+    classify_error,
+)
+from mock_codeocean import MockCodeOcean, MockConfig, TreeSpec
+from sweep import resubmit_job, submit_job
+
+TREE = TreeSpec(depth=0, folders_per_level=0, files_per_folder=1, file_size=1024)
+DOMAIN = "https://codeocean.example.com"
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Answers each request with the next ``(status, body)`` reply."""
+
+    def __init__(self, replies: list[tuple[int, dict]]):
+        super().__init__()
+        self.replies = list(replies)
+        self.requests: list[requests.PreparedRequest] = []
+
+    def send(self, request, **kwargs) -> requests.Response:
+        self.requests.append(request)
+        status, body = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def scripted_client(*replies: tuple[int, dict]) -> tuple[CodeOcean, ScriptedAdapter]:
+    """A real ``CodeOcean`` client whose requests get ``replies`` in turn."""
+    co_client = CodeOcean(domain=DOMAIN, token="mock-token")
+    adapter = ScriptedAdapter(list(replies))
+    co_client.session.mount(DOMAIN, adapter)
+    return co_client, adapter
+
+
+def computation(computation_id: str) -> dict:
+    return {
+        "id": computation_id,
+        "created": 0,
+        "name": f"mock {computation_id}",
+        "run_time": 0,
+        "state": "initializing",
+        "has_results": False,
+    }
+
+
+def sdk_error(config: MockConfig, call) -> BaseException:
+    """The exception a real ``CodeOcean`` client raises against the mock server."""
+    with MockCodeOcean(TREE, config) as mock:
+        try:
+            call(mock.client())
+        except Exception as e:
+            return e
+    raise AssertionError("the request didn't fail")
+
+
+def failed_job(status: str = "failed", **fields) -> dict:
+    return {
+        "computation_id": "c0" if status == "failed" else None,
+        "run_settings": {"a": 1},
+        "status": status,
+        **fields,
+    }
+
+
+class ClassifySdkErrorTest(unittest.TestCase):
+    def test_throttled(self):
+        error = sdk_error(
+            MockConfig(throttle_rate=1.0),
+            lambda co: co.computations.get_computation("c0"),
+        )
+        self.assertIsInstance(error, CodeOceanError)
+        self.assertEqual(error.status_code, 429)
+        self.assertEqual(classify_error(error), ERROR_THROTTLED)
+
+    def test_unavailable(self):
+        error = sdk_error(
+            MockConfig(api_error_rate=1.0),
+            lambda co: co.computations.get_computation("c0"),
+        )
+        self.assertIsInstance(error, CodeOceanError)
+        self.assertEqual(error.status_code, 503)
+        self.assertEqual(classify_error(error), ERROR_THROTTLED)
+
+    def test_server_error(self):
+        co_client, _ = scripted_client((502, {"message": "Bad gateway"}))
+        with self.assertRaises(CodeOceanError) as context:
+            co_client.computations.get_computation("c0")
+        self.assertEqual(context.exception.status_code, 502)
+        self.assertEqual(classify_error(context.exception), ERROR_SERVER)
+
+    def test_client_error(self):
+        error = sdk_error(
+            MockConfig(),
+            lambda co: co.computations.get_result_file_urls("c0", "missing.bin"),
+        )
+        self.assertIsInstance(error, CodeOceanError)
+        self.assertEqual(error.status_code, 404)
+        self.assertEqual(classify_error(error), ERROR_CLIENT)
+
+    def test_network_error(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        co_client = CodeOcean(domain=f"http://127.0.0.1:{port}", token="mock-token")
+        with self.assertRaises(requests.ConnectionError) as context:
+            co_client.computations.get_computation("c0")
+        self.assertEqual(classify_error(context.exception), ERROR_NETWORK)
+
+
+class ClassifyErrorTest(unittest.TestCase):
+    def test_plain_http_error(self):
+        response = requests.Response()
+        response.status_code = 502
+        error = requests.HTTPError("502 Bad Gateway", response=response)
+        self.assertEqual(classify_error(error), ERROR_SERVER)
+
+    def test_other(self):
+        self.assertEqual(classify_error(ValueError("bad settings")), ERROR_OTHER)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_exponential_backoff_is_capped(self):
+        policy = RetryPolicy(backoff_s=10.0, backoff_factor=3.0, max_backoff_s=100.0)
+        self.assertEqual(
+            [policy.delay(attempt) for attempt in (1, 2, 3, 4)],
+            [10.0, 30.0, 90.0, 100.0],
+        )
+
+    def test_transient_submission_errors_are_retried(self):
+        policy = RetryPolicy()
+        for error_class in (ERROR_THROTTLED, ERROR_SERVER, ERROR_NETWORK):
+            job_info = failed_job("submission_failed", error_class=error_class)
+            self.assertTrue(policy.should_retry(job_info), error_class)
+
+    def test_rejected_submissions_are_not_retried(self):
+        policy = RetryPolicy()
+        for error_class in (ERROR_CLIENT, ERROR_OTHER):
+            job_info = failed_job("submission_failed", error_class=error_class)
+            self.assertFalse(policy.should_retry(job_info), error_class)
+
+    def test_failed_computations_are_opt_in(self):
+        self.assertNotIn(ERROR_COMPUTATION_FAILED, DEFAULT_RETRY_ON)
+        self.assertFalse(RetryPolicy().should_retry(failed_job()))
+        policy = RetryPolicy(retry_on=DEFAULT_RETRY_ON + (ERROR_COMPUTATION_FAILED,))
+        self.assertTrue(policy.should_retry(failed_job()))
+
+    def test_unfailed_jobs_are_not_retried(self):
+        policy = RetryPolicy(retry_on=DEFAULT_RETRY_ON + (ERROR_COMPUTATION_FAILED,))
+        for status in ("completed", "stopped", "running"):
+            self.assertFalse(policy.should_retry(failed_job(status)), status)
+
+    def test_max_attempts(self):
+        policy = RetryPolicy(max_attempts=3)
+        job_info = failed_job("submission_failed", error_class=ERROR_THROTTLED)
+        self.assertTrue(policy.should_retry({**job_info, "attempt": 2}))
+        self.assertFalse(policy.should_retry({**job_info, "attempt": 3}))
+
+
+class RetrySchedulerTest(unittest.TestCase):
+    def test_schedule_moves_the_attempt_to_the_history(self):
+        scheduler = RetryScheduler(RetryPolicy(backoff_s=60.0))
+        job_info = failed_job(
+            "submission_failed",
+            error="503 Service Unavailable",
+            error_class="throttled",
+        )
+
+        self.assertEqual(scheduler.schedule("run_0", job_info), 60.0)
+
+        self.assertEqual(job_info["status"], STATUS_RETRY_SCHEDULED)
+        self.assertEqual(job_info["attempt"], 2)
+        self.assertIsNone(job_info["computation_id"])
+        self.assertNotIn("error", job_info)
+        self.assertNotIn("error_class", job_info)
+        self.assertIn("retry_at", job_info)
+        self.assertEqual(
+            job_info["attempts"],
+            [
+                {
+                    "attempt": 1,
+                    "computation_id": None,
+                    "status": "submission_failed",
+                    "error": "503 Service Unavailable",
+                    "error_class": ERROR_THROTTLED,
+                }
+            ],
+        )
+        self.assertEqual(len(scheduler), 1)
+
+    def test_unretryable_jobs_are_left_alone(self):
+        scheduler = RetryScheduler()
+        job_info = failed_job()
+        self.assertIsNone(scheduler.schedule("run_0", job_info))
+        self.assertEqual(job_info, failed_job())
+        self.assertEqual(len(scheduler), 0)
+        self.assertIsNone(scheduler.next_due_in())
+
+    def test_retries_stop_after_max_attempts(self):
+        scheduler = RetryScheduler(RetryPolicy(max_attempts=2, backoff_s=0.0))
+        job_info = failed_job("submission_failed", error_class=ERROR_SERVER)
+        self.assertIsNotNone(scheduler.schedule("run_0", job_info))
+        self.assertEqual(scheduler.pop_due(), ["run_0"])
+
+        job_info.update(status="submission_failed", error_class=ERROR_SERVER)
+        self.assertIsNone(scheduler.schedule("run_0", job_info))
+        self.assertEqual(job_info["attempt"], 2)
+        self.assertEqual(len(job_info["attempts"]), 1)
+
+    def test_next_due_in_and_pop_due(self):
+        scheduler = RetryScheduler(RetryPolicy(backoff_s=60.0))
+        scheduler.schedule(
+            "later", failed_job("submission_failed", error_class=ERROR_NETWORK)
+        )
+        self.assertEqual(scheduler.pop_due(), [])
+        self.assertGreater(scheduler.next_due_in(), 59.0)
+
+        scheduler.policy = RetryPolicy(backoff_s=0.0)
+        for job_key in ("first", "second"):
+            scheduler.schedule(
+                job_key, failed_job("submission_failed", error_class=ERROR_NETWORK)
+            )
+            time.sleep(0.001)
+        self.assertEqual(scheduler.next_due_in(), 0.0)
+        self.assertEqual(scheduler.pop_due(limit=1), ["first"])
+        self.assertEqual(scheduler.pop_due(), ["second"])
+        self.assertEqual(len(scheduler), 1)
+
+
+class ResubmitJobTest(unittest.TestCase):
+    def test_resubmitted_job_links_its_attempts(self):
+        co_client, adapter = scripted_client(
+            (503, {"message": "Service unavailable"}),
+            (200, computation("c1")),
+        )
+        scheduler = RetryScheduler(RetryPolicy(backoff_s=0.0))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            jobs = {"run_0": submit_job(co_client, "capsule", "run_0", {"a": 1})}
+            self.assertEqual(jobs["run_0"]["status"], "submission_failed")
+            self.assertEqual(jobs["run_0"]["error_class"], ERROR_THROTTLED)
+
+            scheduler.schedule("run_0", jobs["run_0"])
+            self.assertEqual(scheduler.pop_due(), ["run_0"])
+            job_info = resubmit_job(co_client, "capsule", "run_0", jobs)
+
+        self.assertIs(jobs["run_0"], job_info)
+        self.assertEqual(job_info["status"], "submitted")
+        self.assertEqual(job_info["computation_id"], "c1")
+        self.assertEqual(job_info["run_settings"], {"a": 1})
+        self.assertEqual(job_info["attempt"], 2)
+        self.assertEqual(
+            [
+                (a["attempt"], a["status"], a["error_class"])
+                for a in job_info["attempts"]
+            ],
+            [(1, "submission_failed", ERROR_THROTTLED)],
+        )
+        self.assertEqual(len(adapter.requests), 2)
+        self.assertTrue(adapter.requests[1].url.endswith("/api/v1/computations"))
+
+
+if __name__ == "__main__":
+    unittest.main()
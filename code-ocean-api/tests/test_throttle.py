@@ -0,0 +1,49 @@
+import os
+import unittest
+from unittest import mock
+
+from codeocean import CodeOcean
+from codeocean.error import Error as CodeOceanError
+from urllib3.util import Retry
+
+from mock_codeocean import MockCodeOcean, MockConfig, TreeSpec
+from throttle import GovernedAdapter, Governor, KeepAliveAdapter
+from utils import CODEOCEAN_DOMAIN, get_codeocean_client
+
+TREE = TreeSpec(depth=1, folders_per_level=1, files_per_folder=1, file_size=1024)
+
+
+class MountRetriesTest(unittest.TestCase):
+    def test_governed_client_keeps_its_retries(self):
+        # Retry every 500, including the POST the governor doesn't retry
+        retries = Retry(
+            total=2, status_forcelist=[500], allowed_methods=None, raise_on_status=False
+        )
+        config = MockConfig(failing_folders=("dir_000",))
+        with MockCodeOcean(TREE, config) as mock_server:
+            co_client = CodeOcean(
+                domain=mock_server.url, token="mock-token", retries=retries
+            )
+            Governor().mount(
+                co_client.session, mock_server.url, retries=co_client.retries
+            )
+
+            with self.assertRaises(CodeOceanError):
+                co_client.computations.list_computation_results("c0", "dir_000")
+
+        self.assertEqual(mock_server.request_counts["list_computation_results"], 3)
+
+    @mock.patch.dict(os.environ, {"CODEOCEAN_TOKEN": "mock-token"})
+    def test_get_codeocean_client(self):
+        for governor, adapter_type in (
+            (Governor(), GovernedAdapter),
+            (None, KeepAliveAdapter),
+        ):
+            co_client = get_codeocean_client(governor, pool_size=4, retries=3)
+            adapter = co_client.session.get_adapter(f"{CODEOCEAN_DOMAIN}/api/v1/")
+            self.assertIsInstance(adapter, adapter_type)
+            self.assertEqual(adapter.max_retries.total, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+import logging
+import random
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from urllib3.util import Retry
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY_S = 1.0
+DEFAULT_MAX_DELAY_S = 60.0
+# Statuses meaning the request was not processed, so any method may be retried
+THROTTLED_STATUSES = (429, 503)
+# Server errors that are only retried for idempotent methods
+SERVER_ERROR_STATUSES = (500, 502, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# urllib3's defaults plus TCP keep-alive probes (after 60s idle, every 20s, 5
+# times), so pooled connections idling between requests aren't silently dropped
+KEEPALIVE_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 20), ("TCP_KEEPCNT", 5))
+    if hasattr(socket, name)
+]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    ``acquire`` blocks until enough tokens are available. Requests larger than
+    the bucket ``capacity`` are let through once the bucket is full and leave
+    it in debt, so the long-run rate is still honoured.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping the tokens accumulated so far."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until ``amount`` tokens can be taken from the bucket."""
+        needed = min(amount, self.capacity)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return
+                wait = (needed - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Governor:
+    """
+    Shared request-rate, bandwidth and backoff policy for Code Ocean traffic.
+
+    Sessions mounted with ``mount`` acquire a request token before every
+    request and transparently retry throttled (429/503) and server-error
+    responses, honouring ``Retry-After`` or backing off exponentially with
+    jitter. A backoff pauses every thread using the governor, and a 429 also
+    halves the request rate, which then recovers gradually on success.
+    ``bandwidth`` is the byte-rate bucket for file streaming.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float | None = None,
+        bytes_per_second: float | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY_S,
+        max_delay: float = DEFAULT_MAX_DELAY_S,
+    ):
+        self.requests_per_second = requests_per_second
+        self.request_bucket = (
+            TokenBucket(requests_per_second) if requests_per_second else None
+        )
+        self.bandwidth = TokenBucket(bytes_per_second) if bytes_per_second else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._cooldown_until = 0.0
+        # Number of retried responses per HTTP status, for run reports
+        self.retries_by_status: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def cooldown_remaining(self) -> float:
+        """Seconds left of the current backoff pause (0 if not backing off)."""
+        return max(0.0, self._cooldown_until - time.monotonic())
+
+    def wait(self, count_request: bool = True) -> None:
+        """Block while backing off, then take a request token."""
+        while (delay := self.cooldown_remaining()) > 0:
+            time.sleep(delay)
+        if count_request and self.request_bucket is not None:
+            self.request_bucket.acquire()
+
+    def retry_delay(
+        self, method: str | None, response: requests.Response, attempt: int
+    ) -> float | None:
+        """Seconds to wait before retrying ``response``, or None to give up."""
+        status = response.status_code
+        retryable = status in THROTTLED_STATUSES or (
+            status in SERVER_ERROR_STATUSES and method in IDEMPOTENT_METHODS
+        )
+        if not retryable or attempt >= self.max_retries:
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return min(self.max_delay, self.base_delay * 2**attempt) * random.uniform(
+            0.5, 1.0
+        )
+
+    def back_off(self, delay: float, status: int) -> None:
+        """Pause all requests for ``delay`` seconds and slow down after a 429."""
+        with self._lock:
+            self.retries_by_status[status] = self.retries_by_status.get(status, 0) + 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            if status == 429 and self.request_bucket is not None:
+                self.request_bucket.set_rate(max(0.1, self.request_bucket.rate / 2))
+
+    def on_success(self) -> None:
+        """Let a throttled request rate creep back up to its configured value."""
+        bucket = self.request_bucket
+        if bucket is not None and self.requests_per_second is not None:
+            if bucket.rate < self.requests_per_second:
+                bucket.set_rate(
+                    min(
+                        self.requests_per_second,
+                        bucket.rate + self.requests_per_second / 20,
+                    )
+                )
+
+    def mount(
+        self,
+        session: requests.Session,
+        prefix: str = "https://",
+        pool_size: int | None = None,
+        count_requests: bool = True,
+        retries: Retry | int = 0,
+    ) -> None:
+        """
+        Route ``session`` requests under ``prefix`` through this governor.
+
+        With ``count_requests=False`` only the backoff policy applies, e.g. for
+        presigned file downloads that shouldn't use up API request tokens.
+        ``retries`` is the urllib3 retry configuration of the underlying
+        adapter (e.g. a ``CodeOcean`` client's ``retries``, which mounting
+        replaces); those retries happen within each of the governor's attempts.
+        """
+        pool_size = pool_size or requests.adapters.DEFAULT_POOLSIZE
+        adapter = GovernedAdapter(
+            self,
+            count_requests,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retries,
+        )
+        session.mount(prefix, adapter)
+
+
+class KeepAliveAdapter(requests.adapters.HTTPAdapter):
+    """Transport adapter whose pooled connections use TCP keep-alive probes."""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+
+class GovernedAdapter(KeepAliveAdapter):
+    """Keep-alive transport adapter that applies a ``Governor`` to every send."""
+
+    def __init__(self, governor: Governor, count_requests: bool = True, **kwargs):
+        self.governor = governor
+        self.count_requests = count_requests
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs) -> requests.Response:  # type: ignore[override]
+        attempt = 0
+        while True:
+            self.governor.wait(self.count_requests)
+            response = super().send(request, **kwargs)
+
+            delay = self.governor.retry_delay(request.method, response, attempt)
+            if delay is None:
+                if response.status_code < 400:
+                    self.governor.on_success()
+                return response
+
+            attempt += 1
+            logging.warning(
+                "%s %s returned %d, retrying in %.1fs (attempt %d/%d)",
+                request.method,
+                request.url.split("?", 1)[0] if request.url else "",
+                response.status_code,
+                delay,
+                attempt,
+                self.governor.max_retries,
+            )
+            response.close()
+            self.governor.back_off(delay, response.status_code)
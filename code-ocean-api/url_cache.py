@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+from codeocean import CodeOcean
+
+DEFAULT_URL_WORKERS = 4
+# Assumed lifetime of URLs that don't advertise their expiry
+DEFAULT_URL_TTL_S = 600
+# Re-resolve URLs this close to expiring rather than risk a 403 mid-transfer
+EXPIRY_MARGIN_S = 60
+
+
+def presigned_url_expiry(url: str, default_ttl: float = DEFAULT_URL_TTL_S) -> float:
+    """
+    Return the UNIX time at which a presigned URL expires.
+
+    Understands S3 SigV4 (``X-Amz-Date`` + ``X-Amz-Expires``) and SigV2
+    (``Expires``) query strings; otherwise assumes ``default_ttl`` from now.
+    """
+    query = parse_qs(urlparse(url).query)
+
+    try:
+        if "X-Amz-Date" in query and "X-Amz-Expires" in query:
+            signed_at = datetime.strptime(
+                query["X-Amz-Date"][0], "%Y%m%dT%H%M%SZ"
+            ).replace(tzinfo=timezone.utc)
+            return signed_at.timestamp() + int(query["X-Amz-Expires"][0])
+        if "Expires" in query:
+            return float(query["Expires"][0])
+    except ValueError:
+        logging.debug("Could not parse expiry of presigned URL, assuming default")
+
+    return time.time() + default_ttl
+
+
+class FileURLCache:
+    """
+    Prefetching cache of result-file download URLs.
+
+    ``prefetch`` resolves URLs on a pool of ``workers`` background threads
+    ahead of the download workers, so ``get`` usually returns without an API
+    round-trip. A URL whose prefetch hasn't started yet is resolved inline
+    rather than waited for. Entries are
+    keyed by (computation_id, path) and re-resolved once they are within
+    ``EXPIRY_MARGIN_S`` of expiring or after ``invalidate`` (e.g. on a 403).
+    """
+
+    def __init__(self, co_client: CodeOcean, workers: int = DEFAULT_URL_WORKERS):
+        self.co_client = co_client
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._entries: dict[tuple[str, str], Future[tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FileURLCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop prefetching; URLs already resolved stay usable."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve(self, computation_id: str, path: str) -> tuple[str, float]:
+        url_response = self.co_client.computations.get_result_file_urls(
+            computation_id=computation_id, path=path
+        )
+        url: str = url_response.download_url
+        return url, presigned_url_expiry(url)
+
+    def _is_fresh(self, entry: Future[tuple[str, float]]) -> bool:
+        if entry.cancelled():
+            return False
+        if not entry.done():
+            return True
+        if entry.exception() is not None:
+            return False
+        _, expires_at = entry.result()
+        return expires_at - time.time() > EXPIRY_MARGIN_S
+
+    def prefetch(self, computation_id: str, paths: Iterable[str]) -> None:
+        """Queue URL resolution for ``paths`` in the background."""
+        with self._lock:
+            for path in paths:
+                key = (computation_id, path)
+                entry = self._entries.get(key)
+                if entry is None or not self._is_fresh(entry):
+                    self._entries[key] = self._executor.submit(
+                        self._resolve, computation_id, path
+                    )
+
+    def get(self, computation_id: str, path: str) -> str:
+        """Return a download URL, resolving it now if not cached or expiring."""
+        key = (computation_id, path)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None and entry.cancel():
+            # Still queued behind other prefetches; resolving it here is quicker
+            # than waiting for a prefetch worker to get to it
+            entry = None
+
+        if entry is not None and self._is_fresh(entry):
+            try:
+                url, _ = entry.result()
+                if self._is_fresh(entry):
+                    return url
+            except Exception as e:
+                logging.debug("Prefetch of URL for %s failed: %s", path, e)
+
+        url, expires_at = self._resolve(computation_id, path)
+        resolved: Future[tuple[str, float]] = Future()
+        resolved.set_result((url, expires_at))
+        with self._lock:
+            self._entries[key] = resolved
+        return url
+
+    def invalidate(self, computation_id: str, path: str) -> None:
+        """Drop a cached URL, e.g. after the server rejected it."""
+        with self._lock:
+            self._entries.pop((computation_id, path), None)
@@ -2,13 +2,16 @@ import os
 from pathlib import Path
 
 from codeocean import CodeOcean
+from urllib3.util import Retry
+
+from throttle import Governor, KeepAliveAdapter
 
 CODEOCEAN_DOMAIN = "https://codeocean.allenneuraldynamics.org"
 _SECRETS_FILE = Path("../secrets/codeocean")
 
 
-def get_codeocean_client() -> CodeOcean:
-    """Initialize Code Ocean client.
+def get_codeocean_token() -> str:
+    """Resolve the Code Ocean API token.
 
     Resolves the API token in order:
     1. ``CODEOCEAN_TOKEN`` environment variable
@@ -17,4 +20,37 @@ def get_codeocean_client() -> CodeOcean:
     token = os.environ.get("CODEOCEAN_TOKEN")
     if token is None:
         token = _SECRETS_FILE.read_text().strip()
-    return CodeOcean(domain=CODEOCEAN_DOMAIN, token=token)
+    return token
+
+
+def get_codeocean_client(
+    governor: Governor | None = None,
+    pool_size: int | None = None,
+    retries: Retry | int = 0,
+) -> CodeOcean:
+    """Initialize Code Ocean client.
+
+    If a ``governor`` is given, all API requests are rate limited by it and
+    retried with backoff on 429/5xx responses. ``pool_size`` should cover every
+    thread making API requests at once, so their connections are kept alive
+    instead of being discarded from a full pool (default: requests' 10).
+    ``retries`` is the client's urllib3 retry configuration (as for
+    ``CodeOcean``); it is kept on the adapter mounted in place of the SDK's.
+    """
+    client = CodeOcean(
+        domain=CODEOCEAN_DOMAIN, token=get_codeocean_token(), retries=retries
+    )
+    if governor is not None:
+        governor.mount(
+            client.session, CODEOCEAN_DOMAIN, pool_size, retries=client.retries
+        )
+    elif pool_size is not None:
+        client.session.mount(
+            CODEOCEAN_DOMAIN,
+            KeepAliveAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=client.retries,
+            ),
+        )
+    return client